@@ -4,9 +4,13 @@ A conversational AI assistant powered by RAG for Shuru Tech
 """
 
 import streamlit as st
+import asyncio
 import os
-import json
 import logging
+import threading
+import time
+import json
+from collections import OrderedDict
 from dotenv import load_dotenv
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_anthropic import ChatAnthropic
@@ -17,6 +21,17 @@ from langchain.memory import ConversationBufferMemory
 from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
 
+from change_sets import ChangeTracker, case_study_key, diff_states, load_state, save_json_atomic, service_key
+from context_packing import CONTEXT_TOKEN_BUDGET, ContextPacker, ContextPackingRetriever, TokenUsageHandler, get_token_counter
+from conversation_memory import MEMORY_TOKEN_LIMIT, SummaryWindowMemory
+from embedding_cache import QUERY_CACHE_SIZE, cache_query_embeddings, query_cache
+from kb_format import load_kb, resolve_kb_path
+from kb_schema import case_study_sections, format_case_study
+from reranker import RerankingRetriever, get_reranker
+from retrieval import BM25Index, HybridRetriever, MetadataIndex, PrecomputedRetriever
+from tracing import TracingCallbackHandler, get_tracer, trace_vectorstore
+from vector_index import build_config, build_vectorstore, configure_search, index_params_from_env, needs_rebuild
+
 # Suppress tokenizer parallelism warnings
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
@@ -30,27 +45,69 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Page configuration
-st.set_page_config(
-    page_title="Shuru Tech | AI Solutions Dashboard",
-    page_icon="🚀",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
+# Case study fields that go into the vector store documents (id and metadata key them)
+CASE_STUDY_FIELDS = ['id', 'metadata', 'client_name', 'industry', 'problem', 'solution',
+                     'technologies', 'results', 'duration']
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+# Chunks passed to the answer prompt
+RETRIEVAL_K = 5
+# Frequent queries to precompute at warmup (JSON list of strings), besides the suggested questions
+WARMUP_QUERIES_FILE = 'warmup_queries.json'
 
 
 class ShuruTechRAGBot:
-    def __init__(self):
+    def __init__(self, llm=None, embeddings=None, vectorstore=None, reranker=None):
+        """
+        Args:
+            llm: Chat model to answer with (default ChatAnthropic; load_test.py passes a mock)
+            embeddings: Embeddings model (default local HuggingFace EMBEDDING_MODEL)
+            vectorstore: Prebuilt vector store to share across bots instead of building one
+            reranker: Reranker to use when RERANK=true (default the shared cross-encoder)
+        """
+        self.llm = llm
+        self.embeddings = embeddings
+        self.reranker = reranker
         self.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
-        self.knowledge_base_path = 'knowledge_base.json'
-        self.vectorstore = None
+        # Uses knowledge_base.kb (columnar) when it is at least as new as the JSON
+        self.knowledge_base_path = resolve_kb_path('knowledge_base.json')
+        # Persisted FAISS index, updated incrementally (empty VECTORSTORE_DIR disables it)
+        self.vectorstore_dir = os.getenv('VECTORSTORE_DIR', 'vectorstore')
+        # How case studies are indexed: 'document' (one vector each), 'fields' (one vector per
+        # field, collapsed to the case study at retrieval) or 'chunks' (character splitter, like other documents)
+        self.indexing_mode = os.getenv('INDEXING_MODE', 'document').lower()
+        self.parent_documents = {}  # doc_key -> full case study Document (fields mode)
+        # FAISS index type and its build/search parameters (see vector_index.py)
+        self.index_params = index_params_from_env()
+        self.index_build = {}
+        self.vectorstore = vectorstore
         self.chain = None
+        self.chain_lock = threading.Lock()
+        self.retriever = None
+        self.precomputed_retriever = None
+        self.warmup_stats = {}
+        # Conversation memory: the bot's own, plus one per session_id for multiplexed callers
+        self.memory = None
+        self.session_memories = OrderedDict()
+        self.memory_lock = threading.Lock()
+        self.summary_llm = None
+        self.document_hashes = {}
         # Debug tracking
         self.num_documents = 0
         self.num_case_studies = 0
         self.last_query = None
         self.last_retrieval_count = 0
         self.last_retrieved_clients = []
+        self.last_error = None
+        # Per-stage latency traces (see tracing.py); last_trace feeds the debug panel
+        self.tracer = get_tracer()
+        self.last_trace = None
+        # Context and model tokens of the last turn (see context_packing.py)
+        self.token_counter = get_token_counter()
+        self.last_token_usage = {}
         logger.info("ShuruTechRAGBot initialized")
 
     def load_knowledge_base(self):
@@ -65,9 +122,13 @@ class ShuruTechRAGBot:
             return []
 
         try:
-            with open(self.knowledge_base_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
+            # Only the sections and case study fields used below are read
+            data = load_kb(
+                self.knowledge_base_path,
+                sections=['pages', 'case_studies', 'services'],
+                fields={'case_studies': CASE_STUDY_FIELDS}
+            )
+        except ValueError as e:  # Includes json.JSONDecodeError
             error_msg = f"❌ Invalid JSON in knowledge base: {str(e)}"
             logger.error(error_msg)
             st.error(error_msg)
@@ -91,6 +152,7 @@ class ShuruTechRAGBot:
         print(f"📚 Loading {self.num_case_studies} case studies from knowledge_base.json")
 
         documents = []
+        keys = []  # Stable key per document, used to update the index incrementally
 
         # Process company info
         if data.get('company_info'):
@@ -100,6 +162,7 @@ class ShuruTechRAGBot:
                 metadata={"source": "company_info", "type": "company"}
             )
             documents.append(doc)
+            keys.append("company_info")
 
         # Process pages
         for page in data.get('pages', []):
@@ -108,26 +171,15 @@ class ShuruTechRAGBot:
                 metadata={"source": page.get('url', ''), "type": "page"}
             )
             documents.append(doc)
+            keys.append(f"page:{page.get('url', '')}")
 
         # Process case studies with RICH CONTENT
         case_study_count = 0
+        sections = {}  # Document position -> (header, field sections), for fields indexing
         for case_study in data.get('case_studies', []):
-            # Create rich page_content combining all important fields
-            page_content = f"""Case Study: {case_study.get('client_name', 'Unknown Client')}
-Industry: {case_study.get('industry', 'N/A')}
-
-Problem:
-{case_study.get('problem', 'N/A')}
-
-Solution:
-{case_study.get('solution', 'N/A')}
-
-Technologies Used: {', '.join(case_study.get('technologies', []))}
-
-Results:
-{case_study.get('results', 'N/A')}
-
-Duration: {case_study.get('duration', 'N/A')}"""
+            # Rich page_content combining all important fields (missing ones left out)
+            page_content = format_case_study(case_study)
+            sections[len(documents)] = case_study_sections(case_study)
 
             doc = Document(
                 page_content=page_content,
@@ -140,6 +192,7 @@ Duration: {case_study.get('duration', 'N/A')}"""
                 }
             )
             documents.append(doc)
+            keys.append(f"case_study:{case_study_key(case_study)}")
             case_study_count += 1
 
         logger.info(f"✓ Created {case_study_count} case study documents for vector store")
@@ -152,14 +205,67 @@ Duration: {case_study.get('duration', 'N/A')}"""
                 metadata={"source": "service", "type": "service"}
             )
             documents.append(doc)
+            keys.append(f"service:{service_key(service)}")
+
+        # Content hash per document key, compared against the index manifest
+        tracker = ChangeTracker()
+        for doc, key in zip(documents, keys):
+            doc.metadata['doc_key'] = tracker.add(
+                'documents', {"content": doc.page_content, "metadata": doc.metadata}, key=key
+            )
+        self.document_hashes = tracker.state['documents']
 
         self.num_documents = len(documents)
         logger.info(f"✓ Total documents created: {self.num_documents}")
         print(f"✓ Total documents created: {self.num_documents}")
+
+        if self.indexing_mode == 'fields':
+            documents = self.split_case_study_fields(documents, sections)
         return documents
 
+    def split_case_study_fields(self, documents, sections):
+        """
+        Replace each case study with one Document per field (parent-child indexing)
+
+        Each field Document carries the case study header for context and the
+        parent's doc_key as parent_id; the full case study is kept in
+        self.parent_documents for the docstore. Duration is folded into the
+        preceding field rather than getting a vector of its own.
+        """
+        self.parent_documents = {}
+        expanded = []
+        for position, doc in enumerate(documents):
+            header, fields = sections.get(position, (None, []))
+            if not fields:
+                expanded.append(doc)
+                continue
+
+            parent_id = doc.metadata['doc_key']
+            self.parent_documents[parent_id] = Document(page_content=doc.page_content,
+                                                        metadata=dict(doc.metadata), id=parent_id)
+            children = []
+            for field, text in fields:
+                if field == 'duration' and children:
+                    children[-1].page_content += f"\n\n{text}"
+                    continue
+                children.append(Document(
+                    page_content=f"{header}\n\n{text}",
+                    metadata={**doc.metadata, "field": field, "parent_id": parent_id}
+                ))
+            expanded.extend(children)
+
+        logger.info(f"✓ {len(self.parent_documents)} case studies indexed by field "
+                    f"({len(expanded)} documents to embed)")
+        return expanded
+
     def create_vectorstore(self, documents):
-        """Create FAISS vector store from documents"""
+        """
+        Create the FAISS vector store from documents
+
+        With VECTORSTORE_DIR set, the index and a manifest of document hashes
+        are persisted; later runs load it and re-embed only the documents that
+        were added or changed (and drop removed ones) instead of the corpus.
+        """
         if not documents:
             error_msg = "❌ No documents provided to create vector store"
             logger.error(error_msg)
@@ -170,30 +276,39 @@ Duration: {case_study.get('duration', 'N/A')}"""
             logger.info(f"📊 Processing {len(documents)} documents for vector store...")
             print(f"📊 Processing {len(documents)} documents for vector store...")
 
-            # Split documents into chunks
+            # Split documents into chunks (case studies stay whole unless INDEXING_MODE=chunks)
             text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
+                chunk_size=CHUNK_SIZE,
+                chunk_overlap=CHUNK_OVERLAP,
                 length_function=len
             )
-            splits = text_splitter.split_documents(documents)
+            splits = []
+            for doc in documents:
+                if self.indexing_mode != 'chunks' and doc.metadata.get('type') == 'case_study':
+                    splits.append(doc)
+                else:
+                    splits.extend(text_splitter.split_documents([doc]))
+            chunk_ids = self.assign_chunk_ids(splits)
             logger.info(f"✓ Split into {len(splits)} chunks")
             print(f"✓ Split into {len(splits)} chunks")
 
             # Create embeddings (using free local HuggingFace embeddings)
             logger.info("🔧 Initializing embeddings model...")
             print("🔧 Initializing embeddings model...")
-            embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
+            embeddings = self.embeddings or HuggingFaceEmbeddings(
+                model_name=EMBEDDING_MODEL
             )
 
+            vectorstore = self.update_vectorstore(splits, chunk_ids, embeddings)
+            if vectorstore is not None:
+                return vectorstore
+
             # Create FAISS vector store
             logger.info("🔨 Creating FAISS vector store...")
             print("🔨 Creating FAISS vector store...")
-            vectorstore = FAISS.from_documents(
-                documents=splits,
-                embedding=embeddings
-            )
+            vectorstore, self.index_build = build_vectorstore(splits, embeddings, chunk_ids, self.index_params)
+            self.store_parents(vectorstore)
+            self.save_vectorstore(vectorstore, chunk_ids, splits)
 
             logger.info(f"✓ Vector store created with {len(splits)} documents")
             print(f"✓ Vector store created with {len(splits)} documents")
@@ -204,39 +319,163 @@ Duration: {case_study.get('duration', 'N/A')}"""
             st.error(error_msg)
             return None
 
+    @staticmethod
+    def assign_chunk_ids(splits):
+        """Deterministic chunk IDs: <doc_key>#<n>, numbered within each document"""
+        counters = {}
+        chunk_ids = []
+        for split in splits:
+            key = split.metadata['doc_key']
+            counters[key] = counters.get(key, 0) + 1
+            chunk_ids.append(f"{key}#{counters[key]}")
+        return chunk_ids
+
+    def index_config(self):
+        """Settings that invalidate a persisted index when they change"""
+        return {"embedding_model": EMBEDDING_MODEL, "chunk_size": CHUNK_SIZE, "chunk_overlap": CHUNK_OVERLAP,
+                "indexing_mode": self.indexing_mode, "index": build_config(self.index_params)}
+
+    def manifest_path(self):
+        return os.path.join(self.vectorstore_dir, 'manifest.json')
+
+    def update_vectorstore(self, splits, chunk_ids, embeddings):
+        """
+        Load the persisted index and apply only the document changes
+
+        Returns:
+            Updated FAISS store, or None if there is no usable persisted index
+        """
+        if not self.vectorstore_dir:
+            return None
+
+        manifest = load_state(self.manifest_path())
+        if manifest.get('config') != self.index_config():
+            return None
+
+        try:
+            vectorstore = FAISS.load_local(
+                self.vectorstore_dir, embeddings, allow_dangerous_deserialization=True
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Could not load persisted vector store, rebuilding: {str(e)}")
+            return None
+
+        # An index saved without its manifest (e.g. a crash in between) no longer matches it
+        manifest_ids = {chunk_id for ids in manifest.get('chunks', {}).values() for chunk_id in ids}
+        if set(vectorstore.index_to_docstore_id.values()) != manifest_ids:
+            logger.warning("⚠️  Persisted vector store does not match its manifest, rebuilding")
+            return None
+
+        changes = diff_states(manifest.get('documents', {}), self.document_hashes)
+        stale_keys = [entry['key'] for entry in changes['updated'] + changes['removed']]
+        changed_keys = {entry['key'] for entry in changes['added'] + changes['updated']}
+
+        stale_ids = [chunk_id for key in stale_keys for chunk_id in manifest['chunks'].get(key, [])]
+        new_chunks = [(split, chunk_id) for split, chunk_id in zip(splits, chunk_ids)
+                      if split.metadata['doc_key'] in changed_keys]
+
+        self.index_build = manifest.get('index', {})
+        reason = needs_rebuild(self.index_build, self.index_params['type'], bool(stale_ids),
+                               vectorstore.index.ntotal - len(stale_ids) + len(new_chunks))
+        if reason:
+            logger.info(f"🔁 Rebuilding vector store: {reason}")
+            return None
+        configure_search(vectorstore.index, self.index_params)
+
+        try:
+            if stale_ids:
+                vectorstore.delete(stale_ids)
+            if new_chunks:
+                vectorstore.add_documents(
+                    [split for split, _ in new_chunks], ids=[chunk_id for _, chunk_id in new_chunks]
+                )
+        except Exception as e:
+            logger.warning(f"⚠️  Could not update persisted vector store, rebuilding: {str(e)}")
+            return None
+
+        message = (f"✓ Vector store loaded from {self.vectorstore_dir}: {len(changes['added'])} added, "
+                   f"{len(changes['updated'])} updated, {len(changes['removed'])} removed documents "
+                   f"({len(new_chunks)} chunks embedded)")
+        logger.info(message)
+        print(message)
+
+        parents_changed = self.store_parents(vectorstore, stale_keys)
+        if stale_ids or new_chunks or parents_changed:
+            self.save_vectorstore(vectorstore, chunk_ids, splits)
+        return vectorstore
+
+    def store_parents(self, vectorstore, stale_keys=()):
+        """
+        Keep full case studies in the docstore under their doc_key (not in the index)
+
+        Retrievers look them up to collapse field-level hits into one case study.
+
+        Returns:
+            True if the docstore changed
+        """
+        docstore = vectorstore.docstore
+        stale = [key for key in stale_keys if isinstance(docstore.search(key), Document)]
+        if stale:
+            docstore.delete(stale)
+        missing = {key: doc for key, doc in self.parent_documents.items()
+                   if not isinstance(docstore.search(key), Document)}
+        if missing:
+            docstore.add(missing)
+        return bool(stale or missing)
+
+    def save_vectorstore(self, vectorstore, chunk_ids, splits):
+        """Persist the index with a manifest of document hashes and chunk IDs"""
+        if not self.vectorstore_dir:
+            return
+
+        chunks = {}
+        for split, chunk_id in zip(splits, chunk_ids):
+            chunks.setdefault(split.metadata['doc_key'], []).append(chunk_id)
+
+        vectorstore.save_local(self.vectorstore_dir)
+        save_json_atomic(self.manifest_path(), {
+            "config": self.index_config(),
+            "documents": self.document_hashes,
+            "chunks": chunks,
+            "index": self.index_build
+        })
+
     def initialize_chain(self):
         """Initialize the conversational retrieval chain"""
         logger.info("Initializing conversational chain...")
 
-        if not self.anthropic_api_key:
+        if self.llm is None and not self.anthropic_api_key:
             error_msg = "❌ Anthropic API key not found. Please set it in .env file."
             logger.error(error_msg)
             st.error(error_msg)
             return None
 
-        # Load documents
-        documents = self.load_knowledge_base()
-        if not documents:
-            return None
+        # Build the vector store unless a shared one was passed in
+        if self.vectorstore is None:
+            # Load documents
+            documents = self.load_knowledge_base()
+            if not documents:
+                return None
 
-        # Create vector store
-        self.vectorstore = self.create_vectorstore(documents)
-        if not self.vectorstore:
-            return None
+            # Create vector store
+            self.vectorstore = self.create_vectorstore(documents)
+            if not self.vectorstore:
+                return None
+
+        # Repeated queries reuse their embedding (QUERY_EMBEDDING_CACHE_SIZE, 0 disables it);
+        # wrapped first so the traced embed_query span shows the cache hits
+        cache_query_embeddings(self.vectorstore, int(os.getenv('QUERY_EMBEDDING_CACHE_SIZE', QUERY_CACHE_SIZE)))
 
-        # Create LLM (using Claude)
-        llm = ChatAnthropic(
+        # Time query embedding and index search as trace spans
+        trace_vectorstore(self.vectorstore)
+
+        # Create LLM (using Claude unless one was injected)
+        llm = self.llm or ChatAnthropic(
             model="claude-3-5-sonnet-20241022",
             temperature=float(os.getenv('TEMPERATURE', 0.7)),
             anthropic_api_key=self.anthropic_api_key,
-            max_tokens=int(os.getenv('MAX_TOKENS', 1024))
-        )
-
-        # Create memory
-        memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True,
-            output_key="answer"
+            max_tokens=int(os.getenv('MAX_TOKENS', 1024)),
+            streaming=True  # Token callbacks give traces a time-to-first-token
         )
 
         # Create custom prompt template for consultative responses
@@ -268,11 +507,22 @@ Guidelines:
 - Add line breaks between sections for readability"""
         )
 
-        # Create chain with k=5 for top 5 results and custom prompt
+        # Retrieved documents are deduplicated and trimmed to CONTEXT_TOKEN_BUDGET tokens (0 disables it)
+        retriever = self.create_retriever()
+        # WARMUP_RETRIEVAL=true: warmup() stores the results for the warmup queries
+        if os.getenv('WARMUP_RETRIEVAL', 'false').lower() == 'true':
+            retriever = self.precomputed_retriever = PrecomputedRetriever(base_retriever=retriever)
+        self.retriever = retriever  # Unpacked, for retrieve-only callers (server.py)
+        budget = int(os.getenv('CONTEXT_TOKEN_BUDGET', CONTEXT_TOKEN_BUDGET))
+        if budget > 0:
+            retriever = ContextPackingRetriever(base_retriever=retriever,
+                                                packer=ContextPacker(self.token_counter, budget))
+
+        # Create chain with the top RETRIEVAL_K chunks and custom prompt; the chat history
+        # is passed in per call, so sessions with their own memory can share the chain
         chain = ConversationalRetrievalChain.from_llm(
             llm=llm,
-            retriever=self.vectorstore.as_retriever(search_kwargs={"k": 5}),
-            memory=memory,
+            retriever=retriever,
             return_source_documents=True,
             verbose=False,
             combine_docs_chain_kwargs={"prompt": qa_prompt}
@@ -283,51 +533,297 @@ Guidelines:
 
         return chain
 
-    def get_response(self, question):
-        """Get response from the chatbot"""
+    def create_retriever(self, mode=None):
+        """
+        Retriever over the vector store
+
+        Args:
+            mode: 'hybrid' fuses dense search with a BM25 index built from the
+                same chunks; 'dense' is plain vector similarity (default RETRIEVAL_MODE, else hybrid)
+
+        In hybrid mode, queries naming an industry or technology are searched
+        within the matching case studies first (METADATA_FILTER=false disables it).
+        Unless case studies are character-chunked, results are one case study
+        per client (field hits collapse to their case study). With RERANK=true,
+        RERANK_CANDIDATES results are rescored by a cross-encoder and the best
+        RERANK_TOP_N are kept.
+        """
+        k = int(os.getenv('RETRIEVAL_K', RETRIEVAL_K))
+        mode = mode or os.getenv('RETRIEVAL_MODE', 'hybrid')
+        collapse_parents = self.indexing_mode != 'chunks'
+        if mode.lower() == 'dense':
+            retriever = HybridRetriever(vectorstore=self.vectorstore, lexical_index=BM25Index(), k=k,
+                                        dense_k=k, lexical_weight=0.0, collapse_parents=collapse_parents)
+        else:
+            lexical_index = BM25Index.from_vectorstore(self.vectorstore)
+            logger.info(f"✓ Lexical index built over {len(lexical_index)} chunks")
+            metadata_index = None
+            if os.getenv('METADATA_FILTER', 'true').lower() == 'true':
+                metadata_index = MetadataIndex.from_vectorstore(self.vectorstore)
+            retriever = HybridRetriever(
+                vectorstore=self.vectorstore,
+                lexical_index=lexical_index,
+                k=k,
+                dense_k=int(os.getenv('DENSE_K', 8)),
+                lexical_k=int(os.getenv('LEXICAL_K', 8)),
+                dense_weight=float(os.getenv('DENSE_WEIGHT', 1.0)),
+                lexical_weight=float(os.getenv('LEXICAL_WEIGHT', 1.0)),
+                metadata_index=metadata_index,
+                collapse_parents=collapse_parents
+            )
+
+        if os.getenv('RERANK', 'false').lower() != 'true':
+            return retriever
+        try:
+            reranker = self.reranker or get_reranker()
+        except Exception as e:
+            logger.warning(f"⚠️  Reranker unavailable, using retrieval order: {str(e)}")
+            return retriever
+        return RerankingRetriever(
+            base_retriever=retriever,
+            reranker=reranker,
+            candidates=int(os.getenv('RERANK_CANDIDATES', 20)),
+            top_n=int(os.getenv('RERANK_TOP_N', 3))
+        )
+
+    def create_memory(self):
+        """
+        Conversation memory for one session
+
+        Recent turns up to MEMORY_TOKEN_LIMIT tokens plus a running summary of
+        older ones, written in the background (MEMORY_MODE=buffer keeps every turn)
+        """
+        if os.getenv('MEMORY_MODE', 'summary').lower() == 'buffer':
+            return ConversationBufferMemory(
+                memory_key="chat_history",
+                return_messages=True,
+                output_key="answer"
+            )
+        if self.summary_llm is None:
+            self.summary_llm = self.llm or ChatAnthropic(
+                model=os.getenv('SUMMARY_MODEL', 'claude-3-5-haiku-20241022'),
+                temperature=0,
+                anthropic_api_key=self.anthropic_api_key,
+                max_tokens=256
+            )
+        return SummaryWindowMemory(
+            llm=self.summary_llm,
+            counter=self.token_counter,
+            max_token_limit=int(os.getenv('MEMORY_TOKEN_LIMIT', MEMORY_TOKEN_LIMIT)),
+            memory_key="chat_history",
+            return_messages=True,
+            output_key="answer"
+        )
+
+    def warmup_queries(self):
+        """The suggested questions plus the frequent queries listed in WARMUP_QUERIES_FILE"""
+        from ui_components import generate_top_questions
+
+        queries = list(generate_top_questions())
+        path = os.getenv('WARMUP_QUERIES_FILE', WARMUP_QUERIES_FILE)
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    queries += [query for query in json.load(f) if isinstance(query, str) and query.strip()]
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  Could not read warmup queries from {path}: {str(e)}")
+        return list(dict.fromkeys(queries))
+
+    def warmup(self, queries=None):
+        """
+        Take first-call costs off the first visitors' requests: runs the
+        embedding model (graph and tokenizer initialization), precomputes the
+        query embeddings of the warmup queries in one batch and runs retrieval
+        once (for every query, storing the results, with WARMUP_RETRIEVAL=true)
+
+        Args:
+            queries: Queries to prepare (default warmup_queries())
+
+        Returns:
+            Timings and counts, also kept as self.warmup_stats
+        """
+        if not self.ensure_chain():
+            return {}
+        queries = list(dict.fromkeys(queries if queries is not None else self.warmup_queries())) or ["warmup"]
+        stats = {"queries": len(queries)}
+
+        start = time.perf_counter()
+        cache = query_cache(self.vectorstore)
+        if cache is not None:
+            stats['embedded'] = cache.precompute(queries)
+        else:
+            self.vectorstore.embedding_function.embed_query(queries[0])
+        stats['embedding_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+        start = time.perf_counter()
+        if self.precomputed_retriever is not None:
+            self.precomputed_retriever.precompute(queries)
+            stats['precomputed_results'] = len(self.precomputed_retriever.results)
+        else:
+            self.retriever.search(queries[0])
+        stats['retrieval_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+        self.warmup_stats = stats
+        logger.info(f"🔥 Warmup: {stats['queries']} queries, embeddings {stats['embedding_ms']}ms, "
+                    f"retrieval {stats['retrieval_ms']}ms")
+        return stats
+
+    def get_memory(self, session_id=None):
+        """Memory of a conversation (None is the bot's own); least recently used sessions beyond MAX_SESSIONS are dropped"""
+        with self.memory_lock:
+            if session_id is None:
+                if self.memory is None:
+                    self.memory = self.create_memory()
+                return self.memory
+            if session_id in self.session_memories:
+                self.session_memories.move_to_end(session_id)
+            else:
+                self.session_memories[session_id] = self.create_memory()
+                while len(self.session_memories) > int(os.getenv('MAX_SESSIONS', 1000)):
+                    self.session_memories.popitem(last=False)
+            return self.session_memories[session_id]
+
+    def ensure_chain(self):
+        """Build the chain on first use (once, however many requests arrive together)"""
+        with self.chain_lock:
+            if not self.chain:
+                self.chain = self.initialize_chain()
+        return self.chain
+
+    def _start_turn(self, question):
         logger.info(f"Processing query: {question[:100]}...")  # Log first 100 chars
         self.last_query = question
+        self.last_error = None
+
+    def _chain_unavailable(self):
+        error_msg = "Sorry, I couldn't initialize the chatbot. Please check your configuration."
+        logger.error(error_msg)
+        self.last_error = error_msg
+        return error_msg, []
+
+    def _chain_inputs(self, question, memory):
+        return {"question": question,
+                "chat_history": memory.load_memory_variables({})["chat_history"]}
+
+    def _callbacks(self, trace, callbacks=None):
+        return {"callbacks": [TracingCallbackHandler(trace), TokenUsageHandler(self.token_counter, trace),
+                              *(callbacks or [])]}
+
+    def _finish_turn(self, question, memory, result, trace):
+        """Save the turn to memory and record the debug metrics; returns (answer, sources)"""
+        memory.save_context({"question": question}, {"answer": result['answer']})
+        sources = result.get('source_documents', [])
+        self.last_trace = trace.to_dict()
+        self.last_token_usage = {key: trace.attrs[key] for key in
+                                 ('context_tokens', 'input_tokens', 'output_tokens') if key in trace.attrs}
+
+        # Track retrieval metrics
+        self.last_retrieval_count = len(sources)
+        self.last_retrieved_clients = []
 
-        if not self.chain:
-            self.chain = self.initialize_chain()
+        for source in sources:
+            if source.metadata.get('type') == 'case_study':
+                client_name = source.metadata.get('client_name', 'Unknown')
+                if client_name not in self.last_retrieved_clients:
+                    self.last_retrieved_clients.append(client_name)
 
-        if not self.chain:
-            error_msg = "Sorry, I couldn't initialize the chatbot. Please check your configuration."
-            logger.error(error_msg)
-            return error_msg, []
+        logger.info(f"✓ Retrieved {self.last_retrieval_count} documents, {len(self.last_retrieved_clients)} unique case studies")
 
-        try:
-            result = self.chain.invoke({"question": question})
-            sources = result.get('source_documents', [])
+        return result['answer'], sources
 
-            # Track retrieval metrics
-            self.last_retrieval_count = len(sources)
-            self.last_retrieved_clients = []
+    def _failed_turn(self, e):
+        error_msg = f"❌ Error processing query: {str(e)}"
+        logger.error(error_msg)
+        self.last_error = error_msg
+        return f"Sorry, an error occurred: {str(e)}", []
 
-            for source in sources:
-                if source.metadata.get('type') == 'case_study':
-                    client_name = source.metadata.get('client_name', 'Unknown')
-                    if client_name not in self.last_retrieved_clients:
-                        self.last_retrieved_clients.append(client_name)
+    def get_response(self, question, session_id=None, callbacks=None):
+        """
+        Get response from the chatbot
 
-            logger.info(f"✓ Retrieved {self.last_retrieval_count} documents, {len(self.last_retrieved_clients)} unique case studies")
+        Args:
+            question: Visitor message
+            session_id: Conversation whose memory to use (default the bot's own)
+            callbacks: Extra LangChain callback handlers for this turn (e.g. token streaming)
+        """
+        self._start_turn(question)
+        if not self.ensure_chain():
+            return self._chain_unavailable()
 
-            return result['answer'], sources
+        try:
+            memory = self.get_memory(session_id)
+            with self.tracer.trace('chat_turn', question_chars=len(question)) as trace:
+                result = self.chain.invoke(self._chain_inputs(question, memory),
+                                           config=self._callbacks(trace, callbacks))
+                trace.attrs['retrieved'] = len(result.get('source_documents', []))
+            return self._finish_turn(question, memory, result, trace)
         except Exception as e:
-            error_msg = f"❌ Error processing query: {str(e)}"
-            logger.error(error_msg)
-            return f"Sorry, an error occurred: {str(e)}", []
+            return self._failed_turn(e)
+
+    async def aget_response(self, question, session_id=None, callbacks=None):
+        """
+        Async get_response: the Claude calls use the async client and retrieval
+        (query embedding, index search) runs in a worker thread, so one event
+        loop can serve many conversations at once. The previous turn's memory
+        summary keeps running in the background meanwhile.
+
+        Args:
+            question: Visitor message
+            session_id: Conversation whose memory to use (default the bot's own)
+            callbacks: Extra LangChain callback handlers for this turn (e.g. token streaming)
+        """
+        self._start_turn(question)
+        if not self.chain and not await asyncio.to_thread(self.ensure_chain):
+            return self._chain_unavailable()
 
+        try:
+            memory = self.get_memory(session_id)
+            with self.tracer.trace('chat_turn', question_chars=len(question)) as trace:
+                result = await self.chain.ainvoke(self._chain_inputs(question, memory),
+                                                  config=self._callbacks(trace, callbacks))
+                trace.attrs['retrieved'] = len(result.get('source_documents', []))
+            return self._finish_turn(question, memory, result, trace)
+        except Exception as e:
+            return self._failed_turn(e)
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def run_async(coroutine):
+    """
+    Run a coroutine on a process-wide event loop thread and wait for the result
+
+    For synchronous callers such as Streamlit scripts: every session shares
+    the one loop (and the async HTTP clients bound to it) instead of starting
+    a new loop per call.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='chat-loop', daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _loop).result()
 
 def main():
     """Main application function"""
+    # Page configuration (here rather than at import, so the bot can be used outside Streamlit)
+    st.set_page_config(
+        page_title="Shuru Tech | AI Solutions Dashboard",
+        page_icon="🚀",
+        layout="wide",
+        initial_sidebar_state="collapsed"
+    )
+
     from ui_components import (
         inject_new_styles,
         display_new_header,
         display_welcome_screen,
         display_suggested_questions,
         display_centered_contact_button,
-        display_chat_message
+        display_chat_message,
+        display_latency_panel
     )
     
     # Inject new light theme styles
@@ -340,10 +836,18 @@ def main():
     if 'bot' not in st.session_state:
         with st.spinner("Initializing chatbot..."):
             st.session_state.bot = ShuruTechRAGBot()
+            # Built here so knowledge base errors reach the page (responses run on the event loop thread)
+            st.session_state.bot.ensure_chain()
+            if os.getenv('WARMUP', 'true').lower() == 'true':
+                st.session_state.bot.warmup()
 
     # Initialize chat history
     if 'messages' not in st.session_state:
         st.session_state.messages = []
+
+    # Rolling per-stage latency in the sidebar (SHOW_LATENCY_PANEL=true)
+    if os.getenv('SHOW_LATENCY_PANEL', 'false').lower() == 'true':
+        display_latency_panel(get_tracer().summary(), st.session_state.bot.last_trace)
     
     # ==========================================
     # CONDITIONAL CONTENT DISPLAY
@@ -393,7 +897,7 @@ def main():
 
         # Get bot response
         with st.spinner("✨ Finding relevant solutions..."):
-            response, sources = st.session_state.bot.get_response(prompt)
+            response, sources = run_async(st.session_state.bot.aget_response(prompt))
             display_chat_message("assistant", response)
             
             # Add Contact Us button after response
@@ -0,0 +1,247 @@
+"""
+Crawler benchmark against the local fixture site
+Runs each crawler mode against fixture_site.py (served from a child process)
+and reports, per mode:
+- Throughput: requests, pages/sec, bytes transferred, CPU per page (crawler process only)
+- Extraction accuracy against the fixture's ground truth: coverage of
+  case-study pages, client name and industry accuracy, technology precision/recall
+
+Modes:
+    website            scrape_website.py BFS crawl from the seed paths
+    playwright-static  scrape_with_playwright.py sitemap discovery + static HTTP tier
+    playwright-render  scrape_with_playwright.py sitemap discovery, every page rendered in Chromium
+
+Usage:
+    python benchmark_crawler.py --case-studies 50
+    python benchmark_crawler.py --modes website --delay 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from benchmark_retrieval import RESULTS_DIR
+from fixture_site import FixtureServer, SyntheticSite
+from vocabulary import INDUSTRIES, TECHNOLOGIES
+
+logger = logging.getLogger(__name__)
+
+
+def run_website(base_url: str, options: argparse.Namespace) -> List[Dict]:
+    """BFS crawl with AdvancedShuruTechScraper; returns extracted case studies"""
+    from scrape_website import AdvancedShuruTechScraper
+
+    scraper = AdvancedShuruTechScraper(base_url=f"{base_url}/", max_pages=options.max_pages,
+                                       max_depth=options.max_depth, archive_dir=None,
+                                       request_delay=options.delay)
+    knowledge_base = scraper.scrape()
+    return [{"url": cs.get('source_url'), "client_name": cs.get('client_name'),
+             "industry": cs.get('industry'), "technologies": cs.get('technologies_used', [])}
+            for cs in knowledge_base['case_studies']]
+
+
+def run_playwright(base_url: str, options: argparse.Namespace, static_first: bool) -> List[Dict]:
+    """Sitemap discovery plus PlaywrightScraper; returns extracted case studies"""
+    from scrape_with_playwright import PlaywrightScraper
+
+    scraper = PlaywrightScraper(timeout=15000, static_first=static_first, store_path=None, archive_dir=None,
+                                site_root=base_url, request_delay=options.delay, render_wait_ms=0)
+    urls = scraper.discover_from_sitemaps(changed_only=False)
+    case_studies = asyncio.run(scraper.scrape_multiple_case_studies(urls))
+    return [{"url": cs.get('url'), "client_name": cs.get('client_name'),
+             "industry": cs.get('industry'), "technologies": cs.get('technologies', [])}
+            for cs in case_studies]
+
+
+def chromium_available() -> Optional[str]:
+    """None if Chromium can be launched, else the reason it cannot"""
+    from playwright.async_api import async_playwright
+
+    async def probe():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+
+    try:
+        asyncio.run(probe())
+        return None
+    except Exception as e:
+        return str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+
+
+# Crawler modes: name -> (runner(base_url, options), needs Chromium)
+MODES: Dict[str, tuple] = {
+    'website': (run_website, False),
+    'playwright-static': (lambda base_url, options: run_playwright(base_url, options, static_first=True), False),
+    'playwright-render': (lambda base_url, options: run_playwright(base_url, options, static_first=False), True),
+}
+
+
+def evaluate(records: List[Dict], truth: Dict[str, Dict]) -> Dict:
+    """
+    Score extracted case studies against ground truth
+
+    Records are matched to ground-truth pages by URL path; for pages with
+    several records the best-matching one counts. Accuracy and technology
+    precision/recall are over the pages that were covered.
+    """
+    by_path = defaultdict(list)
+    spurious = 0
+    for record in records:
+        path = urlparse(record.get('url') or '').path
+        if path in truth:
+            by_path[path].append(record)
+        else:
+            spurious += 1
+
+    def tech_keys(values):
+        return {TECHNOLOGIES.key(value) for value in values or [] if isinstance(value, str)}
+
+    def match(record, expected):
+        name = (record.get('client_name') or '').strip().lower() == expected['client_name'].lower()
+        industry = INDUSTRIES.key(record.get('industry') or '') == INDUSTRIES.key(expected['industry'])
+        return name, industry, tech_keys(record.get('technologies')), tech_keys(expected['technologies'])
+
+    covered = name_hits = industry_hits = true_pos = false_pos = false_neg = 0
+    for path, expected in truth.items():
+        if not by_path.get(path):
+            continue
+        covered += 1
+        name, industry, found, wanted = max(
+            (match(record, expected) for record in by_path[path]),
+            key=lambda m: (m[0] + m[1], len(m[2] & m[3]), -len(m[2] - m[3]))
+        )
+        name_hits += name
+        industry_hits += industry
+        true_pos += len(found & wanted)
+        false_pos += len(found - wanted)
+        false_neg += len(wanted - found)
+
+    return {
+        "pages": len(truth),
+        "coverage": covered / len(truth) if truth else 0.0,
+        "client_name_accuracy": name_hits / covered if covered else 0.0,
+        "industry_accuracy": industry_hits / covered if covered else 0.0,
+        "technology_precision": true_pos / (true_pos + false_pos) if true_pos + false_pos else 0.0,
+        "technology_recall": true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0,
+        "records": len(records),
+        "spurious_records": spurious
+    }
+
+
+def run_mode(name: str, runner: Callable, server: FixtureServer, truth: Dict[str, Dict],
+             options: argparse.Namespace) -> Dict:
+    """Run one crawler mode and collect throughput and accuracy"""
+    server.reset_stats()
+    output = contextlib.nullcontext() if options.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with output:
+        records = runner(server.base_url, options)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    stats = server.stats()
+    requests_made = stats['requests']
+    return {
+        "elapsed_s": elapsed,
+        "requests": requests_made,
+        "status": stats['status'],
+        "bytes": stats['bytes'],
+        "pages_per_s": requests_made / elapsed if elapsed else 0.0,
+        "cpu_per_page_ms": cpu * 1000 / requests_made if requests_made else 0.0,
+        "accuracy": evaluate(records, truth)
+    }
+
+
+def print_report(results: Dict):
+    """Print a per-mode summary"""
+    print("\n" + "=" * 70)
+    print("🕷️  CRAWLER BENCHMARK")
+    print("=" * 70)
+    site = results['site']
+    print(f"   Fixture: {site['case_studies']} case studies (seed {site['seed']}), "
+          f"{site['slow_ratio']:.0%} slow at {site['slow_delay']}s, {site['error_ratio']:.0%} errors"
+          f"  |  delay {results['delay']}s")
+
+    for name, mode in results['modes'].items():
+        print(f"\n   {name}")
+        if 'skipped' in mode:
+            print(f"      skipped: {mode['skipped']}")
+            continue
+        accuracy = mode['accuracy']
+        print(f"      {mode['requests']} requests in {mode['elapsed_s']:.1f}s  |  {mode['pages_per_s']:.1f} pages/s"
+              f"  |  {mode['bytes'] / 1024:.0f} KB  |  CPU {mode['cpu_per_page_ms']:.1f}ms/page")
+        print(f"      status: " + ', '.join(f"{code}={count}" for code, count in sorted(mode['status'].items())))
+        print(f"      coverage {accuracy['coverage']:.0%}  |  client name {accuracy['client_name_accuracy']:.0%}"
+              f"  |  industry {accuracy['industry_accuracy']:.0%}  |  technologies "
+              f"P {accuracy['technology_precision']:.0%} / R {accuracy['technology_recall']:.0%}")
+        print(f"      {accuracy['records']} records, {accuracy['spurious_records']} not on a case-study page")
+    print("=" * 70)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the crawlers against the local fixture site")
+    parser.add_argument('--modes', default=','.join(MODES), help="Comma-separated crawler modes")
+    parser.add_argument('--case-studies', type=int, default=30, help="Case-study pages in the fixture")
+    parser.add_argument('--seed', type=int, default=7, help="Fixture seed")
+    parser.add_argument('--slow-ratio', type=float, default=0.1, help="Share of slow case-study pages")
+    parser.add_argument('--slow-delay', type=float, default=0.5, help="Seconds a slow page takes")
+    parser.add_argument('--error-ratio', type=float, default=0.05, help="Share of pages returning 500")
+    parser.add_argument('--delay', type=float, default=0.0, help="Crawler politeness delay between requests")
+    parser.add_argument('--max-pages', type=int, help="Website crawler page budget (default case studies + 20)")
+    parser.add_argument('--max-depth', type=int, default=3, help="Website crawler depth limit")
+    parser.add_argument('--output', help="Results file (default benchmarks/results/crawler-<timestamp>.json)")
+    parser.add_argument('--verbose', action='store_true', help="Show the crawlers' own output")
+    options = parser.parse_args(argv)
+
+    names = [name.strip() for name in options.modes.split(',') if name.strip()]
+    unknown = [name for name in names if name not in MODES]
+    if unknown:
+        parser.error(f"Unknown mode(s): {', '.join(unknown)} (known: {', '.join(MODES)})")
+    options.max_pages = options.max_pages or options.case_studies + 20
+
+    if not options.verbose:
+        logging.getLogger('scrape_website').setLevel(logging.CRITICAL)
+
+    site_options = {"case_studies": options.case_studies, "seed": options.seed, "slow_ratio": options.slow_ratio,
+                    "slow_delay": options.slow_delay, "error_ratio": options.error_ratio}
+    truth = SyntheticSite(**site_options).ground_truth()
+
+    results = {"run_at": datetime.now().isoformat(), "site": site_options, "delay": options.delay, "modes": {}}
+    with FixtureServer(**site_options) as server:
+        print(f"🧪 Fixture site at {server.base_url} ({options.case_studies} case studies)")
+        for name in names:
+            runner, needs_browser = MODES[name]
+            reason = chromium_available() if needs_browser else None
+            if reason:
+                print(f"⏭️  Skipping '{name}': Chromium unavailable ({reason})")
+                results['modes'][name] = {"skipped": f"Chromium unavailable: {reason}"}
+                continue
+            print(f"⏱️  Crawling with '{name}'...")
+            results['modes'][name] = run_mode(name, runner, server, truth, options)
+
+    output = options.output or os.path.join(RESULTS_DIR, f"crawler-{datetime.now():%Y%m%d-%H%M%S}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print_report(results)
+    print(f"💾 Results saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Vector index benchmark: recall vs latency vs memory
+Builds each FAISS index configuration from vector_index.py over the same
+vectors and reports, per configuration:
+- recall@k against exact (flat) search
+- Single-query search latency p50/p95/p99 (the app searches one query at a time)
+- Index memory (serialized size) and bytes per vector
+- Train and add time
+Configurations that share build parameters reuse one index and only change
+nprobe / efSearch, so a sweep traces the recall/latency curve cheaply.
+
+Vectors are either a synthetic clustered corpus (for sizes the knowledge base
+has not reached yet) or the knowledge base embedded with the app's model.
+
+Usage:
+    python benchmark_index.py --size 100000                 # synthetic, all configurations
+    python benchmark_index.py --configs flat,hnsw/ef=64,ivf-pq/nprobe=16
+    python benchmark_index.py --source kb                   # the real knowledge base
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from benchmark_retrieval import QUERIES_FILE, RESULTS_DIR, latency_summary, load_queries
+from vector_index import (BUILD_DEFAULTS, INDEX_TYPES, SEARCH_DEFAULTS, build_config, build_index,
+                          configure_search, index_memory_bytes)
+
+# Configurations: name -> parameter overrides on the vector_index defaults
+INDEX_CONFIGS: Dict[str, Dict] = {
+    'flat': {"type": 'flat'},
+    'sq8': {"type": 'sq8'},
+    'sq-fp16': {"type": 'sq-fp16'},
+    'ivf-flat/nprobe=1': {"type": 'ivf-flat', "nprobe": 1},
+    'ivf-flat/nprobe=8': {"type": 'ivf-flat', "nprobe": 8},
+    'ivf-flat/nprobe=32': {"type": 'ivf-flat', "nprobe": 32},
+    'ivf-sq8/nprobe=8': {"type": 'ivf-sq8', "nprobe": 8},
+    'ivf-sq8/nprobe=32': {"type": 'ivf-sq8', "nprobe": 32},
+    'ivf-pq/nprobe=8': {"type": 'ivf-pq', "nprobe": 8},
+    'ivf-pq/nprobe=32': {"type": 'ivf-pq', "nprobe": 32},
+    'hnsw/ef=16': {"type": 'hnsw', "ef_search": 16},
+    'hnsw/ef=64': {"type": 'hnsw', "ef_search": 64},
+    'hnsw/ef=128': {"type": 'hnsw', "ef_search": 128},
+}
+
+
+def parse_config(name: str) -> Dict:
+    """
+    Parameters for a named configuration, or an ad-hoc one like 'ivf-pq/nprobe=16,pq_m=24'
+    (written with ';' between parameters on the command line)
+    """
+    if name in INDEX_CONFIGS:
+        overrides = INDEX_CONFIGS[name]
+    else:
+        index_type, _, options = name.partition('/')
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}' (known: {', '.join(INDEX_TYPES)})")
+        overrides = {"type": index_type}
+        for option in filter(None, options.split(',')):
+            key, _, value = option.partition('=')
+            key = {'ef': 'ef_search'}.get(key, key)
+            if key not in BUILD_DEFAULTS and key not in SEARCH_DEFAULTS:
+                raise ValueError(f"Unknown index parameter '{key}' in '{name}'")
+            overrides[key] = int(value)
+    return {**BUILD_DEFAULTS, **SEARCH_DEFAULTS, **overrides}
+
+
+def synthetic_vectors(size: int, queries: int, dim: int, clusters: int, spread: float,
+                      seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unit-length vectors drawn around random cluster centers, like sentence embeddings
+
+    Args:
+        spread: Noise scale relative to the centers; higher values overlap the
+            clusters more, which is what makes approximate search lose recall
+
+    Returns:
+        (corpus, queries), queries drawn from the same clusters but not in the corpus
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+
+    def sample(count):
+        noise = spread * rng.standard_normal((count, dim)).astype(np.float32)
+        points = centers[rng.integers(0, clusters, count)] + noise
+        return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+    return sample(size), sample(queries)
+
+
+def knowledge_base_vectors() -> Tuple[np.ndarray, np.ndarray]:
+    """The app's index vectors and the labeled benchmark queries, embedded with the app's model"""
+    # Imported here so synthetic runs work without the app's dependencies
+    from benchmark_retrieval import build_bot
+
+    bot = build_bot()
+    store = bot.vectorstore
+    # Re-embedded rather than reconstructed, since quantized/IVF indexes cannot give back exact vectors
+    texts = [store.docstore.search(chunk_id).page_content for chunk_id in store.index_to_docstore_id.values()]
+    corpus = np.array(store.embedding_function.embed_documents(texts), dtype=np.float32)
+    queries = np.array([store.embedding_function.embed_query(entry['query'])
+                        for entry in load_queries(QUERIES_FILE)], dtype=np.float32)
+    return corpus, queries
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """Share of the exact top k that the index also returned"""
+    hits = sum(len(set(row_found[row_found >= 0]) & set(row_truth)) for row_found, row_truth in zip(found, truth))
+    return hits / truth.size if truth.size else 0.0
+
+
+def benchmark_index(index: faiss.Index, queries: np.ndarray, truth: np.ndarray, k: int,
+                    repetitions: int) -> Dict:
+    """Recall and single-query latency of a built index"""
+    _, found = index.search(queries, k)
+    timings = []
+    for _ in range(repetitions):
+        for row in range(len(queries)):
+            start = time.perf_counter()
+            index.search(queries[row:row + 1], k)
+            timings.append(time.perf_counter() - start)
+    return {"recall": recall_at_k(found, truth), "latency_ms": latency_summary(timings)}
+
+
+def run(corpus: np.ndarray, queries: np.ndarray, names: List[str], k: int, repetitions: int) -> Dict:
+    """Benchmark each configuration; returns {name: result}"""
+    exact = faiss.IndexFlatL2(corpus.shape[1])
+    exact.add(corpus)
+    _, truth = exact.search(queries, k)
+
+    built: Dict[str, Tuple[faiss.Index, Dict]] = {}
+    results = {}
+    for name in names:
+        params = parse_config(name)
+        key = json.dumps(build_config(params), sort_keys=True)
+        if key not in built:
+            print(f"🔨 Building {params['type']} over {len(corpus)} vectors...")
+            built[key] = build_index(corpus, params)
+        index, build = built[key]
+        configure_search(index, params)
+
+        print(f"⏱️  Benchmarking '{name}'...")
+        memory = index_memory_bytes(index)
+        results[name] = {
+            "build": build,
+            "search": {param: params[param] for param in SEARCH_DEFAULTS},
+            "memory_bytes": memory,
+            "bytes_per_vector": memory / index.ntotal if index.ntotal else 0.0,
+            **benchmark_index(index, queries, truth, k, repetitions)
+        }
+    return results
+
+
+def print_report(results: Dict):
+    """Print one row per configuration"""
+    print("\n" + "=" * 86)
+    print("🗂️  VECTOR INDEX BENCHMARK")
+    print("=" * 86)
+    corpus = results['corpus']
+    print(f"   {corpus['source']}: {corpus['vectors']} vectors x {corpus['dim']} dims, "
+          f"{corpus['queries']} queries, recall@{results['k']} vs exact search, {results['threads']} thread(s)")
+    print(f"\n   {'configuration':<22}{'recall':>8}{'p50 ms':>9}{'p95 ms':>9}{'memory':>11}"
+          f"{'B/vector':>10}{'train s':>9}{'add s':>8}")
+    for name, result in results['configs'].items():
+        latency = result['latency_ms']
+        build = result['build']
+        print(f"   {name:<22}{result['recall']:>8.3f}{latency['p50']:>9.3f}{latency['p95']:>9.3f}"
+              f"{result['memory_bytes'] / 1024 / 1024:>9.1f}MB{result['bytes_per_vector']:>10.0f}"
+              f"{build['train_seconds']:>9.2f}{build['add_seconds']:>8.2f}")
+    print("=" * 86)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index types: recall vs latency vs memory")
+    parser.add_argument('--configs', default=','.join(INDEX_CONFIGS),
+                        help="Comma-separated configurations (named, or e.g. 'ivf-pq/nprobe=16;pq_m=24')")
+    parser.add_argument('--source', choices=('synthetic', 'kb'), default='synthetic', help="Vectors to index")
+    parser.add_argument('--size', type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument('--dim', type=int, default=384, help="Synthetic vector dimension")
+    parser.add_argument('--clusters', type=int, default=500, help="Synthetic topic clusters")
+    parser.add_argument('--spread', type=float, default=2.0, help="Synthetic cluster overlap")
+    parser.add_argument('--queries', type=int, default=200, help="Synthetic queries")
+    parser.add_argument('--seed', type=int, default=7, help="Synthetic data seed")
+    parser.add_argument('--k', type=int, default=10, help="Neighbours per query")
+    parser.add_argument('--repetitions', type=int, default=3, help="Timed passes over the queries")
+    parser.add_argument('--threads', type=int, default=1, help="FAISS threads (1 matches per-request search)")
+    parser.add_argument('--output', help="Results file (default benchmarks/results/index-<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    # Configurations are comma-separated, so ad-hoc parameters inside one use ';'
+    names = [name.strip().replace(';', ',') for name in args.configs.split(',') if name.strip()]
+    try:
+        for name in names:
+            parse_config(name)
+    except ValueError as e:
+        parser.error(str(e))
+
+    faiss.omp_set_num_threads(args.threads)
+    if args.source == 'kb':
+        corpus, queries = knowledge_base_vectors()
+    else:
+        corpus, queries = synthetic_vectors(args.size, args.queries, args.dim, args.clusters, args.spread, args.seed)
+
+    results = {
+        "run_at": datetime.now().isoformat(),
+        "corpus": {"source": args.source, "vectors": len(corpus), "dim": corpus.shape[1], "queries": len(queries)},
+        "k": args.k,
+        "threads": args.threads,
+        "configs": run(corpus, queries, names, args.k, args.repetitions)
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"index-{datetime.now():%Y%m%d-%H%M%S}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print_report(results)
+    print(f"💾 Results saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Retrieval benchmark and quality regression suite
+Runs a labeled query set (benchmarks/retrieval_queries.json) against one or
+more retrieval configurations and reports:
+- Quality: recall@k, MRR and nDCG@k over the retrieved case studies
+- Latency: p50/p95/p99 over many repetitions, after warmup runs
+Results are written as JSON and can be compared against a stored baseline;
+the exit code is 1 when quality or latency regressed.
+
+Usage:
+    python benchmark_retrieval.py                        # all configurations
+    python benchmark_retrieval.py --configs similarity --repetitions 50
+    python benchmark_retrieval.py --save-baseline        # store this run as the baseline
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from tracing import percentile
+
+QUERIES_FILE = 'benchmarks/retrieval_queries.json'
+BASELINE_FILE = 'benchmarks/retrieval_baseline.json'
+RESULTS_DIR = 'benchmarks/results'
+
+DEFAULT_KS = (1, 3, 5)
+# Chunks fetched per requested document, since several chunks can belong to one document
+CHUNK_FANOUT = 3
+
+# Allowed drop in a quality metric (absolute) and rise in p95 latency (relative)
+QUALITY_TOLERANCE = 0.02
+LATENCY_TOLERANCE = 0.25
+# p95 differences below this are timer noise, whatever the ratio
+LATENCY_FLOOR_MS = 1.0
+
+
+def load_queries(path: str = QUERIES_FILE) -> List[Dict]:
+    """
+    Load the labeled query set
+
+    Returns:
+        List of {"id", "query", "relevant": {client_name: grade}}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    queries = data.get('queries', []) if isinstance(data, dict) else data
+    for position, entry in enumerate(queries):
+        if not entry.get('query') or not entry.get('relevant'):
+            raise ValueError(f"Query {position} in {path} needs 'query' and 'relevant'")
+        entry.setdefault('id', f"q{position + 1}")
+    return queries
+
+
+def document_id(doc) -> str:
+    """Identity used for relevance labels: client name for case studies, else the document key"""
+    metadata = doc.metadata
+    if metadata.get('type') == 'case_study':
+        return metadata.get('client_name', '')
+    return metadata.get('doc_key') or metadata.get('source', '')
+
+
+def rank_documents(docs: Sequence) -> List[str]:
+    """Collapse retrieved chunks into a ranked list of unique document ids"""
+    ranked = []
+    for doc in docs:
+        ident = document_id(doc)
+        if ident not in ranked:
+            ranked.append(ident)
+    return ranked
+
+
+def recall_at_k(ranked: List[str], relevant: Dict[str, int], k: int) -> float:
+    hits = sum(1 for ident in ranked[:k] if relevant.get(ident, 0) > 0)
+    total = sum(1 for grade in relevant.values() if grade > 0)
+    return hits / total if total else 0.0
+
+
+def reciprocal_rank(ranked: List[str], relevant: Dict[str, int]) -> float:
+    for position, ident in enumerate(ranked, 1):
+        if relevant.get(ident, 0) > 0:
+            return 1.0 / position
+    return 0.0
+
+
+def ndcg_at_k(ranked: List[str], relevant: Dict[str, int], k: int) -> float:
+    """Normalized discounted cumulative gain with graded relevance"""
+    dcg = sum((2 ** relevant.get(ident, 0) - 1) / math.log2(position + 1)
+              for position, ident in enumerate(ranked[:k], 1))
+    ideal = sorted(relevant.values(), reverse=True)[:k]
+    idcg = sum((2 ** grade - 1) / math.log2(position + 1)
+               for position, grade in enumerate(ideal, 1))
+    return dcg / idcg if idcg else 0.0
+
+
+def score_query(ranked: List[str], relevant: Dict[str, int], ks: Sequence[int]) -> Dict[str, float]:
+    """All quality metrics for one query"""
+    scores = {"mrr": reciprocal_rank(ranked, relevant)}
+    for k in ks:
+        scores[f"recall@{k}"] = recall_at_k(ranked, relevant, k)
+        scores[f"ndcg@{k}"] = ndcg_at_k(ranked, relevant, k)
+    return scores
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max in milliseconds"""
+    millis = [value * 1000 for value in seconds]
+    return {
+        "p50": percentile(millis, 50),
+        "p95": percentile(millis, 95),
+        "p99": percentile(millis, 99),
+        "mean": statistics.fmean(millis) if millis else 0.0,
+        "max": max(millis, default=0.0),
+        "samples": len(millis)
+    }
+
+
+def run_benchmark(search: Callable[[str, int], List], queries: List[Dict],
+                  ks: Sequence[int] = DEFAULT_KS, repetitions: int = 20, warmup: int = 3) -> Dict:
+    """
+    Benchmark one retrieval configuration
+
+    Args:
+        search: Function (query, k) -> retrieved chunks (LangChain Documents)
+        queries: Labeled queries from load_queries()
+        ks: Cutoffs for recall@k and nDCG@k
+        repetitions: Timed passes over the query set
+        warmup: Untimed passes before timing (model and cache warmup)
+
+    Returns:
+        {"quality": mean metrics, "latency_ms": percentiles, "per_query": [...]}
+    """
+    depth = max(ks) * CHUNK_FANOUT
+
+    for _ in range(warmup):
+        for entry in queries:
+            search(entry['query'], depth)
+
+    per_query = []
+    for entry in queries:
+        ranked = rank_documents(search(entry['query'], depth))[:max(ks)]
+        per_query.append({
+            "id": entry['id'],
+            "query": entry['query'],
+            "retrieved": ranked,
+            **score_query(ranked, entry['relevant'], ks)
+        })
+
+    timings = []
+    for _ in range(repetitions):
+        for entry in queries:
+            start = time.perf_counter()
+            search(entry['query'], depth)
+            timings.append(time.perf_counter() - start)
+
+    metric_names = [name for name in per_query[0] if name not in ('id', 'query', 'retrieved')] if per_query else []
+    quality = {name: statistics.fmean(result[name] for result in per_query) for name in metric_names}
+    return {"quality": quality, "latency_ms": latency_summary(timings), "per_query": per_query}
+
+
+def compare_with_baseline(results: Dict, baseline: Dict,
+                          quality_tolerance: float = QUALITY_TOLERANCE,
+                          latency_tolerance: float = LATENCY_TOLERANCE) -> List[str]:
+    """
+    Regressions of this run against a baseline run
+
+    Returns:
+        Human-readable regression messages (empty if none); configurations
+        missing from either run are not compared
+    """
+    regressions = []
+    for name, current in results.get('configs', {}).items():
+        previous = baseline.get('configs', {}).get(name)
+        if not previous:
+            continue
+
+        for metric, old_value in previous.get('quality', {}).items():
+            new_value = current['quality'].get(metric)
+            if new_value is not None and new_value < old_value - quality_tolerance:
+                regressions.append(f"{name}: {metric} dropped {old_value:.3f} -> {new_value:.3f}")
+
+        old_p95 = previous.get('latency_ms', {}).get('p95')
+        new_p95 = current['latency_ms']['p95']
+        if old_p95 and new_p95 > old_p95 * (1 + latency_tolerance) and new_p95 - old_p95 > LATENCY_FLOOR_MS:
+            regressions.append(f"{name}: p95 latency rose {old_p95:.1f}ms -> {new_p95:.1f}ms")
+    return regressions
+
+
+def similarity_search(bot) -> Callable[[str, int], List]:
+    """Plain vector similarity, as the app's retriever uses it"""
+    return lambda query, k: bot.vectorstore.similarity_search(query, k=k)
+
+
+def mmr_search(bot) -> Callable[[str, int], List]:
+    """Maximal marginal relevance over a wider candidate set"""
+    return lambda query, k: bot.vectorstore.max_marginal_relevance_search(query, k=k, fetch_k=k * 4)
+
+
+def bm25_search(bot) -> Callable[[str, int], List]:
+    """Lexical BM25 alone, over the vector store's chunks"""
+    from retrieval import BM25Index
+
+    index = BM25Index.from_vectorstore(bot.vectorstore)
+    return lambda query, k: [doc for doc, _ in index.search(query, k)]
+
+
+def filtered_search(bot) -> Callable[[str, int], List]:
+    """Vector similarity restricted to case studies matching the industries/technologies a query names"""
+    from retrieval import BM25Index, HybridRetriever, MetadataIndex
+
+    retriever = HybridRetriever(vectorstore=bot.vectorstore, lexical_index=BM25Index(), lexical_weight=0.0,
+                                dense_k=5, metadata_index=MetadataIndex.from_vectorstore(bot.vectorstore),
+                                collapse_parents=bot.indexing_mode != 'chunks')
+    return lambda query, k: retriever.search(query, k)
+
+
+def hybrid_search(bot) -> Callable[[str, int], List]:
+    """Dense and BM25 fused with reciprocal rank fusion, as the app's default retriever"""
+    retriever = bot.create_retriever(mode='hybrid')
+    return lambda query, k: retriever.search(query, k)
+
+
+def rerank_search(bot) -> Callable[[str, int], List]:
+    """Hybrid candidates rescored by the cross-encoder (no latency budget, so every query is reranked)"""
+    from reranker import Reranker, RerankingRetriever, get_reranker
+
+    reranker = Reranker(get_reranker().scorer, budget_ms=float('inf'))
+    retriever = RerankingRetriever(base_retriever=bot.create_retriever(mode='hybrid'), reranker=reranker,
+                                   candidates=int(os.getenv('RERANK_CANDIDATES', 20)))
+    return lambda query, k: retriever.search(query, k)
+
+
+# Retrieval configurations: name -> factory(bot) returning a search function
+RETRIEVAL_CONFIGS: Dict[str, Callable] = {
+    'similarity': similarity_search,
+    'mmr': mmr_search,
+    'filtered': filtered_search,
+    'bm25': bm25_search,
+    'hybrid': hybrid_search,
+    'rerank': rerank_search,
+}
+
+
+def build_bot():
+    """Load the knowledge base and vector store the way the app does"""
+    # Imported here so the metric helpers stay usable without the app's dependencies
+    from app import ShuruTechRAGBot
+
+    bot = ShuruTechRAGBot()
+    documents = bot.load_knowledge_base()
+    if not documents:
+        raise RuntimeError(f"No documents loaded from {bot.knowledge_base_path}")
+    bot.vectorstore = bot.create_vectorstore(documents)
+    if bot.vectorstore is None:
+        raise RuntimeError("Vector store could not be created")
+    return bot
+
+
+def print_report(results: Dict, regressions: Optional[List[str]]):
+    """Print a per-configuration summary table"""
+    print("\n" + "=" * 70)
+    print("📏 RETRIEVAL BENCHMARK")
+    print("=" * 70)
+    print(f"   Queries: {results['num_queries']}  |  Repetitions: {results['repetitions']}"
+          f"  |  Warmup: {results['warmup']}")
+
+    for name, config in results['configs'].items():
+        quality = config['quality']
+        latency = config['latency_ms']
+        print(f"\n   {name}")
+        print("      " + "  ".join(f"{metric}={value:.3f}" for metric, value in quality.items()))
+        print(f"      latency p50={latency['p50']:.1f}ms  p95={latency['p95']:.1f}ms  "
+              f"p99={latency['p99']:.1f}ms  (n={latency['samples']})")
+
+    if regressions is None:
+        print("\n   No baseline to compare against")
+    elif regressions:
+        print(f"\n   ⚠️  {len(regressions)} regression(s) against baseline:")
+        for message in regressions:
+            print(f"      - {message}")
+    else:
+        print("\n   ✓ No regressions against baseline")
+    print("=" * 70)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark retrieval quality and latency")
+    parser.add_argument('--queries', default=QUERIES_FILE, help="Labeled query set")
+    parser.add_argument('--configs', default=','.join(RETRIEVAL_CONFIGS),
+                        help="Comma-separated retrieval configurations")
+    parser.add_argument('--k', default=','.join(map(str, DEFAULT_KS)), help="Cutoffs for recall@k/nDCG@k")
+    parser.add_argument('--repetitions', type=int, default=20, help="Timed passes over the query set")
+    parser.add_argument('--warmup', type=int, default=3, help="Untimed passes before timing")
+    parser.add_argument('--output', help="Results file (default benchmarks/results/retrieval-<timestamp>.json)")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline results to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.configs.split(',') if name.strip()]
+    unknown = [name for name in names if name not in RETRIEVAL_CONFIGS]
+    if unknown:
+        parser.error(f"Unknown configuration(s): {', '.join(unknown)} (known: {', '.join(RETRIEVAL_CONFIGS)})")
+    ks = sorted({int(k) for k in args.k.split(',')})
+
+    queries = load_queries(args.queries)
+    bot = build_bot()
+
+    results = {
+        "run_at": datetime.now().isoformat(),
+        "queries_file": args.queries,
+        "num_queries": len(queries),
+        "ks": ks,
+        "repetitions": args.repetitions,
+        "warmup": args.warmup,
+        "configs": {}
+    }
+    for name in names:
+        print(f"⏱️  Benchmarking '{name}'...")
+        search = RETRIEVAL_CONFIGS[name](bot)
+        results['configs'][name] = run_benchmark(search, queries, ks, args.repetitions, args.warmup)
+
+    regressions = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_with_baseline(results, json.load(f))
+        results['regressions'] = regressions
+
+    output = args.output or os.path.join(RESULTS_DIR, f"retrieval-{datetime.now():%Y%m%d-%H%M%S}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print_report(results, regressions)
+    print(f"💾 Results saved to {output}" + (f" and {args.baseline}" if args.save_baseline else ""))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
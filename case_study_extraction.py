@@ -0,0 +1,153 @@
+"""
+Single-pass section segmentation for case study articles
+Tags every line once with the categories it matches (challenge, solution,
+result, metric) using precompiled matchers, then derives all fields from
+that one tagged pass
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern
+
+
+# Keyword lists per section (matched as lowercase substrings, like extract_section)
+SECTION_KEYWORDS = {
+    'challenge': [
+        'challenge', 'problem', 'issue', 'pain point', 'struggle',
+        'difficulty', 'before', 'situation'
+    ],
+    'solution': [
+        'solution', 'approach', 'implemented', 'built', 'developed',
+        'created', 'how we', 'what we did'
+    ],
+    'result': [
+        'result', 'outcome', 'impact', 'achievement', 'success',
+        'improvement', 'growth', 'increase', 'reduction'
+    ],
+}
+
+# Metric kinds in output order, with the number of matches kept per kind
+METRIC_LIMITS = {'percent': 3, 'times': 2, 'money': 2}
+
+METRIC_PATTERN = re.compile(
+    r'(?P<percent>(?i:\d+%\s+(?:increase|improvement|growth|reduction|decrease)))'
+    r'|(?P<times>(?i:\d+x\s+(?:growth|increase|faster)))'
+    r'|(?P<money>[\$€£]\d+(?:K|M|B)?)'
+)
+
+SECTION_WINDOW = 10      # Lines scanned after a keyword hit
+SECTION_MIN_LINE = 20    # Lines this short are skipped inside a section
+SECTION_TARGET = 300     # Stop collecting once the section is this long
+SECTION_MAX = 500        # Hard cap on section length
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def compile_keywords(keywords: List[str]) -> Pattern:
+    """Compile a keyword list into one substring matcher"""
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+class TaggedLine:
+    """One content line with its stripped text and matched categories"""
+
+    __slots__ = ('text', 'categories', 'metrics')
+
+    def __init__(self, text: str, categories: frozenset, metrics: List):
+        self.text = text
+        self.categories = categories
+        self.metrics = metrics  # [(kind, matched_text), ...]
+
+
+class SectionSegmenter:
+    """Tag article lines once and derive problem/solution/results from the tags"""
+
+    FIELD_CATEGORIES = {'problem': 'challenge', 'solution': 'solution', 'results': 'result'}
+
+    def __init__(self, section_keywords: Optional[Dict[str, List[str]]] = None):
+        keywords = section_keywords or SECTION_KEYWORDS
+        self.matchers = {category: compile_keywords(words) for category, words in keywords.items()}
+
+    def tag(self, content: str) -> List[TaggedLine]:
+        """Single pass over the content: one tagged record per line"""
+        # Metric phrases may wrap onto the next line ("40%\nincrease"), so the
+        # metric matcher runs over the whole text and each hit is assigned to
+        # the line it starts on
+        metric_hits = METRIC_PATTERN.finditer(content)
+        next_hit = next(metric_hits, None)
+
+        tagged = []
+        line_end = -1
+        for line in content.split('\n'):
+            line_end += len(line) + 1
+            line_lower = line.lower()
+            categories = [category for category, matcher in self.matchers.items()
+                          if matcher.search(line_lower)]
+
+            metrics = []
+            while next_hit is not None and next_hit.start() < line_end:
+                metrics.append((next_hit.lastgroup, next_hit.group(0)))
+                next_hit = next(metric_hits, None)
+            if metrics:
+                categories.append('metric')
+
+            tagged.append(TaggedLine(line.strip(), frozenset(categories), metrics))
+        return tagged
+
+    def section(self, tagged: List[TaggedLine], category: str) -> Optional[str]:
+        """First non-empty section that starts at a line tagged with the category"""
+        for i, line in enumerate(tagged):
+            if category not in line.categories:
+                continue
+
+            section_lines = []
+            length = -1  # Running length of ' '.join(section_lines)
+            for window_line in tagged[i:i + SECTION_WINDOW]:
+                if window_line.text and len(window_line.text) > SECTION_MIN_LINE:
+                    section_lines.append(window_line.text)
+                    length += len(window_line.text) + 1
+                if length > SECTION_TARGET:
+                    break
+
+            if section_lines:
+                section = _WHITESPACE.sub(' ', ' '.join(section_lines))
+                return section[:SECTION_MAX]
+
+        return None
+
+    def metrics(self, tagged: List[TaggedLine]) -> Optional[str]:
+        """Metric phrases from the tagged lines, capped per kind"""
+        found = {kind: [] for kind in METRIC_LIMITS}
+        for line in tagged:
+            for kind, text in line.metrics:
+                found[kind].append(text)
+
+        metrics = []
+        for kind, limit in METRIC_LIMITS.items():
+            metrics.extend(found[kind][:limit])
+
+        return ', '.join(metrics) if metrics else None
+
+    def extract(self, content: str) -> Dict[str, Optional[str]]:
+        """
+        Extract problem, solution and results (with metrics folded into results)
+
+        Args:
+            content: Article text
+
+        Returns:
+            Dict with problem, solution, results and metrics (each may be None)
+        """
+        tagged = self.tag(content)
+        fields = {field: self.section(tagged, category)
+                  for field, category in self.FIELD_CATEGORIES.items()}
+
+        metrics = self.metrics(tagged)
+        fields['metrics'] = metrics
+        if metrics:
+            results = fields['results']
+            if results and 'Not specified' not in results:
+                fields['results'] = f"{results} {metrics}"
+            else:
+                fields['results'] = metrics
+
+        return fields
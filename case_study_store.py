@@ -0,0 +1,116 @@
+"""
+Persistent per-URL store for scraped case studies
+Keeps a stable ID, the last-seen content hash and the extraction result for
+every case study URL so scheduled scrapes only re-extract what changed
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def content_hash(text: str) -> str:
+    """Hash article text with whitespace normalized, so re-rendering noise is ignored"""
+    normalized = re.sub(r'\s+', ' ', text or '').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class CaseStudyStore:
+    """JSON-backed store: url -> {id, content_hash, lastmod, case_study, article, scraped_at}"""
+
+    def __init__(self, path: str = 'case_study_store.json', first_id: int = 11):
+        """
+        Initialize store
+
+        Args:
+            path: Store file location
+            first_id: First ID handed out (IDs below it are reserved for manual entries)
+        """
+        self.path = Path(path)
+        self.first_id = first_id
+        self.pages: Dict[str, Dict] = {}
+        self.next_id = first_id
+        self.stats = {"new": 0, "changed": 0, "unchanged": 0, "skipped": 0}
+        self.load()
+
+    def load(self):
+        """Load the store from disk (missing file means an empty store)"""
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.pages = data.get('pages', {})
+        used = [entry['id'] for entry in self.pages.values()]
+        self.next_id = max([data.get('next_id', self.first_id), self.first_id] +
+                           [i + 1 for i in used])
+
+    def save(self):
+        """Write the store atomically (temp file + rename)"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"next_id": self.next_id, "pages": self.pages}, f,
+                      indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def id_for(self, url: str) -> int:
+        """Stable ID for a URL; new URLs get the next free ID"""
+        entry = self.pages.get(url)
+        if entry:
+            return entry['id']
+        new_id = self.next_id
+        self.next_id += 1
+        # Reserve the ID now so a page that fails extraction does not reuse it
+        self.pages[url] = {"id": new_id, "content_hash": None, "lastmod": None,
+                           "case_study": None, "scraped_at": None}
+        return new_id
+
+    def is_fresh(self, url: str, lastmod: Optional[str]) -> bool:
+        """True if the URL was extracted before and its lastmod has not moved"""
+        entry = self.pages.get(url)
+        return bool(entry and entry.get('case_study') and lastmod
+                    and entry.get('lastmod') == lastmod)
+
+    def cached(self, url: str, digest: str) -> Optional[Dict]:
+        """Stored extraction for a URL if its content hash is unchanged"""
+        entry = self.pages.get(url)
+        if entry and entry.get('case_study') and entry.get('content_hash') == digest:
+            return entry['case_study']
+        return None
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Stored case study for a URL, if any"""
+        entry = self.pages.get(url)
+        return entry.get('case_study') if entry else None
+
+    def put(self, url: str, digest: str, case_study: Dict, lastmod: Optional[str] = None,
+            article: Optional[Dict] = None):
+        """Record a fresh extraction (and optionally the article text it came from) for a URL"""
+        entry = self.pages.get(url) or {"id": self.id_for(url)}
+        self.stats["changed" if entry.get('content_hash') else "new"] += 1
+        entry.update({
+            "content_hash": digest,
+            "lastmod": lastmod,
+            "case_study": case_study,
+            "article": article,
+            "scraped_at": time.strftime('%Y-%m-%d %H:%M:%S')
+        })
+        self.pages[url] = entry
+
+    def touch(self, url: str, lastmod: Optional[str] = None):
+        """Mark an unchanged URL as seen in this run"""
+        entry = self.pages[url]
+        if lastmod:
+            entry['lastmod'] = lastmod
+        entry['scraped_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        self.stats["unchanged"] += 1
+
+    def case_studies(self) -> List[Dict]:
+        """All stored case studies ordered by ID"""
+        studies = [entry['case_study'] for entry in self.pages.values() if entry.get('case_study')]
+        return sorted(studies, key=lambda cs: cs['id'])
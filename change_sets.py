@@ -0,0 +1,129 @@
+"""
+Change sets between knowledge-base versions
+Every case study, service (or vector-store document) gets a stable key and a
+content hash; comparing the key -> hash maps of two runs yields the added,
+updated and removed entries, so downstream steps only process the delta
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from vocabulary import SERVICES
+
+
+def record_hash(record: Any) -> str:
+    """SHA-256 of a record's canonical JSON form (key order does not matter)"""
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def file_hash(path: str) -> Optional[str]:
+    """SHA-256 of a file, or of every file in a directory (None if missing)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    digest = hashlib.sha256()
+    files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+    for file_path in files:
+        digest.update(str(file_path.relative_to(path) if path.is_dir() else '').encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def case_study_key(study: Dict) -> str:
+    """Key of a case study: source plus ID (client name when there is no ID)"""
+    source = (study.get('metadata') or {}).get('source', 'kb')
+    ident = study.get('id')
+    if ident is None:
+        ident = (study.get('client_name') or '').strip().lower()
+    return f"{source}:{ident}"
+
+
+def service_key(service: Dict) -> str:
+    """Key of a service: its normalized name (the key services are deduplicated by)"""
+    return SERVICES.key(service.get('name') or '')
+
+
+def diff_states(previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, List[Dict]]:
+    """
+    Compare two key -> hash maps
+
+    Args:
+        previous: State of the last run (empty for a first run)
+        current: State of this run
+
+    Returns:
+        {"added": [...], "updated": [...], "removed": [...]} with {"key", "hash"}
+        entries (removed entries carry the previous hash)
+    """
+    changes = {"added": [], "updated": [], "removed": []}
+    for key, digest in current.items():
+        if key not in previous:
+            changes["added"].append({"key": key, "hash": digest})
+        elif previous[key] != digest:
+            changes["updated"].append({"key": key, "hash": digest})
+    for key, digest in previous.items():
+        if key not in current:
+            changes["removed"].append({"key": key, "hash": digest})
+    return changes
+
+
+def has_changes(change_set: Dict[str, List[Dict]]) -> bool:
+    return any(change_set.get(kind) for kind in ("added", "updated", "removed"))
+
+
+class ChangeTracker:
+    """Collect key -> hash maps per section while records are written"""
+
+    KEY_FUNCTIONS: Dict[str, Callable[[Dict], str]] = {
+        'case_studies': case_study_key,
+        'services': service_key,
+    }
+
+    def __init__(self):
+        self.state: Dict[str, Dict[str, str]] = {section: {} for section in self.KEY_FUNCTIONS}
+
+    def add(self, section: str, record: Any, key: Optional[str] = None) -> str:
+        """
+        Record one entry and return its key
+
+        Keys that repeat within a run (e.g. two studies sharing an ID) get a
+        "~n" suffix in order of appearance, so they stay stable across runs
+        as long as the input order does.
+        """
+        entries = self.state.setdefault(section, {})
+        base = key if key is not None else self.KEY_FUNCTIONS[section](record)
+        key, n = base, 1
+        while key in entries:
+            n += 1
+            key = f"{base}~{n}"
+        entries[key] = record_hash(record)
+        return key
+
+    def change_set(self, previous: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, List[Dict]]]:
+        """Per-section diff against a previous state"""
+        return {section: diff_states(previous.get(section, {}), entries)
+                for section, entries in self.state.items()}
+
+
+def load_state(path: str) -> Dict:
+    """Load a saved state file (empty dict if missing or unreadable)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_json_atomic(path: str, data: Dict):
+    """Write JSON to a temp file and rename it into place"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,251 @@
+"""
+Token-budgeted context packing for the QA prompt
+The "stuff" chain concatenates whatever the retriever returns, so prompt size
+(and with it Claude latency and cost) would follow chunk sizes and overlap.
+Retrieved documents are packed before they reach the prompt:
+- Sentences already in the context (chunk overlap, repeated boilerplate) are dropped
+- Documents keep the retriever's relevance order
+- Documents are added until CONTEXT_TOKEN_BUDGET tokens; the one that overflows
+  is cut at a sentence boundary (or dropped if little room is left)
+
+Claude's tokenizer is not available locally, so tokens are counted with a
+fast local estimate that is calibrated against the exact input token counts
+the API reports for every call. Each turn's trace records the packed context
+tokens and the billed input/output tokens.
+"""
+
+import math
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from tracing import Trace, current_trace, span
+
+CONTEXT_TOKEN_BUDGET = 1500
+# Separator the stuff chain puts between documents
+DOCUMENT_SEPARATOR = "\n\n"
+# A cut-down document is only worth adding with at least this much room left
+MIN_PARTIAL_TOKENS = 64
+# Shorter sentences (headings, "Technologies: Python") are never treated as duplicates
+MIN_DEDUP_CHARS = 30
+
+_PIECE = re.compile(r"[A-Za-z]+|\d+|[^\w\s]|\n+|[^\x00-\x7f]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+class TokenCounter:
+    """
+    Local token estimate, calibrated against the model's reported usage
+
+    The raw estimate counts word pieces (long words and numbers as several
+    tokens), punctuation and line breaks. calibrate() compares it with the
+    input tokens the API billed for a prompt and keeps a running scale factor.
+    """
+
+    def __init__(self, scale: float = 1.0, smoothing: float = 0.3):
+        """
+        Args:
+            scale: Initial tokens per raw estimate unit
+            smoothing: Weight of each new observation in the running scale
+        """
+        self.scale = scale
+        self.smoothing = smoothing
+        self.calibrations = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def estimate(text: str) -> int:
+        """Uncalibrated token estimate"""
+        tokens = 0
+        for piece in _PIECE.findall(text):
+            if piece[0].isalpha() and piece.isascii():
+                tokens += 1 + (len(piece) - 1) // 6
+            elif piece[0].isdigit():
+                tokens += 1 + (len(piece) - 1) // 3
+            else:
+                tokens += 1
+        return tokens
+
+    def count(self, text: str) -> int:
+        return math.ceil(self.estimate(text) * self.scale)
+
+    def calibrate(self, text: str, actual_tokens: int):
+        """Fold in an exact count reported by the model for text"""
+        estimate = self.estimate(text)
+        if estimate <= 0 or actual_tokens <= 0:
+            return
+        ratio = min(max(actual_tokens / estimate, 0.5), 3.0)
+        with self.lock:
+            # The first observation replaces the default outright
+            weight = self.smoothing if self.calibrations else 1.0
+            self.scale += weight * (ratio - self.scale)
+            self.calibrations += 1
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+
+class ContextPacker:
+    """Dedupes, orders and trims retrieved documents to a token budget"""
+
+    def __init__(self, counter: TokenCounter, budget: int = CONTEXT_TOKEN_BUDGET):
+        """
+        Args:
+            counter: Token counter (shared, so calibration carries across sessions)
+            budget: Maximum context tokens, separators included
+        """
+        self.counter = counter
+        self.budget = budget
+
+    def _dedupe(self, doc: Document, seen: List[str]) -> Tuple[List[str], int]:
+        """Sentences of doc not already in the context, and how many were dropped"""
+        kept, dropped = [], 0
+        context = '\n'.join(seen)
+        for sentence in split_sentences(doc.page_content):
+            normalized = _normalize(sentence)
+            if len(normalized) >= MIN_DEDUP_CHARS and normalized in context:
+                dropped += 1
+                continue
+            kept.append(sentence)
+        return kept, dropped
+
+    @staticmethod
+    def _join(original: str, sentences: Sequence[str]) -> str:
+        """Sentences back into text, keeping line breaks where the original had them"""
+        text = ''
+        position = 0
+        for sentence in sentences:
+            found = original.find(sentence, position)
+            if text:
+                gap = original[position:found] if found >= 0 else ' '
+                text += '\n' if '\n' in gap else ' '
+            text += sentence
+            if found >= 0:
+                position = found + len(sentence)
+        return text
+
+    def pack(self, docs: Sequence[Document]) -> Tuple[List[Document], Dict]:
+        """
+        Documents to put in the prompt, in the given (relevance) order
+
+        Returns:
+            (packed documents, stats: tokens, documents in/out, duplicate sentences dropped, truncated)
+        """
+        packed: List[Document] = []
+        seen: List[str] = []
+        stats = {"context_tokens": 0, "context_candidates": len(docs), "context_documents": 0,
+                 "context_duplicates_dropped": 0, "context_truncated": False}
+        separator_tokens = self.counter.count(DOCUMENT_SEPARATOR)
+        used = 0
+
+        for doc in docs:
+            sentences, dropped = self._dedupe(doc, seen)
+            stats['context_duplicates_dropped'] += dropped
+            if not sentences:
+                continue
+
+            room = self.budget - used - (separator_tokens if packed else 0)
+            text = self._join(doc.page_content, sentences)
+            tokens = self.counter.count(text)
+            if tokens > room:
+                if room < MIN_PARTIAL_TOKENS:
+                    stats['context_truncated'] = True
+                    break
+                # Longest run of leading sentences that fits
+                while sentences and tokens > room:
+                    sentences.pop()
+                    text = self._join(doc.page_content, sentences)
+                    tokens = self.counter.count(text)
+                stats['context_truncated'] = True
+                if not sentences:
+                    break
+
+            used += tokens + (separator_tokens if packed else 0)
+            packed.append(Document(id=doc.id, page_content=text,
+                                   metadata={**doc.metadata, "context_tokens": tokens}))
+            seen.extend(_normalize(sentence) for sentence in sentences)
+            if stats['context_truncated']:
+                break
+
+        stats['context_tokens'] = used
+        stats['context_documents'] = len(packed)
+        return packed, stats
+
+
+class ContextPackingRetriever(BaseRetriever):
+    """Packs a retriever's results to the token budget and records the stats on the current trace"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    base_retriever: BaseRetriever
+    packer: ContextPacker
+
+    def _get_relevant_documents(self, query: str, *,
+                                run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        # Not passed the callbacks: the outer retriever run is already the retrieval span
+        docs = self.base_retriever.invoke(query)
+        with span('context_packing', nested=True, candidates=len(docs)):
+            packed, stats = self.packer.pack(docs)
+        trace = current_trace()
+        if trace is not None:
+            trace.attrs.update(stats)
+        return packed
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """
+    Records the input/output tokens the model reports for each call of a turn
+    on the trace, and calibrates the token counter with the exact input counts
+    """
+
+    run_inline = True
+
+    def __init__(self, counter: TokenCounter, trace: Optional[Trace] = None):
+        self.counter = counter
+        self.trace = trace
+        self.prompts: Dict = {}  # run_id -> prompt text
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self.prompts[run_id] = '\n'.join(
+            message.content if isinstance(message.content, str) else str(message.content)
+            for batch in messages for message in batch
+        )
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self.prompts[run_id] = '\n'.join(prompts)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self.prompts.pop(run_id, None)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        prompt = self.prompts.pop(run_id, None)
+        usage = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or usage
+        if not usage:
+            return
+        if prompt is not None:
+            self.counter.calibrate(prompt, usage.get('input_tokens', 0))
+        if self.trace is not None:
+            for key in ('input_tokens', 'output_tokens'):
+                self.trace.attrs[key] = self.trace.attrs.get(key, 0) + usage.get(key, 0)
+            self.trace.attrs['llm_calls'] = self.trace.attrs.get('llm_calls', 0) + 1
+
+
+_token_counter = TokenCounter()
+
+
+def get_token_counter() -> TokenCounter:
+    """Process-wide token counter, so calibration from every session is shared"""
+    return _token_counter
@@ -0,0 +1,129 @@
+"""
+Bounded, summarizing conversation memory
+ConversationBufferMemory keeps every turn, and the whole history goes to the
+condense-question LLM call on every follow-up, so long sessions get slower and
+more expensive per turn. SummaryWindowMemory keeps the most recent messages
+up to a token limit verbatim; older ones are folded into a running summary.
+
+Summarizing is an extra LLM call, so it never runs on the request path:
+evicted messages are queued when a turn is saved (after the answer exists)
+and a background worker summarizes them. Until it finishes, the queued
+messages are still returned verbatim, so nothing drops out of the history.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain.memory.prompt import SUMMARY_PROMPT
+from langchain_core.messages import BaseMessage, SystemMessage, get_buffer_string
+from pydantic import ConfigDict, Field, PrivateAttr
+
+from context_packing import TokenCounter, get_token_counter
+
+logger = logging.getLogger(__name__)
+
+MEMORY_TOKEN_LIMIT = 800
+
+# Shared by every session's memory; summaries are short, infrequent calls
+_summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='memory-summary')
+
+
+class SummaryWindowMemory(BaseChatMemory):
+    """Recent messages up to max_token_limit, plus a running summary of older ones"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    llm: Any  # Chat model or LLM that writes the summary
+    counter: TokenCounter = Field(default_factory=get_token_counter)
+    max_token_limit: int = MEMORY_TOKEN_LIMIT
+    memory_key: str = "chat_history"
+    summary: str = ""
+    pending: List[BaseMessage] = Field(default_factory=list)  # Evicted, not yet summarized
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _running: bool = PrivateAttr(default=False)
+    _future: Optional[Future] = PrivateAttr(default=None)
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def messages(self) -> List[BaseMessage]:
+        """History for the prompt: summary, messages awaiting summary, recent window"""
+        with self._lock:
+            messages = list(self.pending) + list(self.chat_memory.messages)
+            summary = self.summary
+        if summary:
+            messages.insert(0, SystemMessage(content=f"Summary of the earlier conversation: {summary}"))
+        return messages
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        messages = self.messages()
+        return {self.memory_key: messages if self.return_messages else get_buffer_string(messages)}
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        self._evict()
+
+    async def asave_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        await super().asave_context(inputs, outputs)
+        self._evict()
+
+    def clear(self) -> None:
+        super().clear()
+        with self._lock:
+            self.summary = ""
+            self.pending.clear()
+
+    def _evict(self):
+        """Move the oldest messages over the token limit to the summary queue"""
+        messages = self.chat_memory.messages
+        tokens = [self.counter.count(str(message.content)) for message in messages]
+        total = sum(tokens)
+        evict = 0
+        # The latest exchange always stays verbatim
+        while total > self.max_token_limit and len(messages) - evict > 2:
+            total -= tokens[evict]
+            evict += 1
+
+        with self._lock:
+            if evict:
+                self.pending.extend(messages[:evict])
+                self.chat_memory.messages = messages[evict:]
+            # Also retries a queue left by a failed summary
+            if self.pending and not self._running:
+                self._running = True
+                self._future = _summary_executor.submit(self._summarize)
+
+    def _summarize(self):
+        """Fold queued messages into the summary until the queue is empty"""
+        while True:
+            with self._lock:
+                batch = list(self.pending)
+                summary = self.summary
+                if not batch:
+                    self._running = False
+                    return
+            try:
+                prompt = SUMMARY_PROMPT.format(summary=summary, new_lines=get_buffer_string(batch))
+                result = self.llm.invoke(prompt)
+                new_summary = str(getattr(result, 'content', result)).strip()
+            except Exception as e:
+                # The messages stay queued (and verbatim in the history) until the next attempt
+                logger.warning(f"⚠️  Conversation summary failed: {str(e)}")
+                with self._lock:
+                    self._running = False
+                return
+            with self._lock:
+                self.summary = new_summary
+                del self.pending[:len(batch)]
+            logger.info(f"📝 Summarized {len(batch)} older messages ({self.counter.count(new_summary)} tokens)")
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until queued messages are summarized (for tests and benchmarks)"""
+        future = self._future
+        if future is not None:
+            future.result(timeout=timeout)
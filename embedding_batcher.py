@@ -0,0 +1,84 @@
+"""
+Micro-batching of concurrent query embeddings
+A sentence-transformers model embeds a batch of texts in barely more time
+than a single one, but concurrent requests each call embed_query on their
+own. EmbeddingBatcher queues query texts from any number of threads; a worker
+waits up to a few milliseconds after the first one for more to arrive, then
+embeds the whole batch in one model call and hands each caller its vector.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW_MS = 5.0
+MAX_BATCH_SIZE = 32
+
+
+class EmbeddingBatcher(Embeddings):
+    """Embeddings wrapper that coalesces concurrent embed_query calls into embed_documents batches"""
+
+    def __init__(self, embeddings: Embeddings, window_ms: float = BATCH_WINDOW_MS,
+                 max_batch_size: int = MAX_BATCH_SIZE):
+        """
+        Args:
+            embeddings: Model to batch calls to (its embed_documents must embed queries the same way)
+            window_ms: How long the first query of a batch waits for others
+            max_batch_size: Queries embedded per model call at most
+        """
+        self.embeddings = embeddings
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self.requests: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self.stats = {"queries": 0, "batches": 0, "max_batch": 0}
+        self.worker = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+        self.worker.start()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Indexing already sends whole batches
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        future: Future = Future()
+        self.requests.put((text, future))
+        return future.result()
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        """Block for a first request, then gather more until the window closes or the batch is full"""
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.window_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+            self.stats['queries'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+
+    def mean_batch_size(self) -> Optional[float]:
+        return self.stats['queries'] / self.stats['batches'] if self.stats['batches'] else None
@@ -0,0 +1,91 @@
+"""
+LRU cache for query embeddings
+Suggested questions and other common queries are asked over and over, and
+each one used to be embedded again. QueryEmbeddingCache keeps the vectors of
+recent query texts (least recently used evicted first) and can be filled
+ahead of time in one batch with precompute(), e.g. at warmup.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+QUERY_CACHE_SIZE = 1024
+
+
+class QueryEmbeddingCache(Embeddings):
+    """Embeddings wrapper that caches embed_query results by query text"""
+
+    def __init__(self, embeddings: Embeddings, max_size: int = QUERY_CACHE_SIZE):
+        """
+        Args:
+            embeddings: Model to cache query vectors of
+            max_size: Query texts kept
+        """
+        self.embeddings = embeddings
+        self.max_size = max_size
+        self.cache: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def _get(self, text: str):
+        with self.lock:
+            vector = self.cache.get(text)
+            if vector is not None:
+                self.cache.move_to_end(text)
+                self.stats['hits'] += 1
+            else:
+                self.stats['misses'] += 1
+            return vector
+
+    def _put(self, text: str, vector: List[float]):
+        with self.lock:
+            self.cache[text] = vector
+            self.cache.move_to_end(text)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self._get(text)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self._put(text, vector)
+        return list(vector)
+
+    def precompute(self, queries: Sequence[str]) -> int:
+        """Embed the uncached queries in one batch; returns how many were embedded"""
+        with self.lock:
+            missing = list(dict.fromkeys(query for query in queries if query not in self.cache))
+        if not missing:
+            return 0
+        # embed_documents batches; fine for models that embed queries and documents alike
+        for query, vector in zip(missing, self.embeddings.embed_documents(missing)):
+            self._put(query, vector)
+        return len(missing)
+
+    def info(self) -> Dict:
+        with self.lock:
+            return {**self.stats, "size": len(self.cache), "max_size": self.max_size}
+
+
+def cache_query_embeddings(vectorstore, max_size: int = QUERY_CACHE_SIZE):
+    """
+    Cache query embeddings of a FAISS store (call before trace_vectorstore, so
+    the embed_query span shows cache hits); safe to call repeatedly
+    """
+    if max_size <= 0 or getattr(vectorstore, '_query_cache', None) is not None:
+        return vectorstore
+    if isinstance(vectorstore.embedding_function, Embeddings):
+        vectorstore.embedding_function = QueryEmbeddingCache(vectorstore.embedding_function, max_size)
+        vectorstore._query_cache = vectorstore.embedding_function
+    return vectorstore
+
+
+def query_cache(vectorstore):
+    """The store's QueryEmbeddingCache, if cache_query_embeddings wrapped it"""
+    return getattr(vectorstore, '_query_cache', None)
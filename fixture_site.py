@@ -0,0 +1,376 @@
+"""
+Local fixture site for crawler benchmarks
+Serves a synthetic, deterministic version of the Shuru Tech site so the
+crawlers can be measured without touching shurutech.com:
+- /work and paginated /insights listings linking to case-study pages
+- /insights/case-study/<slug> detail pages (some with JSON-LD, some filled in
+  by JavaScript only, some deliberately slow, some returning 500)
+- /services, /about, robots.txt (with a disallowed /private/ area) and sitemap.xml
+- /__stats with request, byte and status counters (/__stats/reset clears them)
+The same seed and options always produce the same site, so SyntheticSite
+also provides the ground truth for extraction accuracy.
+
+Usage:
+    python fixture_site.py --case-studies 50 --port 8000
+"""
+
+import argparse
+import html
+import json
+import multiprocessing
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from urllib.request import urlopen
+
+CASE_STUDY_PREFIX = '/insights/case-study/'
+LISTING_PAGE_SIZE = 8  # The website crawler queues at most 10 links per page
+
+# Client name parts; suffixes are chosen per industry and avoid other industries' keywords
+NAME_PREFIXES = ['Northwind', 'Bluepeak', 'Cobalt', 'Harbor', 'Silverline', 'Redwood', 'Summit',
+                 'Lumen', 'Orbit', 'Granite', 'Atlas', 'Beacon', 'Juniper', 'Meridian', 'Quartz']
+
+# Industry -> (name suffixes, pain point, system built, metric reduced, metric increased)
+INDUSTRY_PROFILES = {
+    'FinTech': (['Capital', 'Lending'], "payment settlement that took three days to clear",
+                "payment settlement service", "settlement time", "approved transactions"),
+    'Healthcare': (['Clinics', 'Care'], "patient records scattered across clinic systems",
+                   "patient record hub", "duplicate tests", "clinic capacity"),
+    'Logistics': (['Freight', 'Couriers'], "shipment tracking that lagged hours behind the trucks",
+                  "shipment tracking pipeline", "late deliveries", "on-time delivery"),
+    'AgriTech': (['Growers', 'Orchards'], "crop monitoring done by hand across remote fields",
+                 "crop monitoring network", "water usage", "crop yield"),
+    'E-commerce': (['Outfitters', 'Goods'], "a checkout flow that lost most shoppers",
+                   "checkout service", "cart abandonment", "conversion"),
+}
+
+# Technologies known to both crawlers' keyword lists
+FIXTURE_TECHNOLOGIES = ['React', 'Angular', 'Vue', 'Next.js', 'Node.js', 'Python', 'Django', 'Flask',
+                        'FastAPI', 'Java', 'TypeScript', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
+                        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'GraphQL',
+                        'Kafka', 'RabbitMQ', 'TensorFlow', 'PyTorch']
+
+SERVICES = [
+    ('Custom Software Development', 'Product engineering from discovery to launch.'),
+    ('Cloud Migration', 'Moving workloads to managed cloud infrastructure.'),
+    ('Data Engineering', 'Pipelines, warehouses and analytics foundations.'),
+    ('Mobile App Development', 'Native and cross-platform mobile apps.'),
+]
+
+
+class SyntheticSite:
+    """Deterministic synthetic site: page content, routing and ground truth"""
+
+    def __init__(self, case_studies: int = 30, seed: int = 7, slow_ratio: float = 0.1,
+                 slow_delay: float = 0.5, error_ratio: float = 0.05, json_ld_ratio: float = 0.3,
+                 js_ratio: float = 0.1):
+        """
+        Args:
+            case_studies: Number of case-study pages
+            seed: Random seed (same seed, same site)
+            slow_ratio: Share of case-study pages that respond after slow_delay seconds
+            slow_delay: Delay of slow pages
+            error_ratio: Share of case-study pages that return HTTP 500
+            json_ld_ratio: Share of pages that also embed the article as JSON-LD
+            js_ratio: Share of pages whose article is only filled in by JavaScript
+        """
+        self.slow_delay = slow_delay
+        rng = random.Random(seed)
+        industries = list(INDUSTRY_PROFILES)
+        self.studies = []
+
+        for index in range(case_studies):
+            industry = industries[index % len(industries)]
+            suffixes, pain, system, reduced, increased = INDUSTRY_PROFILES[industry]
+            prefix = NAME_PREFIXES[(index // len(industries)) % len(NAME_PREFIXES)]
+            client_name = f"{prefix} {suffixes[(index // (len(industries) * len(NAME_PREFIXES))) % len(suffixes)]}"
+            if index >= len(industries) * len(NAME_PREFIXES) * len(suffixes):
+                client_name = f"{client_name} {index}"
+            technologies = sorted(rng.sample(FIXTURE_TECHNOLOGIES, rng.randint(3, 5)))
+            cut, gain, months = rng.randint(20, 70), rng.randint(15, 90), rng.randint(3, 12)
+
+            self.studies.append({
+                "slug": f"{prefix.lower()}-{client_name.split()[1].lower()}-{index}",
+                "client_name": client_name,
+                "industry": industry,
+                "technologies": technologies,
+                "title": f"How Shuru Helped {client_name} Cut {reduced.title()} by {cut}%",
+                "problem": (f"{client_name} was struggling with {pain}. The team faced growing manual "
+                            f"workarounds, and the problem was getting worse every quarter."),
+                "solution": (f"We built a new {system} with {', '.join(technologies[:-1])} and "
+                             f"{technologies[-1]}. The approach replaced spreadsheets with automated "
+                             f"workflows and live dashboards for the operations team."),
+                "results": (f"The project reduced {reduced} by {cut}% and increased {increased} by "
+                            f"{gain}% within {months} months of launch."),
+                "slow": rng.random() < slow_ratio,
+                "error": rng.random() < error_ratio,
+                "json_ld": rng.random() < json_ld_ratio,
+                "js_only": rng.random() < js_ratio,
+                "lastmod": f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}",
+            })
+
+        self.by_path = {f"{CASE_STUDY_PREFIX}{study['slug']}": study for study in self.studies}
+
+    def ground_truth(self) -> Dict[str, Dict]:
+        """Expected extraction per case-study path (pages that serve errors are left out)"""
+        return {path: {"client_name": study['client_name'], "industry": study['industry'],
+                       "technologies": study['technologies']}
+                for path, study in self.by_path.items() if not study['error']}
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def layout(title: str, body: str, head: str = '') -> str:
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+{head}
+</head>
+<body>
+<nav><a href="/">Home</a> <a href="/work">Work</a> <a href="/insights">Insights</a>
+<a href="/services">Services</a> <a href="/about">About</a></nav>
+<main>
+{body}
+</main>
+<footer><p>Shuru fixture site for crawler benchmarks.</p>
+<a href="/private/admin">Admin</a> <a href="mailto:hello@example.com">Contact</a></footer>
+</body>
+</html>"""
+
+    def card(self, study: Dict) -> str:
+        return (f'<div class="card case-study-card"><h3>{html.escape(study["client_name"])}</h3>'
+                f'<p>{html.escape(study["problem"])}</p>'
+                f'<a href="{CASE_STUDY_PREFIX}{study["slug"]}">Read the case study</a></div>')
+
+    def home_page(self) -> str:
+        body = ("<section class=\"hero\"><h1>Engineering partners for ambitious teams</h1>"
+                "<p>We design, build and scale products for companies across industries. "
+                "Browse our work and insights to see how we approach delivery.</p></section>")
+        return self.layout("Shuru fixture", body)
+
+    def work_page(self) -> str:
+        cards = '\n'.join(self.card(study) for study in self.studies[:LISTING_PAGE_SIZE])
+        body = (f"<section class=\"work\"><h1>Our Work</h1>{cards}"
+                f"<p><a href=\"/insights?category=Case+Study\">All case studies</a></p></section>")
+        return self.layout("Work", body)
+
+    def insights_page(self, page: int) -> str:
+        start = (page - 1) * LISTING_PAGE_SIZE
+        studies = self.studies[start:start + LISTING_PAGE_SIZE]
+        links = '\n'.join(
+            f'<li><a href="{CASE_STUDY_PREFIX}{study["slug"]}">{html.escape(study["title"])}</a></li>'
+            for study in studies
+        )
+        if page == 1:
+            links += f'\n<li><a href="{CASE_STUDY_PREFIX}retired-project">A retired project</a></li>'
+        more = (f'<a href="/insights?category=Case+Study&amp;page={page + 1}">Older insights</a>'
+                if start + LISTING_PAGE_SIZE < len(self.studies) else '')
+        body = f"<section class=\"insights-list\"><h1>Insights</h1><ul>{links}</ul>{more}</section>"
+        return self.layout(f"Insights - page {page}", body)
+
+    def article_html(self, study: Dict) -> str:
+        return (f"<h1>{html.escape(study['title'])}</h1>"
+                f"<h2>The Challenge</h2><p>{html.escape(study['problem'])}</p>"
+                f"<h2>The Solution</h2><p>{html.escape(study['solution'])}</p>"
+                f"<h2>The Results</h2><p>{html.escape(study['results'])}</p>")
+
+    def case_study_page(self, study: Dict) -> str:
+        article = self.article_html(study)
+        head = f'<meta name="description" content="{html.escape(study["problem"])}">'
+
+        if study['json_ld']:
+            payload = {"@context": "https://schema.org", "@type": "Article", "headline": study['title'],
+                       "articleBody": ' '.join([study['problem'], study['solution'], study['results']])}
+            head += f'\n<script type="application/ld+json">{json.dumps(payload)}</script>'
+
+        if study['js_only']:
+            # Server HTML carries only a shell; the article arrives via script
+            body = (f"<article class=\"case-study\"><p>Loading...</p></article>"
+                    f"<script>document.querySelector('article').innerHTML = {json.dumps(article)};</script>")
+        else:
+            body = f"<article class=\"case-study\">{article}</article>"
+        return self.layout(study['title'], body, head)
+
+    def services_page(self) -> str:
+        cards = '\n'.join(f'<div class="service-card"><h3>{html.escape(name)}</h3><p>{html.escape(text)}</p></div>'
+                          for name, text in SERVICES)
+        return self.layout("Services", f"<section class=\"services\"><h1>Services</h1>{cards}</section>")
+
+    def about_page(self) -> str:
+        body = ("<section class=\"about\"><h1>About</h1><p>A distributed team of engineers, designers "
+                "and product managers working with clients around the world.</p></section>")
+        return self.layout("About", body)
+
+    def robots_txt(self, base_url: str) -> str:
+        return f"User-agent: *\nDisallow: /private/\nSitemap: {base_url}/sitemap.xml\n"
+
+    def sitemap_xml(self, base_url: str) -> str:
+        urls = [f"<url><loc>{base_url}{path}</loc></url>" for path in ('/', '/work', '/insights', '/services')]
+        urls += [f"<url><loc>{base_url}{CASE_STUDY_PREFIX}{study['slug']}</loc>"
+                 f"<lastmod>{study['lastmod']}</lastmod></url>" for study in self.studies]
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                + '\n'.join(urls) + '\n</urlset>\n')
+
+    def route(self, path: str, query: Dict[str, List[str]], base_url: str) -> Tuple[int, str, str, float]:
+        """
+        Resolve a request
+
+        Returns:
+            (status, content type, body, delay in seconds)
+        """
+        page_html = 'text/html; charset=utf-8'
+        if path in ('/', ''):
+            return 200, page_html, self.home_page(), 0.0
+        if path == '/work':
+            return 200, page_html, self.work_page(), 0.0
+        if path == '/insights':
+            try:
+                page = max(1, int(query.get('page', ['1'])[0]))
+            except ValueError:
+                page = 1
+            return 200, page_html, self.insights_page(page), 0.0
+        if path == '/services':
+            return 200, page_html, self.services_page(), 0.0
+        if path == '/about':
+            return 200, page_html, self.about_page(), 0.0
+        if path == '/robots.txt':
+            return 200, 'text/plain; charset=utf-8', self.robots_txt(base_url), 0.0
+        if path == '/sitemap.xml':
+            return 200, 'application/xml; charset=utf-8', self.sitemap_xml(base_url), 0.0
+
+        study = self.by_path.get(path)
+        if study:
+            delay = self.slow_delay if study['slow'] else 0.0
+            if study['error']:
+                return 500, page_html, self.layout("Server error", "<h1>Something went wrong</h1>"), delay
+            return 200, page_html, self.case_study_page(study), delay
+
+        return 404, page_html, self.layout("Not found", "<h1>Page not found</h1>"), 0.0
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serves a SyntheticSite and counts what it served"""
+
+    site: SyntheticSite = None
+    stats_lock = threading.Lock()
+    stats = {"requests": 0, "bytes": 0, "status": {}}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+
+        if parsed.path.startswith('/__stats'):
+            with self.stats_lock:
+                if parsed.path == '/__stats/reset':
+                    self.stats.update({"requests": 0, "bytes": 0, "status": {}})
+                body = json.dumps(self.stats)
+            self.send_body(200, 'application/json', body.encode('utf-8'))
+            return
+
+        base_url = f"http://{self.headers.get('Host', '%s:%s' % self.server.server_address)}"
+        status, content_type, body, delay = self.site.route(parsed.path, parse_qs(parsed.query), base_url)
+        if delay:
+            time.sleep(delay)
+
+        payload = body.encode('utf-8')
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(payload)
+            self.stats["status"][str(status)] = self.stats["status"].get(str(status), 0) + 1
+        self.send_body(status, content_type, payload)
+
+    def send_body(self, status: int, content_type: str, payload: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+def make_server(site: SyntheticSite, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    handler = type('BoundFixtureRequestHandler', (FixtureRequestHandler,),
+                   {"site": site, "stats": {"requests": 0, "bytes": 0, "status": {}}})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def _serve(site_options: Dict, host: str, port: int, ready):
+    """Child-process entry point: build the site, report the port, serve forever"""
+    server = make_server(SyntheticSite(**site_options), host, port)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+class FixtureServer:
+    """
+    Run the fixture site in a child process (so its CPU time is not charged
+    to the crawler being measured)
+
+        with FixtureServer(case_studies=50) as server:
+            crawl(server.base_url)
+            print(server.stats())
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, **site_options):
+        self.host = host
+        self.port = port
+        self.site_options = site_options
+        self.process: Optional[multiprocessing.Process] = None
+        self.base_url = None
+
+    def __enter__(self) -> 'FixtureServer':
+        ready = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve, args=(self.site_options, self.host, self.port, ready),
+                                               daemon=True)
+        self.process.start()
+        self.base_url = f"http://{self.host}:{ready.get(timeout=30)}"
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join(timeout=5)
+            self.process = None
+        return False
+
+    def stats(self) -> Dict:
+        with urlopen(f"{self.base_url}/__stats", timeout=10) as response:
+            return json.loads(response.read())
+
+    def reset_stats(self):
+        with urlopen(f"{self.base_url}/__stats/reset", timeout=10) as response:
+            response.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the synthetic fixture site")
+    parser.add_argument('--case-studies', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--slow-ratio', type=float, default=0.1)
+    parser.add_argument('--slow-delay', type=float, default=0.5)
+    parser.add_argument('--error-ratio', type=float, default=0.05)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    site = SyntheticSite(case_studies=args.case_studies, seed=args.seed, slow_ratio=args.slow_ratio,
+                         slow_delay=args.slow_delay, error_ratio=args.error_ratio)
+    server = make_server(site, args.host, args.port)
+    print(f"🧪 Serving {args.case_studies} case studies at http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Columnar on-disk format for the knowledge base
+A knowledge base directory (e.g. knowledge_base.kb/) holds one JSON-Lines
+column file per field of each record section, plus an offset index, so a
+caller that only needs `industry` reads just that column:
+
+    manifest.json                       sections, counts, fields, non-array entries
+    case_studies/<field>.jsonl          one JSON value per record (empty line = missing)
+    case_studies/<field>.idx            uint64 byte offset of every line
+    technologies/_value.jsonl           value sections (lists of strings etc.)
+
+Load time and memory scale with the columns read, not with the file size.
+
+Usage:
+    python kb_format.py to-columnar knowledge_base.json [knowledge_base.kb]
+    python kb_format.py to-json knowledge_base.kb [knowledge_base.json]
+"""
+
+import json
+import os
+import shutil
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from kb_stream import StreamingKBWriter, is_jsonl, iter_jsonl_entries, iter_section as iter_file_section, iter_top_level
+
+FORMAT_VERSION = 1
+VALUE_COLUMN = '_value'
+MANIFEST = 'manifest.json'
+
+
+def is_columnar(path: str) -> bool:
+    """True if the path is a columnar knowledge base directory"""
+    return (Path(path) / MANIFEST).is_file()
+
+
+def columnar_path_for(json_path: str) -> str:
+    """Default columnar directory for a JSON knowledge base (knowledge_base.json -> knowledge_base.kb)"""
+    return str(Path(json_path).with_suffix('.kb'))
+
+
+def resolve_kb_path(json_path: str) -> str:
+    """
+    Prefer the columnar copy of a knowledge base when it is at least as new as the JSON
+
+    Args:
+        json_path: Path to the JSON knowledge base
+
+    Returns:
+        The columnar directory if it is present and up to date, else json_path
+    """
+    columnar = columnar_path_for(json_path)
+    if not is_columnar(columnar):
+        return json_path
+    if not os.path.exists(json_path):
+        return columnar
+    manifest_mtime = os.path.getmtime(Path(columnar) / MANIFEST)
+    return columnar if manifest_mtime >= os.path.getmtime(json_path) else json_path
+
+
+class _ColumnWriter:
+    """Appends JSON values to one column file and records line offsets"""
+
+    def __init__(self, path: Path, backfill: int):
+        self.path = path
+        self.f = open(path, 'wb')
+        self.offsets = array('Q')
+        for _ in range(backfill):
+            self.write_missing()
+
+    def write(self, value: Any):
+        self.offsets.append(self.f.tell())
+        self.f.write(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        self.f.write(b'\n')
+
+    def write_missing(self):
+        self.offsets.append(self.f.tell())
+        self.f.write(b'\n')
+
+    def close(self):
+        self.f.close()
+        with open(self.path.with_suffix('.idx'), 'wb') as f:
+            self.offsets.tofile(f)
+
+
+class ColumnarWriter:
+    """
+    Write a columnar knowledge base one item at a time
+
+    Output is built in a temp directory that replaces the target only when
+    the writer closes without an error.
+    """
+
+    def __init__(self, out_dir: str):
+        self.out_dir = Path(out_dir)
+        self.tmp_dir = self.out_dir.with_name(self.out_dir.name + '.tmp')
+        self.sections: Dict[str, Dict] = {}
+        self.objects: Dict[str, Any] = {}
+        self._columns: Dict[str, Dict[str, _ColumnWriter]] = {}
+
+    def __enter__(self):
+        if self.tmp_dir.exists():
+            shutil.rmtree(self.tmp_dir)
+        self.tmp_dir.mkdir(parents=True)
+        return self
+
+    def _section(self, section: str, kind: str) -> Dict:
+        meta = self.sections.get(section)
+        if meta is None:
+            (self.tmp_dir / section).mkdir()
+            meta = self.sections[section] = {"kind": kind, "count": 0, "fields": []}
+            self._columns[section] = {}
+        return meta
+
+    def _column(self, section: str, field: str) -> _ColumnWriter:
+        columns = self._columns[section]
+        column = columns.get(field)
+        if column is None:
+            if not field or field.startswith('.') or '/' in field or '\\' in field:
+                raise ValueError(f"Field name cannot be used as a column file: {field!r}")
+            meta = self.sections[section]
+            # A field first seen at record n is missing for records 0..n-1
+            column = _ColumnWriter(self.tmp_dir / section / f"{field}.jsonl", meta['count'])
+            columns[field] = column
+            meta['fields'].append(field)
+        return column
+
+    def write(self, section: str, item: Any):
+        """Append one item; the first item decides if the section holds records or plain values"""
+        meta = self.sections.get(section)
+        if meta is None:
+            meta = self._section(section, 'records' if isinstance(item, dict) else 'values')
+
+        if meta['kind'] == 'values':
+            self._column(section, VALUE_COLUMN).write(item)
+        else:
+            if not isinstance(item, dict):
+                raise ValueError(f"Section '{section}' mixes records and plain values")
+            for field, value in item.items():
+                self._column(section, field).write(value)
+            for field, column in self._columns[section].items():
+                if field not in item:
+                    column.write_missing()
+        meta['count'] += 1
+
+    def add_section(self, section: str):
+        """Declare a section so it is kept even when empty"""
+        if section not in self.sections:
+            self._section(section, 'values')
+
+    def __exit__(self, exc_type, exc, tb):
+        for columns in self._columns.values():
+            for column in columns.values():
+                if exc_type is None:
+                    column.close()
+                else:
+                    column.f.close()
+
+        if exc_type is not None:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+            return False
+
+        manifest = {"format": FORMAT_VERSION, "sections": self.sections, "objects": self.objects}
+        with open(self.tmp_dir / MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        if self.out_dir.exists():
+            shutil.rmtree(self.out_dir)
+        os.replace(self.tmp_dir, self.out_dir)
+        return False
+
+
+class ColumnarKB:
+    """Read-only view of a columnar knowledge base"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path / MANIFEST, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format: {manifest.get('format')}")
+        self.sections: Dict[str, Dict] = manifest['sections']
+        self.objects: Dict[str, Any] = manifest.get('objects', {})
+
+    def count(self, section: str) -> int:
+        """Number of items in a section (0 if missing)"""
+        return self.sections.get(section, {}).get('count', 0)
+
+    def fields(self, section: str) -> List[str]:
+        """Fields present in a record section"""
+        return list(self.sections.get(section, {}).get('fields', []))
+
+    def _column_path(self, section: str, field: str) -> Path:
+        return self.path / section / f"{field}.jsonl"
+
+    def iter_column(self, section: str, field: str) -> Iterator[Any]:
+        """Yield one field for every item (None where the record lacks it)"""
+        meta = self.sections.get(section)
+        if meta is None:
+            return
+        if field not in meta['fields']:
+            for _ in range(meta['count']):
+                yield None
+            return
+        with open(self._column_path(section, field), 'rb') as f:
+            for line in f:
+                yield json.loads(line) if line.strip() else None
+
+    def values(self, section: str) -> List[Any]:
+        """All items of a value section (e.g. technologies)"""
+        return list(self.iter_column(section, VALUE_COLUMN))
+
+    def iter_records(self, section: str, fields: Optional[List[str]] = None) -> Iterator[Any]:
+        """
+        Yield the items of a section, reading only the requested columns
+
+        Args:
+            section: Section name (e.g. 'case_studies')
+            fields: Fields to read (None for all); fields a record lacks are omitted
+
+        Returns:
+            Iterator of dicts for record sections, or plain values for value sections
+        """
+        meta = self.sections.get(section)
+        if meta is None:
+            return
+        if meta['kind'] == 'values':
+            yield from self.iter_column(section, VALUE_COLUMN)
+            return
+
+        wanted = [field for field in (fields or meta['fields']) if field in meta['fields']]
+        if not wanted:
+            for _ in range(meta['count']):
+                yield {}
+            return
+
+        files = [open(self._column_path(section, field), 'rb') for field in wanted]
+        try:
+            for lines in zip(*files):
+                yield {field: json.loads(line) for field, line in zip(wanted, lines) if line.strip()}
+        finally:
+            for f in files:
+                f.close()
+
+    def get(self, section: str, position: int, fields: Optional[List[str]] = None) -> Any:
+        """Random access to one item via the offset index"""
+        meta = self.sections[section]
+        if not 0 <= position < meta['count']:
+            raise IndexError(f"{section}[{position}] out of range")
+
+        wanted = [VALUE_COLUMN] if meta['kind'] == 'values' else \
+            [field for field in (fields or meta['fields']) if field in meta['fields']]
+        record = {}
+        for field in wanted:
+            offsets = array('Q')
+            with open(self._column_path(section, field).with_suffix('.idx'), 'rb') as f:
+                f.seek(position * offsets.itemsize)
+                offsets.fromfile(f, 1)
+            with open(self._column_path(section, field), 'rb') as f:
+                f.seek(offsets[0])
+                line = f.readline()
+            if line.strip():
+                record[field] = json.loads(line)
+        return record.get(VALUE_COLUMN) if meta['kind'] == 'values' else record
+
+    def load(self, sections: Optional[List[str]] = None,
+             fields: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """
+        Materialize (part of) the knowledge base as the dict json.load would return
+
+        Args:
+            sections: Sections to read (None for all); non-array entries are always included
+            fields: Per-section field projection, e.g. {'case_studies': ['industry']}
+
+        Returns:
+            Knowledge base dict
+        """
+        fields = fields or {}
+        data = dict(self.objects)
+        for section in self.sections:
+            if sections is None or section in sections:
+                data[section] = list(self.iter_records(section, fields.get(section)))
+        return data
+
+
+def iter_section(path: str, section: str, fields: Optional[List[str]] = None) -> Iterator[Any]:
+    """Yield the items of a section from a columnar directory, .json or .jsonl file"""
+    if is_columnar(path):
+        return ColumnarKB(path).iter_records(section, fields)
+    return (_project(item, fields) for item in iter_file_section(path, section))
+
+
+def load_kb(path: str, sections: Optional[List[str]] = None,
+            fields: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """
+    Load a knowledge base from any supported format
+
+    Args:
+        path: Columnar directory, .json or .jsonl file
+        sections: Sections to read (None for all)
+        fields: Per-section field projection (columnar reads skip other columns)
+
+    Returns:
+        Knowledge base dict
+    """
+    if is_columnar(path):
+        return ColumnarKB(path).load(sections, fields)
+
+    fields = fields or {}
+    data: Dict[str, Any] = {}
+    if is_jsonl(path):
+        for name, value, is_item in iter_jsonl_entries(path):
+            if not is_item:
+                data[name] = value
+            elif sections is None or name in sections:
+                data.setdefault(name, []).append(_project(value, fields.get(name)))
+        return data
+
+    for name, value, is_array in iter_top_level(path):
+        if not is_array:
+            data[name] = value
+        elif sections is None or name in sections:
+            data[name] = [_project(item, fields.get(name)) for item in value]
+    return data
+
+
+def _project(item: Any, fields: Optional[List[str]]) -> Any:
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def json_to_columnar(json_path: str, out_dir: Optional[str] = None) -> str:
+    """
+    Convert a .json or .jsonl knowledge base to the columnar format (streaming)
+
+    Returns:
+        Path of the columnar directory
+    """
+    out_dir = out_dir or columnar_path_for(json_path)
+    with ColumnarWriter(out_dir) as writer:
+        if is_jsonl(json_path):
+            for name, value, is_item in iter_jsonl_entries(json_path):
+                if is_item:
+                    writer.write(name, value)
+                else:
+                    writer.objects[name] = value
+        else:
+            for name, value, is_array in iter_top_level(json_path):
+                if not is_array:
+                    writer.objects[name] = value
+                    continue
+                for item in value:
+                    writer.write(name, item)
+                writer.add_section(name)  # Keep empty arrays
+    return out_dir
+
+
+def columnar_to_json(columnar_dir: str, out_path: Optional[str] = None) -> str:
+    """
+    Convert a columnar knowledge base back to .json or .jsonl (streaming)
+
+    Returns:
+        Path of the written file
+    """
+    out_path = out_path or str(Path(columnar_dir).with_suffix('.json'))
+    kb = ColumnarKB(columnar_dir)
+    with StreamingKBWriter(out_path, list(kb.sections), objects=kb.objects) as writer:
+        for section in kb.sections:
+            for item in kb.iter_records(section):
+                writer.write(section, item)
+    return out_path
+
+
+def main():
+    """Command-line converters"""
+    if len(sys.argv) < 3 or sys.argv[1] not in ('to-columnar', 'to-json'):
+        print(__doc__)
+        return 1
+
+    source = sys.argv[2]
+    target = sys.argv[3] if len(sys.argv) > 3 else None
+    if sys.argv[1] == 'to-columnar':
+        out = json_to_columnar(source, target)
+    else:
+        out = columnar_to_json(source, target)
+    print(f"✓ Wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,263 @@
+"""
+Canonical case-study schema with validation and normalization
+Maps the manual/app schema (problem, results, technologies, ...) and the
+scrape_website.py schema (challenge, business_impact, technologies_used, ...)
+onto one record type, repairs what can be repaired (placeholders, stringly
+technology lists, alias spellings) and rejects records with no usable content.
+Large inputs are normalized in chunks across a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from vocabulary import INDUSTRIES, TECHNOLOGIES
+
+# Canonical field -> alternative names used by other producers
+FIELD_ALIASES = {
+    'problem': ['challenge'],
+    'results': ['business_impact'],
+    'technologies': ['technologies_used'],
+    'duration': ['project_duration'],
+    'url': ['source_url'],
+}
+
+TEXT_FIELDS = ['client_name', 'industry', 'problem', 'solution', 'results', 'duration', 'url']
+CONTENT_FIELDS = ['problem', 'solution', 'results']
+
+# Field values that carry no information
+PLACEHOLDER_VALUES = {
+    '', 'n/a', 'na', 'none', 'null', '-', 'tbd', 'not specified', 'unknown', 'unknown client',
+    'results not specified', 'problem description not found', 'solution description not found'
+}
+
+CHUNK_SIZE = 500
+
+
+def is_placeholder(value: Any) -> bool:
+    """True for missing or filler values like 'Not specified' or empty lists"""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in PLACEHOLDER_VALUES
+    if isinstance(value, (list, dict)):
+        return not value
+    return False
+
+
+def _clean_text(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        return None
+    value = ' '.join(value.split())
+    return None if is_placeholder(value) else value
+
+
+def normalize_case_study(record: Any) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Map a case study onto the canonical schema
+
+    Args:
+        record: Case study in either schema
+
+    Returns:
+        (canonical record or None if rejected, list of issues found). Missing
+        or placeholder fields are omitted from the record rather than filled
+        with "N/A"; unknown fields are kept as they are.
+    """
+    if not isinstance(record, dict):
+        return None, [f"not an object ({type(record).__name__})"]
+
+    issues = []
+    canonical = {}
+    alias_of = {alias: field for field, aliases in FIELD_ALIASES.items() for alias in aliases}
+
+    for key, value in record.items():
+        field = alias_of.get(key, key)
+        # Real values beat placeholders; between two real values the canonical spelling wins
+        if field in canonical:
+            if is_placeholder(value):
+                continue
+            if key != field and not is_placeholder(canonical[field]):
+                continue
+        canonical[field] = value
+
+    for field in TEXT_FIELDS:
+        if field not in canonical:
+            continue
+        raw = canonical[field]
+        if field == 'industry' and isinstance(raw, list):
+            raw = raw[0] if raw else None
+            issues.append("industry: list reduced to first entry")
+        value = _clean_text(raw)
+        if value is None:
+            # Placeholders are dropped silently; anything else is worth reporting
+            del canonical[field]
+            if not is_placeholder(raw):
+                issues.append(f"{field}: dropped non-text value")
+        else:
+            canonical[field] = value
+
+    if 'industry' in canonical:
+        canonical['industry'] = INDUSTRIES.canonical(canonical['industry'])
+
+    technologies = canonical.get('technologies')
+    if isinstance(technologies, str):
+        technologies = [tech for tech in technologies.split(',')]
+        issues.append("technologies: split comma-separated string")
+    if technologies is not None and not isinstance(technologies, list):
+        issues.append("technologies: dropped non-list value")
+        technologies = []
+    technologies = TECHNOLOGIES.canonicalize_all(technologies or [])
+    if technologies:
+        canonical['technologies'] = technologies
+    else:
+        canonical.pop('technologies', None)
+
+    metadata = canonical.get('metadata')
+    if metadata is not None and not isinstance(metadata, dict):
+        issues.append("metadata: replaced non-object value")
+        metadata = None
+    canonical['metadata'] = dict(metadata or {})
+
+    if 'id' in canonical and isinstance(canonical['id'], str) and canonical['id'].strip().isdigit():
+        canonical['id'] = int(canonical['id'])
+
+    if 'client_name' not in canonical:
+        return None, issues + ["rejected: missing client_name"]
+    if not any(field in canonical for field in CONTENT_FIELDS):
+        return None, issues + ["rejected: no problem, solution or results text"]
+
+    return canonical, issues
+
+
+def normalize_service(record: Any) -> Tuple[Optional[Dict], List[str]]:
+    """Validate a service: it needs a name; description becomes a string"""
+    if not isinstance(record, dict):
+        return None, [f"not an object ({type(record).__name__})"]
+
+    service = dict(record)
+    name = _clean_text(service.get('name'))
+    if name is None:
+        return None, ["rejected: missing name"]
+    service['name'] = name
+
+    issues = []
+    description = service.get('description')
+    if description is not None and not isinstance(description, str):
+        issues.append("description: dropped non-text value")
+        service['description'] = ''
+    return service, issues
+
+
+def report_entry(source: str, index: int, record: Any, canonical: Optional[Dict],
+                 issues: List[str]) -> Dict:
+    """One validation report row: where the record came from and what happened to it"""
+    original = record if isinstance(record, dict) else {}
+    return {
+        "source": source,
+        "index": index,
+        "id": original.get('id'),
+        "client_name": original.get('client_name') or original.get('name'),
+        "status": "rejected" if canonical is None else "repaired",
+        "issues": issues
+    }
+
+
+def _normalize_chunk(args: Tuple[str, int, List]) -> Tuple[List[Dict], List[Dict]]:
+    """Worker: normalize one chunk of case studies (module level so it pickles)"""
+    source, start, records = args
+    normalized, report = [], []
+    for offset, record in enumerate(records):
+        canonical, issues = normalize_case_study(record)
+        if canonical is not None:
+            normalized.append(canonical)
+        if issues:
+            report.append(report_entry(source, start + offset, record, canonical, issues))
+    return normalized, report
+
+
+def normalize_case_studies(records: List, source: str = '', workers: Optional[int] = None,
+                           chunk_size: int = CHUNK_SIZE) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Normalize a list of case studies, in parallel chunks for large inputs
+
+    Args:
+        records: Case studies in either schema
+        source: Label used in the report (e.g. 'manual', 'auto')
+        workers: Process count (None for CPU count; 1 to stay in-process)
+        chunk_size: Records per worker task
+
+    Returns:
+        (canonical records in input order, per-record report of repairs and rejections)
+    """
+    chunks = [(source, start, records[start:start + chunk_size])
+              for start in range(0, len(records), chunk_size)]
+
+    # A pool only pays off once there are several chunks to spread
+    if workers == 1 or len(chunks) < 2:
+        results = [_normalize_chunk(chunk) for chunk in chunks]
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results = list(executor.map(_normalize_chunk, chunks))
+
+    normalized, report = [], []
+    for chunk_records, chunk_report in results:
+        normalized.extend(chunk_records)
+        report.extend(chunk_report)
+    return normalized, report
+
+
+def normalize_services(records: List, source: str = '') -> Tuple[List[Dict], List[Dict]]:
+    """Validate services in-process (they are few and small)"""
+    normalized, report = [], []
+    for index, record in enumerate(records):
+        service, issues = normalize_service(record)
+        if service is not None:
+            normalized.append(service)
+        if issues:
+            report.append(report_entry(source, index, record, service, issues))
+    return normalized, report
+
+
+def case_study_sections(case_study: Dict) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Header and labeled field sections of a case study, placeholders left out
+
+    Returns:
+        ("Case Study: ...\nIndustry: ...", [(field, "Problem:\n..."), ...])
+    """
+    def present(field):
+        value = case_study.get(field)
+        return None if is_placeholder(value) else value
+
+    header = [f"Case Study: {present('client_name') or 'Unknown Client'}"]
+    if present('industry'):
+        header.append(f"Industry: {case_study['industry']}")
+
+    sections = []
+    for label, field in (('Problem', 'problem'), ('Solution', 'solution')):
+        if present(field):
+            sections.append((field, f"{label}:\n{case_study[field]}"))
+
+    technologies = [tech for tech in (present('technologies') or []) if isinstance(tech, str)]
+    if technologies:
+        sections.append(('technologies', f"Technologies Used: {', '.join(technologies)}"))
+
+    if present('results'):
+        sections.append(('results', f"Results:\n{case_study['results']}"))
+    if present('duration'):
+        sections.append(('duration', f"Duration: {case_study['duration']}"))
+
+    return '\n'.join(header), sections
+
+
+def format_case_study(case_study: Dict) -> str:
+    """
+    Vector-store text for a case study; missing fields are left out instead
+    of being rendered as "N/A", so chunks only carry real content
+    """
+    header, sections = case_study_sections(case_study)
+    return '\n\n'.join([header] + [text for _, text in sections])
@@ -0,0 +1,263 @@
+"""
+Streaming readers and writers for knowledge-base files
+Reads the top-level arrays of a knowledge-base JSON document (or a JSON-Lines
+export) one element at a time, and writes merged output element by element to
+a temp file that is atomically renamed into place, so memory stays roughly
+constant regardless of file size
+
+JSON-Lines layout: one record per line, {"section": "<name>", "value": <item>},
+plus {"object": "<name>", "value": <value>} for non-array entries
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',:]}'
+
+
+class _Buffer:
+    """Sliding text window over a file for incremental decoding"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk (dropping consumed text); False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> Optional[str]:
+        """Next non-whitespace character (not consumed), or None at end of file"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char is None or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                # A number at the end of the window may be truncated ("-1" of
+                # "-1.5e3"), so only accept a value once a delimiter follows it
+                # or the file is exhausted
+                if (end < len(self.text) and self.text[end] in _DELIMITERS) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self.fill() and self.eof and self.pos >= len(self.text):
+                raise ValueError("Unexpected end of file")
+
+
+def iter_top_level(filepath: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any, bool]]:
+    """
+    Walk the top-level entries of a JSON object without loading it whole
+
+    Args:
+        filepath: JSON file whose root is an object
+        chunk_size: Characters read per chunk
+
+    Returns:
+        Iterator of (key, value, is_array). For arrays the value is an
+        iterator over the elements; whatever the caller leaves unconsumed is
+        skipped element by element before the next entry is read.
+    """
+    decoder = json.JSONDecoder()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        buf = _Buffer(f, chunk_size)
+        buf.expect('{')
+        if buf.peek() == '}':
+            return
+
+        while True:
+            name = buf.decode(decoder)
+            buf.expect(':')
+
+            if buf.peek() == '[':
+                elements = _iter_array(buf, decoder)
+                yield name, elements, True
+                for _ in elements:
+                    pass
+            else:
+                yield name, buf.decode(decoder), False
+
+            if buf.expect(',}') == '}':
+                return
+
+
+def _iter_array(buf: _Buffer, decoder: json.JSONDecoder) -> Iterator[Any]:
+    buf.expect('[')
+    if buf.peek() == ']':
+        buf.expect(']')
+        return
+    while True:
+        yield buf.decode(decoder)
+        if buf.expect(',]') == ']':
+            return
+
+
+def iter_json_array(filepath: str, key: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level array without loading the whole document
+
+    Args:
+        filepath: JSON file whose root is an object
+        key: Top-level key holding the array
+        chunk_size: Characters read per chunk
+
+    Returns:
+        Iterator over the array elements (empty if the key is missing)
+    """
+    for name, value, is_array in iter_top_level(filepath, chunk_size):
+        if name == key and is_array:
+            yield from value
+            return
+
+
+def iter_jsonl_entries(filepath: str) -> Iterator[Tuple[str, Any, bool]]:
+    """Yield (name, value, is_section_item) for every record of a JSON-Lines knowledge base"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if 'section' in record:
+                yield record['section'], record.get('value'), True
+            elif 'object' in record:
+                yield record['object'], record.get('value'), False
+
+
+def iter_jsonl_section(filepath: str, section: str) -> Iterator[Any]:
+    """Yield the values of one section from a JSON-Lines knowledge base"""
+    for name, value, is_item in iter_jsonl_entries(filepath):
+        if is_item and name == section:
+            yield value
+
+
+def is_jsonl(filepath: str) -> bool:
+    return Path(filepath).suffix.lower() in ('.jsonl', '.ndjson')
+
+
+def iter_section(filepath: str, section: str) -> Iterator[Any]:
+    """Yield the items of a knowledge-base section from a .json or .jsonl file"""
+    if is_jsonl(filepath):
+        return iter_jsonl_section(filepath, section)
+    return iter_json_array(filepath, section)
+
+
+class StreamingKBWriter:
+    """
+    Write a knowledge base one item at a time
+
+    Sections must be written in order (all items of one section before the
+    next). Non-array top-level entries (e.g. company_info) are passed as
+    objects and written after the sections. Output goes to a temp file that
+    replaces the target only when the writer closes without an error.
+    """
+
+    def __init__(self, filepath: str, sections: List[str], objects: Optional[Dict[str, Any]] = None):
+        self.filepath = Path(filepath)
+        self.tmp_path = self.filepath.with_name(self.filepath.name + '.tmp')
+        self.sections = sections
+        self.objects = objects or {}
+        self.jsonl = is_jsonl(filepath)
+        self.counts = {section: 0 for section in sections}
+        self._current = None
+        self._f = None
+
+    def __enter__(self):
+        self._f = open(self.tmp_path, 'w', encoding='utf-8')
+        if not self.jsonl:
+            self._f.write('{')
+        return self
+
+    def _open_section(self, section: str):
+        if section == self._current:
+            return
+        if section not in self.sections:
+            raise ValueError(f"Unknown section: {section}")
+        if self._current is not None and \
+                self.sections.index(section) < self.sections.index(self._current):
+            raise ValueError(f"Section '{section}' written after '{self._current}'")
+
+        # Sections skipped over still appear (empty) in the JSON output
+        start = self.sections.index(self._current) + 1 if self._current is not None else 0
+        for name in self.sections[start:self.sections.index(section) + 1]:
+            if self._current is not None:
+                self._close_section()
+            self._current = name
+            if not self.jsonl:
+                prefix = ',' if self.sections.index(name) > 0 else ''
+                self._f.write(f'{prefix}\n  {json.dumps(name)}: [')
+
+    def _close_section(self):
+        if not self.jsonl:
+            self._f.write('\n  ]' if self.counts[self._current] else ']')
+
+    def write(self, section: str, item: Any):
+        """Append one item to a section"""
+        self._open_section(section)
+        if self.jsonl:
+            self._f.write(json.dumps({"section": section, "value": item}, ensure_ascii=False))
+            self._f.write('\n')
+        else:
+            separator = ',' if self.counts[section] else ''
+            self._f.write(f"{separator}\n    {json.dumps(item, ensure_ascii=False)}")
+        self.counts[section] += 1
+
+    def _write_objects(self):
+        if self.jsonl:
+            for name, value in self.objects.items():
+                self._f.write(json.dumps({"object": name, "value": value}, ensure_ascii=False))
+                self._f.write('\n')
+            return
+
+        entries = [f"\n  {json.dumps(name)}: {json.dumps(value, ensure_ascii=False)}"
+                   for name, value in self.objects.items()]
+        prefix = ',' if self.sections and entries else ''
+        self._f.write(prefix + ','.join(entries) + '\n}\n')
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                if self.sections:
+                    self._open_section(self.sections[-1])
+                    self._close_section()
+                self._write_objects()
+        finally:
+            self._f.close()
+
+        if exc_type is None:
+            os.replace(self.tmp_path, self.filepath)
+        elif self.tmp_path.exists():
+            os.remove(self.tmp_path)
+        return False
@@ -0,0 +1,371 @@
+"""
+Load test for ShuruTechRAGBot
+Drives many concurrent chat sessions through the bot's public API
+(get_response), each replaying a scripted multi-turn conversation from
+benchmarks/conversations.json. A local mock LLM with configurable latency and
+token rate stands in for ChatAnthropic, so the run measures this process, not
+the API. Reports:
+- Throughput (turns/s) and get_response latency p50/p95/p99
+- Memory retained per session (measured in a separate tracemalloc pass)
+- CPU time per turn split into embedding, retrieval and chain overhead
+
+Usage:
+    python load_test.py --sessions 40 --concurrency 10
+    python load_test.py --llm-latency 1.5 --tokens-per-second 30 --think-time 2
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmark_retrieval import RESULTS_DIR, latency_summary
+from tracing import percentile
+
+CONVERSATIONS_FILE = 'benchmarks/conversations.json'
+
+logger = logging.getLogger(__name__)
+
+# Per-thread CPU seconds spent in embedding and vector search during the current turn
+_cpu = threading.local()
+
+
+def _add_cpu(bucket: str, seconds: float):
+    setattr(_cpu, bucket, getattr(_cpu, bucket, 0.0) + seconds)
+
+
+class MockChatModel(BaseChatModel):
+    """
+    Stand-in for ChatAnthropic: waits like a remote model and returns canned text
+
+    The wait is first_token_latency plus response_tokens / tokens_per_second
+    (no wait at all when tokens_per_second <= 0). For the chain's
+    question-condensing call it echoes the follow-up question, so retrieval
+    still sees a realistic query.
+    """
+
+    first_token_latency: float = 0.5
+    tokens_per_second: float = 50.0
+    response_tokens: int = 200
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock-chat"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        prompt = str(messages[-1].content) if messages else ''
+        if 'Follow Up Input:' in prompt:
+            text = prompt.split('Follow Up Input:', 1)[1].split('\n')[0].strip()
+        else:
+            text = ' '.join(['Shuru Tech solved a similar challenge.'] * (self.response_tokens // 6 + 1))
+        tokens = len(text.split())
+
+        if self.tokens_per_second > 0:
+            time.sleep(self.first_token_latency)
+        if run_manager:
+            run_manager.on_llm_new_token(text.split(' ', 1)[0])  # Lets traces record time-to-first-token
+        if self.tokens_per_second > 0:
+            time.sleep(tokens / self.tokens_per_second)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+class TimedEmbeddings(Embeddings):
+    """Embeddings wrapper that charges the calling thread's CPU time to 'embedding'"""
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        start = time.thread_time()
+        try:
+            return self.embeddings.embed_documents(texts)
+        finally:
+            _add_cpu('embedding', time.thread_time() - start)
+
+    def embed_query(self, text: str) -> List[float]:
+        start = time.thread_time()
+        try:
+            return self.embeddings.embed_query(text)
+        finally:
+            _add_cpu('embedding', time.thread_time() - start)
+
+
+def instrument_vectorstore(vectorstore):
+    """Charge the vector search itself (after the query is embedded) to 'retrieval'"""
+    for name in ('similarity_search_with_score_by_vector',
+                 'max_marginal_relevance_search_with_score_by_vector'):
+        search = getattr(vectorstore, name, None)
+        if search is None:
+            continue
+
+        def timed(*args, _search=search, **kwargs):
+            start = time.thread_time()
+            try:
+                return _search(*args, **kwargs)
+            finally:
+                _add_cpu('retrieval', time.thread_time() - start)
+
+        setattr(vectorstore, name, timed)
+    return vectorstore
+
+
+def load_conversations(path: str = CONVERSATIONS_FILE) -> List[Dict]:
+    """Load scripted conversations: [{"id", "turns": [question, ...]}]"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    conversations = data.get('conversations', []) if isinstance(data, dict) else data
+    conversations = [conv for conv in conversations if conv.get('turns')]
+    if not conversations:
+        raise ValueError(f"No conversations with turns in {path}")
+    return conversations
+
+
+def run_session(bot_factory, session_id: int, conversation: Dict, think_time: float) -> List[Dict]:
+    """Replay one conversation on a fresh bot; one record per turn"""
+    bot = bot_factory()
+    turns = []
+    for turn, question in enumerate(conversation['turns'], 1):
+        _cpu.embedding = 0.0
+        _cpu.retrieval = 0.0
+        cpu_start = time.thread_time()
+        start = time.perf_counter()
+
+        bot.get_response(question)
+
+        turns.append({
+            "session": session_id,
+            "conversation": conversation['id'],
+            "turn": turn,
+            "latency": time.perf_counter() - start,
+            "cpu": time.thread_time() - cpu_start,
+            "embedding": _cpu.embedding,
+            "retrieval": _cpu.retrieval,
+            "context_tokens": bot.last_token_usage.get('context_tokens'),
+            "error": bot.last_error
+        })
+        if think_time:
+            time.sleep(think_time)
+    return turns
+
+
+def measure_session_memory(bot_factory, conversations: List[Dict], sessions: int) -> Dict[str, float]:
+    """
+    Memory retained per finished session (bot, chain and conversation memory)
+
+    Runs sequentially under tracemalloc, separate from the timed run so
+    tracing does not distort latency.
+    """
+    retained = []
+    deltas = []
+    tracemalloc.start()
+    try:
+        for session_id in range(sessions):
+            before = tracemalloc.get_traced_memory()[0]
+            bot = bot_factory()
+            for question in conversations[session_id % len(conversations)]['turns']:
+                bot.get_response(question)
+            retained.append(bot)  # Keep sessions alive, as a server would
+            deltas.append(tracemalloc.get_traced_memory()[0] - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "sessions": sessions,
+        "mean_kb": statistics.fmean(deltas) / 1024 if deltas else 0.0,
+        "max_kb": max(deltas, default=0) / 1024
+    }
+
+
+def cpu_breakdown(turns: List[Dict]) -> Dict[str, float]:
+    """Mean CPU milliseconds per turn by stage (chain overhead is everything else)"""
+    if not turns:
+        return {}
+    embedding = statistics.fmean(t['embedding'] for t in turns) * 1000
+    retrieval = statistics.fmean(t['retrieval'] for t in turns) * 1000
+    total = statistics.fmean(t['cpu'] for t in turns) * 1000
+    return {
+        "embedding_ms": embedding,
+        "retrieval_ms": retrieval,
+        "chain_overhead_ms": max(total - embedding - retrieval, 0.0),
+        "total_ms": total
+    }
+
+
+def context_token_summary(turns: List[Dict]) -> Dict[str, float]:
+    """Spread of packed context tokens per turn (empty when packing is off)"""
+    counts = sorted(turn['context_tokens'] for turn in turns if turn.get('context_tokens') is not None)
+    if not counts:
+        return {}
+    return {"mean": sum(counts) / len(counts), "p50": percentile(counts, 50),
+            "p95": percentile(counts, 95), "max": counts[-1]}
+
+
+def run_load_test(bot_factory, conversations: List[Dict], sessions: int, concurrency: int,
+                  think_time: float = 0.0) -> Dict:
+    """
+    Run sessions concurrently and summarize
+
+    Args:
+        bot_factory: Callable returning a new bot per session
+        conversations: Scripts from load_conversations(); session i replays script i mod n
+        sessions: Total sessions to run
+        concurrency: Sessions in flight at once
+        think_time: Seconds a simulated visitor waits between turns
+
+    Returns:
+        {"throughput", "latency_ms", "cpu_per_turn", "errors", ...}
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(run_session, bot_factory, session_id,
+                            conversations[session_id % len(conversations)], think_time)
+            for session_id in range(sessions)
+        ]
+        turns = [turn for future in futures for turn in future.result()]
+    elapsed = time.perf_counter() - start
+
+    errors = [turn for turn in turns if turn['error']]
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "think_time": think_time,
+        "turns": len(turns),
+        "elapsed_s": elapsed,
+        "throughput": {
+            "turns_per_s": len(turns) / elapsed if elapsed else 0.0,
+            "sessions_per_s": sessions / elapsed if elapsed else 0.0
+        },
+        "latency_ms": latency_summary([turn['latency'] for turn in turns]),
+        "cpu_per_turn": cpu_breakdown(turns),
+        "context_tokens": context_token_summary(turns),
+        "errors": len(errors),
+        "error_samples": sorted({turn['error'] for turn in errors})[:5]
+    }
+
+
+def print_report(results: Dict):
+    """Print the load test summary"""
+    latency = results['latency_ms']
+    cpu = results['cpu_per_turn']
+    memory = results.get('memory_per_session')
+
+    print("\n" + "=" * 70)
+    print("🚦 LOAD TEST")
+    print("=" * 70)
+    print(f"   Sessions: {results['sessions']}  |  Concurrency: {results['concurrency']}"
+          f"  |  Turns: {results['turns']}  |  Elapsed: {results['elapsed_s']:.1f}s")
+    print(f"   Mock LLM: {results['llm']['first_token_latency']}s first token, "
+          f"{results['llm']['tokens_per_second']} tokens/s, {results['llm']['response_tokens']} tokens")
+
+    print(f"\n   Throughput: {results['throughput']['turns_per_s']:.2f} turns/s "
+          f"({results['throughput']['sessions_per_s']:.2f} sessions/s)")
+    print(f"   Latency: p50={latency['p50']:.0f}ms  p95={latency['p95']:.0f}ms  "
+          f"p99={latency['p99']:.0f}ms  max={latency['max']:.0f}ms")
+    if cpu:
+        print(f"   CPU per turn: embedding {cpu['embedding_ms']:.1f}ms  |  retrieval {cpu['retrieval_ms']:.1f}ms"
+              f"  |  chain overhead {cpu['chain_overhead_ms']:.1f}ms  |  total {cpu['total_ms']:.1f}ms")
+    if results.get('context_tokens'):
+        tokens = results['context_tokens']
+        print(f"   Context tokens per turn: p50={tokens['p50']:.0f}  p95={tokens['p95']:.0f}  max={tokens['max']}")
+    if memory:
+        print(f"   Memory per session: {memory['mean_kb']:.0f} KB mean, {memory['max_kb']:.0f} KB max"
+              f" (over {memory['sessions']} sessions)")
+    print(f"   Peak RSS: {results['peak_rss_mb']:.0f} MB")
+
+    if results['errors']:
+        print(f"\n   ⚠️  {results['errors']} turns failed:")
+        for message in results['error_samples']:
+            print(f"      - {message}")
+    print("=" * 70)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate concurrent chat sessions against ShuruTechRAGBot")
+    parser.add_argument('--sessions', type=int, default=20, help="Total sessions to run")
+    parser.add_argument('--concurrency', type=int, default=10, help="Sessions in flight at once")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Seconds between a session's turns")
+    parser.add_argument('--conversations', default=CONVERSATIONS_FILE, help="Scripted conversations")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="Mock LLM time to first token (s)")
+    parser.add_argument('--tokens-per-second', type=float, default=50.0, help="Mock LLM token rate (0 = instant)")
+    parser.add_argument('--response-tokens', type=int, default=200, help="Mock LLM answer length")
+    parser.add_argument('--memory-sessions', type=int, default=5,
+                        help="Sessions in the memory measurement pass (0 to skip)")
+    parser.add_argument('--output', help="Results file (default benchmarks/results/load-<timestamp>.json)")
+    parser.add_argument('--verbose', action='store_true', help="Keep the bot's per-query logging")
+    args = parser.parse_args(argv)
+
+    # Imported here so --help works without the app's dependencies
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from app import EMBEDDING_MODEL, ShuruTechRAGBot
+
+    if not args.verbose:
+        logging.getLogger('app').setLevel(logging.WARNING)
+
+    conversations = load_conversations(args.conversations)
+    llm = MockChatModel(first_token_latency=args.llm_latency, tokens_per_second=args.tokens_per_second,
+                        response_tokens=args.response_tokens)
+
+    # One vector store shared by every session, built the way the app builds it
+    builder = ShuruTechRAGBot(llm=llm, embeddings=TimedEmbeddings(HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)))
+    documents = builder.load_knowledge_base()
+    vectorstore = builder.create_vectorstore(documents) if documents else None
+    if vectorstore is None:
+        logger.error("❌ Could not build the vector store")
+        return 1
+    instrument_vectorstore(vectorstore)
+
+    def bot_factory():
+        return ShuruTechRAGBot(llm=llm, vectorstore=vectorstore)
+
+    # Warm the embedding model and code paths before timing
+    bot_factory().get_response(conversations[0]['turns'][0])
+
+    print(f"🚦 Running {args.sessions} sessions, {args.concurrency} at a time...")
+    results = run_load_test(bot_factory, conversations, args.sessions, args.concurrency, args.think_time)
+    results['llm'] = {
+        "first_token_latency": args.llm_latency,
+        "tokens_per_second": args.tokens_per_second,
+        "response_tokens": args.response_tokens
+    }
+
+    if args.memory_sessions > 0:
+        # Memory pass with an instant LLM: only allocations matter here
+        instant_llm = MockChatModel(tokens_per_second=0, response_tokens=args.response_tokens)
+        results['memory_per_session'] = measure_session_memory(
+            lambda: ShuruTechRAGBot(llm=instant_llm, vectorstore=vectorstore),
+            conversations, args.memory_sessions
+        )
+
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results['peak_rss_mb'] = peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    results['run_at'] = datetime.now().isoformat()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print_report(results)
+    print(f"💾 Results saved to {output}")
+    return 1 if results['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,37 @@
 Knowledge Base Merger Script
 Intelligently merges manual and auto-scraped knowledge bases
 - Combines case studies from both sources
-- Deduplicates services by name
-- Merges and sorts technologies and industries
+- Detects near-duplicate case studies with MinHash/LSH (manual entries win)
+- Validates and normalizes records onto one canonical schema (kb_schema.py),
+  with a per-record report of repairs and rejections
+- Deduplicates services by normalized name
+- Merges and sorts technologies and industries under canonical spellings
+  (vocabulary.py: React.js -> React, NodeJS -> Node.js)
+- Optional streaming mode (--stream) for inputs too large to load whole
+- Emits a change set (added/updated/removed keys with content hashes) against
+  the previous run's state, and skips the merge when no input changed
+- Merges case studies as a delta against the previous run: only records the
+  last merge did not see are normalized and MinHashed, and only the
+  near-duplicate groups they touch are folded again (see merge_case_studies)
 """
 
 import json
 import logging
-from typing import Dict, List, Any
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
+from change_sets import ChangeTracker, file_hash, has_changes, load_state, record_hash, save_json_atomic
+from kb_format import is_columnar, iter_section, load_kb
+from kb_schema import (PLACEHOLDER_VALUES, is_placeholder, normalize_case_studies, normalize_case_study,
+                       normalize_service, normalize_services, report_entry)
+from kb_stream import StreamingKBWriter
+from near_duplicates import LSHIndex, MinHasher, shingle_set
+from vocabulary import INDUSTRIES, SERVICES, TECHNOLOGIES, Vocabulary, VocabularySet
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,14 +45,68 @@ logger = logging.getLogger(__name__)
 class KnowledgeBaseMerger:
     """Intelligently merge manual and auto-scraped knowledge bases"""
 
+    # Field values that carry no information and may be filled from a duplicate
+    PLACEHOLDER_VALUES = PLACEHOLDER_VALUES
+
+    # Case study text fields used for near-duplicate signatures (scraper schema in brackets)
+    DEDUP_FIELDS = [('problem', 'challenge'), ('solution', 'solution'), ('results', 'business_impact')]
+
+    # Same field under the manual and the scrape_website.py schema (both directions)
+    FIELD_ALIASES = {
+        'problem': 'challenge', 'results': 'business_impact', 'technologies': 'technologies_used',
+        'duration': 'project_duration', 'url': 'source_url'
+    }
+    FIELD_ALIASES.update({alias: field for field, alias in list(FIELD_ALIASES.items())})
+
     def __init__(self,
                  manual_file='knowledge_base.json',
                  auto_file='knowledge_base_auto.json',
-                 output_file='knowledge_base_merged.json'):
+                 output_file='knowledge_base_merged.json',
+                 manual_dup_threshold: Optional[float] = 0.7,
+                 auto_dup_threshold: Optional[float] = 0.6,
+                 num_perm: int = 128,
+                 state_file: Optional[str] = None,
+                 changes_file: Optional[str] = None,
+                 validation_workers: Optional[int] = None,
+                 validation_file: Optional[str] = None):
+        """
+        Args:
+            manual_file: Curated knowledge base
+            auto_file: Auto-scraped knowledge base
+            output_file: Merged output
+            manual_dup_threshold: Similarity at which an auto study is folded into a manual one
+            auto_dup_threshold: Similarity at which two auto studies are folded together
+                                (None for both disables near-duplicate detection)
+            num_perm: MinHash signature length
+            state_file: Key -> hash state of the last merge (default <output>.state.json)
+            changes_file: Change set written after each merge (default <output>.changes.json)
+            validation_workers: Processes for record normalization (None for CPU count, 1 in-process)
+            validation_file: Per-record validation report (default <output>.validation.json)
+        """
         self.manual_file = manual_file
         self.auto_file = auto_file
         self.output_file = output_file
 
+        self.manual_dup_threshold = manual_dup_threshold
+        self.auto_dup_threshold = auto_dup_threshold
+        self.num_perm = num_perm
+        self.duplicates_removed = 0
+        self.counts: Dict[str, int] = {}
+
+        output_path = Path(output_file)
+        self.state_file = state_file or str(output_path.with_suffix('.state.json'))
+        self.changes_file = changes_file or str(output_path.with_suffix('.changes.json'))
+        self.tracker = ChangeTracker()
+        self.input_hashes: Dict[str, Optional[str]] = {}
+        self.change_set = None
+        # Per-record signatures and duplicate groups, saved for the next delta merge
+        self.dedup_state: Optional[Dict] = None
+        self.delta_stats: Dict[str, int] = {}
+
+        self.validation_workers = validation_workers
+        self.validation_file = validation_file or str(output_path.with_suffix('.validation.json'))
+        self.validation_report: List[Dict] = []
+
         self.manual_data = None
         self.auto_data = None
         self.merged_data = {
@@ -41,7 +117,7 @@ class KnowledgeBaseMerger:
         }
 
     def load_json_file(self, filepath: str) -> Dict[str, Any]:
-        """Load JSON file with error handling"""
+        """Load a JSON file (or columnar knowledge base directory) with error handling"""
         try:
             file_path = Path(filepath)
 
@@ -53,8 +129,11 @@ class KnowledgeBaseMerger:
                 logger.warning(f"⚠️  File is empty: {filepath}")
                 return None
 
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if is_columnar(filepath):
+                data = load_kb(filepath)
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
 
             logger.info(f"✓ Successfully loaded: {filepath}")
             return data
@@ -81,40 +160,321 @@ class KnowledgeBaseMerger:
 
         return True
 
-    def merge_case_studies(self) -> List[Dict]:
-        """Combine all case studies from both sources"""
-        logger.info("\n📚 Merging case studies...")
+    def normalize_data(self, data: Dict, source: str):
+        """
+        Replace a source's services with validated, canonical records (case
+        studies are normalized by merge_case_studies, only where they changed)
+        """
+        services, service_report = normalize_services(data.get('services', []), source)
 
-        manual_studies = self.manual_data.get('case_studies', []) if self.manual_data else []
-        auto_studies = self.auto_data.get('case_studies', []) if self.auto_data else []
+        rejected = sum(1 for entry in service_report if entry['status'] == 'rejected')
+        if rejected:
+            logger.warning(f"⚠️  {source}: rejected {rejected} invalid services")
+        self.validation_report.extend(service_report)
 
-        logger.info(f"   Manual case studies: {len(manual_studies)}")
-        logger.info(f"   Auto case studies: {len(auto_studies)}")
+        data['services'] = services
+        logger.info(f"   {source}: {len(services)} services after validation")
 
-        # Combine all case studies
-        all_studies = []
-
-        # Add manual studies with source tag
-        for study in manual_studies:
-            study_copy = study.copy()
-            if 'metadata' not in study_copy:
-                study_copy['metadata'] = {}
-            study_copy['metadata']['source'] = 'manual'
-            all_studies.append(study_copy)
+    def write_validation_report(self) -> bool:
+        """Write the per-record report of repairs and rejections"""
+        try:
+            statuses = [entry['status'] for entry in self.validation_report]
+            save_json_atomic(self.validation_file, {
+                "repaired": statuses.count('repaired'),
+                "rejected": statuses.count('rejected'),
+                "records": self.validation_report
+            })
+            logger.info(f"✓ Validation report written to {self.validation_file}")
+            return True
+        except OSError as e:
+            logger.error(f"❌ Failed to write validation report: {str(e)}")
+            return False
 
-        # Add auto studies with source tag
-        for study in auto_studies:
-            study_copy = study.copy()
-            if 'metadata' not in study_copy:
-                study_copy['metadata'] = {}
-            study_copy['metadata']['source'] = 'auto'
-            all_studies.append(study_copy)
+    @staticmethod
+    def record_keys(records: List, source: str) -> List[str]:
+        """
+        Keys of a source's raw case studies: "<source>:<content hash>", with a
+        "~n" suffix for repeats, so a record keeps its key wherever it moves
+        """
+        keys, seen = [], Counter()
+        for record in records:
+            base = f"{source}:{record_hash(record)}"
+            seen[base] += 1
+            keys.append(base if seen[base] == 1 else f"{base}~{seen[base]}")
+        return keys
+
+    def normalize_records(self, keys: List[str], raw: Dict[str, Any],
+                          sources: Dict[str, str]) -> Dict[str, Tuple[Optional[Dict], Optional[Dict]]]:
+        """
+        Normalize raw case studies by key (in parallel, see kb_schema)
+
+        Returns:
+            key -> (canonical study tagged with its source or None if rejected,
+            validation report entry or None)
+        """
+        results = {}
+        for source in ('manual', 'auto'):
+            subset = [key for key in keys if sources[key] == source]
+            if not subset:
+                continue
+            studies, report = normalize_case_studies([raw[key] for key in subset], source,
+                                                     workers=self.validation_workers)
+            entries = {entry['index']: entry for entry in report}
+            canonical = iter(studies)
+            for position, key in enumerate(subset):
+                entry = entries.get(position)
+                study = None if entry and entry['status'] == 'rejected' else next(canonical)
+                results[key] = (self.tag_source(study, source) if study is not None else None, entry)
+        return results
+
+    def dedup_config(self) -> List:
+        """Settings a saved dedup state is only valid for"""
+        return [self.manual_dup_threshold, self.auto_dup_threshold, self.num_perm]
+
+    def load_previous_merge(self) -> Optional[Tuple[Dict, List[Dict]]]:
+        """
+        Dedup state and case studies of the last merge, if a delta merge can
+        build on them: same dedup settings, and an output file that is still
+        the one that merge wrote
+
+        Returns:
+            (dedup state, merged case studies in group order), or None
+        """
+        state = load_state(self.state_file)
+        dedup = state.get('dedup')
+        if not dedup or dedup.get('config') != self.dedup_config():
+            return None
+        if not state.get('output') or state['output'] != file_hash(self.output_file):
+            return None
 
-        logger.info(f"✓ Total case studies after merge: {len(all_studies)}")
-        return all_studies
+        try:
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                studies = json.load(f).get('case_studies')
+        except (OSError, ValueError, AttributeError):
+            return None
+        if not isinstance(studies, list) or len(studies) != len(dedup.get('groups', [])):
+            return None
+        return dedup, studies
+
+    def merge_case_studies(self, previous: Optional[Tuple[Dict, List[Dict]]] = None) -> List[Dict]:
+        """
+        Normalize, combine and deduplicate the case studies of both sources
+
+        Every raw record is keyed by source and content hash (record_keys).
+        Against a previous merge (load_previous_merge):
+        - Only records it did not see are normalized and MinHashed; the rest
+          reuse their saved signature and validation result
+        - Near-duplicates are matched again from the signatures alone (LSH
+          bucket lookups, no shingling), so groups come out exactly as a full
+          merge would form them
+        - Only groups whose leader or members changed are folded again, from
+          freshly normalized records; every other merged study is copied from
+          the previous output
+        Without one, every record is new and the same steps merge everything.
+        """
+        logger.info("\n📚 Merging case studies...")
+        dedup, previous_studies = previous or ({}, [])
+        known = dedup.get('records', {})
+
+        raw: Dict[str, Any] = {}
+        sources: Dict[str, str] = {}
+        order: List[str] = []  # Merge order: manual records first, they win
+        for source, data in (('manual', self.manual_data), ('auto', self.auto_data)):
+            records = data.get('case_studies', []) if data else []
+            logger.info(f"   {source.capitalize()} case studies: {len(records)}")
+            keys = self.record_keys(records, source)
+            raw.update(zip(keys, records))
+            sources.update((key, source) for key in keys)
+            order.extend(keys)
+
+        # Normalize and sign only what the last merge has not seen
+        new_keys = [key for key in order if key not in known]
+        normalized = self.normalize_records(new_keys, raw, sources)
+        hasher = MinHasher(num_perm=self.num_perm)
+        records = {key: known[key] for key in order if key in known}
+        for key in new_keys:
+            study, entry = normalized[key]
+            shingles = shingle_set(self.dedup_text(study)) if study is not None else set()
+            records[key] = {
+                "rejected": study is None,
+                "signature": hasher.signature(shingles).tobytes().hex() if shingles else None,
+                "report": {field: value for field, value in entry.items() if field != 'index'} if entry else None
+            }
+
+        positions = Counter()
+        for key in order:
+            source = sources[key]
+            entry = records[key]['report']
+            if entry:
+                self.validation_report.append({**entry, "source": source, "index": positions[source]})
+            positions[source] += 1
+        for source in ('manual', 'auto'):
+            rejected = sum(1 for key in order if sources[key] == source and records[key]['rejected'])
+            if rejected:
+                logger.warning(f"⚠️  {source}: rejected {rejected} invalid case studies")
+            self.counts[f"{source}_case_studies"] = sum(
+                1 for key in order if sources[key] == source and not records[key]['rejected'])
+
+        groups = self.group_duplicates([key for key in order if not records[key]['rejected']],
+                                       records, sources)
+
+        # Unchanged groups are reused as merged; the others are folded from normalized records
+        reusable = {tuple(group): study for group, study in zip(dedup.get('groups', []), previous_studies)}
+        stale = [key for group in groups if tuple(key for key, _ in group) not in reusable
+                 for key, _ in group if key not in normalized]
+        normalized.update(self.normalize_records(stale, raw, sources))
+
+        merged = []
+        folded = 0
+        for group in groups:
+            members = tuple(key for key, _ in group)
+            if members in reusable:
+                merged.append(reusable[members])
+                continue
+            study = normalized[members[0]][0]
+            for key, similarity in group[1:]:
+                self.fold_duplicate(study, normalized[key][0], similarity)
+            merged.append(study)
+            folded += 1
+        self.duplicates_removed = sum(len(group) - 1 for group in groups)
+
+        self.dedup_state = {
+            "config": self.dedup_config(),
+            "records": records,
+            "groups": [[key for key, _ in group] for group in groups]
+        }
+        self.delta_stats = {"records": len(order), "normalized": len(new_keys) + len(stale),
+                            "groups_folded": folded, "groups_reused": len(groups) - folded}
+
+        logger.info(f"   Near-duplicates folded: {self.duplicates_removed}")
+        logger.info(f"   Delta: {len(new_keys)} new or changed records, {len(stale)} re-normalized for "
+                    f"their groups, {folded} merged studies rebuilt, {len(groups) - folded} reused")
+        logger.info(f"✓ Total case studies after merge: {len(merged)}")
+        return merged
+
+    def group_duplicates(self, keys: List[str], records: Dict[str, Dict],
+                         sources: Dict[str, str]) -> List[List[Tuple[str, float]]]:
+        """
+        Near-duplicate groups from saved MinHash signatures, using LSH
+
+        Manual studies are never dropped; an auto study that matches a manual
+        one is folded into it, and auto studies that match each other are
+        folded into the first one seen. Candidate pairs come from LSH buckets,
+        so the cost stays sub-quadratic in the number of studies.
+
+        Returns:
+            Groups in merge order: [(leader key, 1.0), (duplicate key, similarity), ...]
+        """
+        index = self.new_dedup_index()
+        groups: List[List[Tuple[str, float]]] = []
+        kept_manual: List[bool] = []
+        for key in keys:
+            signature = records[key]['signature']
+            if index is not None and signature is not None:
+                signature = np.frombuffer(bytes.fromhex(signature), dtype=np.uint32)
+                match = self.match_signature(index, signature, sources[key] == 'manual', kept_manual)
+                if match:
+                    position, similarity = match
+                    groups[position].append((key, similarity))
+                    continue
+            groups.append([(key, 1.0)])
+            kept_manual.append(sources[key] == 'manual')
+        return groups
+
+    def tag_source(self, study: Dict, source: str) -> Dict:
+        """Copy of a case study with metadata.source set (input is not mutated)"""
+        study_copy = study.copy()
+        study_copy['metadata'] = dict(study_copy.get('metadata') or {})
+        study_copy['metadata']['source'] = source
+        return study_copy
+
+    def dedup_text(self, study: Dict) -> str:
+        """Problem, solution and results text of a case study (either schema)"""
+        parts = []
+        for field, alias in self.DEDUP_FIELDS:
+            value = study.get(field) or study.get(alias) or ''
+            if isinstance(value, str) and value.strip().lower() not in self.PLACEHOLDER_VALUES:
+                parts.append(value)
+        return ' '.join(parts)
+
+    def is_placeholder(self, value: Any) -> bool:
+        """True for missing or filler values like 'Not specified'"""
+        return is_placeholder(value)
+
+    def fold_duplicate(self, kept: Dict, duplicate: Dict, similarity: float):
+        """
+        Merge a duplicate into the kept study: kept values win, placeholders
+        are filled from the duplicate and technologies are unioned
+        """
+        for key in list(kept.keys()):
+            if key in ('id', 'metadata'):
+                continue
+            value = duplicate.get(key)
+            if value is None and key in self.FIELD_ALIASES:
+                value = duplicate.get(self.FIELD_ALIASES[key])
+            if value is None:
+                continue
+            if key in ('technologies', 'technologies_used') and isinstance(value, list):
+                kept[key] = TECHNOLOGIES.canonicalize_all((kept.get(key) or []) + value)
+            elif self.is_placeholder(kept.get(key)) and not self.is_placeholder(value):
+                kept[key] = value
+
+        kept['metadata'].setdefault('duplicates', []).append({
+            "id": duplicate.get('id'),
+            "source": duplicate['metadata'].get('source'),
+            "similarity": round(similarity, 3)
+        })
+
+    def new_dedup_index(self) -> Optional[LSHIndex]:
+        """Empty LSH index for the configured thresholds (None if dedup is disabled)"""
+        thresholds = [t for t in (self.manual_dup_threshold, self.auto_dup_threshold) if t is not None]
+        if not thresholds:
+            return None
+        return LSHIndex(threshold=min(thresholds), num_perm=self.num_perm)
+
+    def match_signature(self, index: LSHIndex, signature: np.ndarray, manual: bool,
+                        kept_manual: List[bool]):
+        """
+        Check a signature against the studies kept so far and index it if it is new
+
+        Returns:
+            (kept position, similarity) if the study is a duplicate, else None.
+            A new study is inserted under position len(kept_manual), which the
+            caller must then append to.
+        """
+        if not manual:
+            for position, similarity in index.query(signature):
+                required = self.manual_dup_threshold if kept_manual[position] else self.auto_dup_threshold
+                if required is not None and similarity >= required:
+                    return position, similarity
+
+        index.insert(len(kept_manual), signature)
+        return None
+
+    def match_duplicate(self, hasher: MinHasher, index: LSHIndex, study: Dict,
+                        kept_manual: List[bool]):
+        """
+        Check a study against the studies kept so far and index it if it is new
+
+        Args:
+            hasher: MinHasher shared by the whole merge
+            index: LSH index keyed by kept position
+            study: Case study tagged with metadata.source
+            kept_manual: Whether each kept position is a manual study
+
+        Returns:
+            (kept position, similarity) if the study is a duplicate, else None.
+            A new study is inserted under position len(kept_manual), which the
+            caller must then append to.
+        """
+        shingles = shingle_set(self.dedup_text(study))
+        if not shingles:
+            return None
+        return self.match_signature(index, hasher.signature(shingles),
+                                    study['metadata'].get('source') == 'manual', kept_manual)
 
     def merge_services(self) -> List[Dict]:
-        """Deduplicate services by name (case-insensitive)"""
+        """Deduplicate services by normalized name ("AI & Automation" == "ai and automation")"""
         logger.info("\n🔧 Merging services...")
 
         manual_services = self.manual_data.get('services', []) if self.manual_data else []
@@ -123,104 +483,70 @@ class KnowledgeBaseMerger:
         logger.info(f"   Manual services: {len(manual_services)}")
         logger.info(f"   Auto services: {len(auto_services)}")
 
-        # Use dict to deduplicate by lowercase name
+        # Use dict to deduplicate by normalized name (manual services first, they take priority)
         services_dict = {}
-
-        # Add manual services first (they take priority)
-        for service in manual_services:
-            name = service.get('name', '').strip()
-            if name:
-                name_lower = name.lower()
-                if name_lower not in services_dict:
-                    service_copy = service.copy()
-                    service_copy['source'] = 'manual'
-                    services_dict[name_lower] = service_copy
-                    logger.debug(f"   Added manual service: {name}")
-
-        # Add auto services (skip if already exists)
         duplicates = 0
-        for service in auto_services:
-            name = service.get('name', '').strip()
-            if name:
-                name_lower = name.lower()
-                if name_lower not in services_dict:
-                    service_copy = service.copy()
-                    service_copy['source'] = 'auto'
-                    services_dict[name_lower] = service_copy
-                    logger.debug(f"   Added auto service: {name}")
-                else:
+        for source, services in (('manual', manual_services), ('auto', auto_services)):
+            for service in services:
+                name = service.get('name', '').strip()
+                key = SERVICES.key(name)
+                if not key:
+                    continue
+                if key in services_dict:
                     duplicates += 1
                     logger.debug(f"   Skipped duplicate: {name}")
+                    continue
+                service_copy = service.copy()
+                service_copy['source'] = source
+                services_dict[key] = service_copy
+                logger.debug(f"   Added {source} service: {name}")
 
         merged_services = list(services_dict.values())
 
         logger.info(f"✓ Total unique services: {len(merged_services)} (removed {duplicates} duplicates)")
         return merged_services
 
-    def merge_technologies(self) -> List[str]:
-        """Combine and deduplicate technologies, return sorted list"""
-        logger.info("\n💻 Merging technologies...")
-
-        manual_techs = self.manual_data.get('technologies', []) if self.manual_data else []
-        auto_techs = self.auto_data.get('technologies', []) if self.auto_data else []
-
-        logger.info(f"   Manual technologies: {len(manual_techs)}")
-        logger.info(f"   Auto technologies: {len(auto_techs)}")
+    def merge_vocabulary(self, section: str, vocabulary: Vocabulary) -> List[str]:
+        """Combine a string section from both sources under canonical spellings, sorted"""
+        manual_values = self.manual_data.get(section, []) if self.manual_data else []
+        auto_values = self.auto_data.get(section, []) if self.auto_data else []
 
-        # Combine and deduplicate (case-sensitive to preserve proper casing)
-        all_techs = set()
+        logger.info(f"   Manual {section}: {len(manual_values)}")
+        logger.info(f"   Auto {section}: {len(auto_values)}")
 
-        for tech in manual_techs:
-            if tech and isinstance(tech, str):
-                all_techs.add(tech.strip())
+        # Hash-set index keyed by normalized term; aliases collapse onto one spelling
+        merged = VocabularySet(vocabulary, None, list(manual_values) + list(auto_values))
+        sorted_values = sorted(merged)
 
-        for tech in auto_techs:
-            if tech and isinstance(tech, str):
-                all_techs.add(tech.strip())
+        duplicates = (len(manual_values) + len(auto_values)) - len(sorted_values)
+        logger.info(f"✓ Total unique {section}: {len(sorted_values)} (removed {duplicates} duplicates)")
 
-        # Sort alphabetically
-        sorted_techs = sorted(list(all_techs))
+        return sorted_values
 
-        duplicates = (len(manual_techs) + len(auto_techs)) - len(sorted_techs)
-        logger.info(f"✓ Total unique technologies: {len(sorted_techs)} (removed {duplicates} duplicates)")
-
-        return sorted_techs
+    def merge_technologies(self) -> List[str]:
+        """Combine and deduplicate technologies, return sorted list"""
+        logger.info("\n💻 Merging technologies...")
+        return self.merge_vocabulary('technologies', TECHNOLOGIES)
 
     def merge_industries(self) -> List[str]:
         """Combine and deduplicate industries, return sorted list"""
         logger.info("\n🏭 Merging industries...")
+        return self.merge_vocabulary('industries', INDUSTRIES)
 
-        manual_industries = self.manual_data.get('industries', []) if self.manual_data else []
-        auto_industries = self.auto_data.get('industries', []) if self.auto_data else []
-
-        logger.info(f"   Manual industries: {len(manual_industries)}")
-        logger.info(f"   Auto industries: {len(auto_industries)}")
-
-        # Combine and deduplicate (case-sensitive to preserve proper casing)
-        all_industries = set()
-
-        for industry in manual_industries:
-            if industry and isinstance(industry, str):
-                all_industries.add(industry.strip())
-
-        for industry in auto_industries:
-            if industry and isinstance(industry, str):
-                all_industries.add(industry.strip())
-
-        # Sort alphabetically
-        sorted_industries = sorted(list(all_industries))
+    def merge(self, incremental: bool = True) -> bool:
+        """
+        Execute the complete merge process
 
-        duplicates = (len(manual_industries) + len(auto_industries)) - len(sorted_industries)
-        logger.info(f"✓ Total unique industries: {len(sorted_industries)} (removed {duplicates} duplicates)")
-
-        return sorted_industries
-
-    def merge(self) -> bool:
-        """Execute the complete merge process"""
+        Args:
+            incremental: Merge case studies as a delta against the previous
+                         merge when its state is usable (False merges everything)
+        """
         logger.info("\n" + "=" * 70)
         logger.info("🔄 Starting Knowledge Base Merge")
         logger.info("=" * 70)
 
+        self.input_hashes = self.current_input_hashes()
+
         # Load both files
         logger.info("\n📂 Loading knowledge bases...")
         self.manual_data = self.load_json_file(self.manual_file)
@@ -238,13 +564,30 @@ class KnowledgeBaseMerger:
         if self.auto_data:
             self.validate_structure(self.auto_data, self.auto_file)
 
+        previous = self.load_previous_merge() if incremental else None
+        if previous is None:
+            logger.info("\n📂 No usable previous merge state; merging everything")
+
+        # Map both schemas onto canonical records, repairing or rejecting bad ones
+        logger.info("\n🧹 Validating and normalizing services...")
+        if self.manual_data:
+            self.normalize_data(self.manual_data, 'manual')
+        if self.auto_data:
+            self.normalize_data(self.auto_data, 'auto')
+
         # Perform merges
         try:
-            self.merged_data['case_studies'] = self.merge_case_studies()
+            self.merged_data['case_studies'] = self.merge_case_studies(previous)
             self.merged_data['services'] = self.merge_services()
             self.merged_data['technologies'] = self.merge_technologies()
             self.merged_data['industries'] = self.merge_industries()
 
+            self.counts.update({key: len(value) for key, value in self.merged_data.items()})
+
+            for section in self.tracker.state:
+                for item in self.merged_data[section]:
+                    self.tracker.add(section, item)
+
             logger.info("\n✅ Merge completed successfully!")
             return True
 
@@ -252,6 +595,202 @@ class KnowledgeBaseMerger:
             logger.error(f"❌ Error during merge: {str(e)}")
             return False
 
+    def stream_sources(self) -> List[tuple]:
+        """(filepath, source) pairs for the input files that exist and are non-empty"""
+        sources = []
+        for filepath, source in ((self.manual_file, 'manual'), (self.auto_file, 'auto')):
+            file_path = Path(filepath)
+            if not file_path.exists():
+                logger.warning(f"⚠️  File not found: {filepath}")
+            elif file_path.stat().st_size == 0:
+                logger.warning(f"⚠️  File is empty: {filepath}")
+            else:
+                sources.append((filepath, source))
+        return sources
+
+    def iter_tagged_studies(self, sources: List[tuple], report: bool = False) -> Iterator[Dict]:
+        """
+        Normalized case studies from every source, in order, tagged with
+        metadata.source (rejected records are skipped; report=True records
+        the issues, so a two-pass caller reports each record once)
+        """
+        for filepath, source in sources:
+            for index, study in enumerate(iter_section(filepath, 'case_studies')):
+                canonical, issues = normalize_case_study(study)
+                if issues and report:
+                    self.validation_report.append(report_entry(source, index, study, canonical, issues))
+                if canonical is not None:
+                    yield self.tag_source(canonical, source)
+
+    def stream_case_studies(self, sources: List[tuple], writer: StreamingKBWriter):
+        """
+        Write deduplicated case studies in two passes over the inputs
+
+        Pass 1 keeps only MinHash signatures, a manual/auto flag per kept study
+        and the bodies of the duplicates found. Duplicates always follow the
+        study they fold into, so pass 2 can fold and write each study as it
+        is read again.
+        """
+        self.counts.update(manual_case_studies=0, auto_case_studies=0)
+
+        index = self.new_dedup_index()
+        duplicate_ordinals = set()
+        folds = defaultdict(list)  # kept position -> [(duplicate study, similarity)]
+
+        if index is not None:
+            hasher = MinHasher(num_perm=self.num_perm)
+            kept_manual = []
+            for ordinal, study in enumerate(self.iter_tagged_studies(sources)):
+                match = self.match_duplicate(hasher, index, study, kept_manual)
+                if match:
+                    position, similarity = match
+                    folds[position].append((study, similarity))
+                    duplicate_ordinals.add(ordinal)
+                else:
+                    kept_manual.append(study['metadata'].get('source') == 'manual')
+            index = None
+
+        position = 0
+        for ordinal, study in enumerate(self.iter_tagged_studies(sources, report=True)):
+            self.counts[f"{study['metadata']['source']}_case_studies"] += 1
+            if ordinal in duplicate_ordinals:
+                continue
+            for duplicate, similarity in folds.pop(position, ()):
+                self.fold_duplicate(study, duplicate, similarity)
+                self.duplicates_removed += 1
+            self.tracker.add('case_studies', study)
+            writer.write('case_studies', study)
+            position += 1
+
+        logger.info(f"   Near-duplicates folded: {self.duplicates_removed}")
+        logger.info(f"✓ Total case studies after merge: {writer.counts['case_studies']}")
+
+    def stream_services(self, sources: List[tuple], writer: StreamingKBWriter):
+        """Write services deduplicated by normalized name; only the keys are kept in memory"""
+        seen = set()
+        duplicates = 0
+        for filepath, source in sources:
+            for index, raw_service in enumerate(iter_section(filepath, 'services')):
+                service, issues = normalize_service(raw_service)
+                if issues:
+                    self.validation_report.append(report_entry(source, index, raw_service, service, issues))
+                if service is None:
+                    continue
+                key = SERVICES.key(service.get('name', ''))
+                if not key:
+                    continue
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                service_copy = service.copy()
+                service_copy['source'] = source
+                self.tracker.add('services', service_copy)
+                writer.write('services', service_copy)
+
+        logger.info(f"✓ Total unique services: {writer.counts['services']} (removed {duplicates} duplicates)")
+
+    def stream_vocabulary(self, sources: List[tuple], writer: StreamingKBWriter, section: str,
+                          vocabulary: Vocabulary):
+        """Write a sorted string section (technologies or industries) under canonical spellings"""
+        values = VocabularySet(vocabulary)
+        for filepath, _ in sources:
+            for value in iter_section(filepath, section):
+                values.add(value)
+
+        for value in sorted(values):
+            writer.write(section, value)
+        logger.info(f"✓ Total unique {section}: {len(values)}")
+
+    def merge_streaming(self) -> bool:
+        """
+        Merge and save without loading either input whole
+
+        Inputs may be JSON (read incrementally), JSON-Lines or columnar
+        knowledge base directories (see kb_format.py); output is
+        written item by item to a temp file and renamed into place, so memory
+        stays roughly constant regardless of input size.
+        """
+        logger.info("\n" + "=" * 70)
+        logger.info("🔄 Starting Streaming Knowledge Base Merge")
+        logger.info("=" * 70)
+
+        self.input_hashes = self.current_input_hashes()
+        sources = self.stream_sources()
+        if not sources:
+            logger.error("❌ Both files failed to load or don't exist. Cannot merge.")
+            return False
+
+        try:
+            with StreamingKBWriter(self.output_file, list(self.merged_data.keys())) as writer:
+                logger.info("\n📚 Merging case studies...")
+                self.stream_case_studies(sources, writer)
+                logger.info("\n🔧 Merging services...")
+                self.stream_services(sources, writer)
+                logger.info("\n💻 Merging technologies...")
+                self.stream_vocabulary(sources, writer, 'technologies', TECHNOLOGIES)
+                logger.info("\n🏭 Merging industries...")
+                self.stream_vocabulary(sources, writer, 'industries', INDUSTRIES)
+
+            self.counts.update(writer.counts)
+            logger.info(f"\n✅ Merge completed successfully! Saved to {self.output_file}")
+            return True
+
+        except (ValueError, OSError) as e:
+            logger.error(f"❌ Error during streaming merge: {str(e)}")
+            return False
+
+    def current_input_hashes(self) -> Dict[str, Optional[str]]:
+        """Content hash of each input file (None for a missing file)"""
+        return {filepath: file_hash(filepath) for filepath in (self.manual_file, self.auto_file)}
+
+    def is_up_to_date(self) -> bool:
+        """True if neither input changed since the last merge and its output still exists"""
+        previous = load_state(self.state_file)
+        return bool(previous.get('inputs')) and \
+            previous['inputs'] == self.current_input_hashes() and Path(self.output_file).exists()
+
+    def write_change_set(self) -> bool:
+        """
+        Diff this merge against the previous state, write the change set and
+        save the new state
+
+        The change set lists added, updated and removed case-study and service
+        keys with content hashes of the merged output. The state also keeps
+        the output's hash and, after a non-streaming merge, the per-record
+        dedup state the next delta merge starts from.
+        """
+        try:
+            previous = load_state(self.state_file)
+            self.change_set = self.tracker.change_set(previous)
+
+            save_json_atomic(self.changes_file, {
+                "output_file": self.output_file,
+                "first_run": not previous,
+                **self.change_set
+            })
+            state = {"inputs": self.input_hashes, "output": file_hash(self.output_file), **self.tracker.state}
+            if self.dedup_state is not None:
+                state['dedup'] = self.dedup_state
+            save_json_atomic(self.state_file, state)
+
+            for section, changes in self.change_set.items():
+                logger.info(f"   {section}: {len(changes['added'])} added, "
+                            f"{len(changes['updated'])} updated, {len(changes['removed'])} removed")
+            logger.info(f"✓ Change set written to {self.changes_file}")
+            return True
+
+        except OSError as e:
+            logger.error(f"❌ Failed to write change set: {str(e)}")
+            return False
+
+    def write_empty_change_set(self):
+        """Record that nothing changed, so consumers don't replay a stale change set"""
+        self.change_set = {section: {"added": [], "updated": [], "removed": []}
+                           for section in self.tracker.state}
+        save_json_atomic(self.changes_file, {"output_file": self.output_file, "first_run": False,
+                                             **self.change_set})
+
     def save_merged_data(self) -> bool:
         """Save merged data to output file"""
         try:
@@ -269,9 +808,9 @@ class KnowledgeBaseMerger:
 
     def print_summary(self):
         """Print comprehensive merge summary"""
-        manual_studies = len(self.manual_data.get('case_studies', [])) if self.manual_data else 0
-        auto_studies = len(self.auto_data.get('case_studies', [])) if self.auto_data else 0
-        total_studies = len(self.merged_data.get('case_studies', []))
+        manual_studies = self.counts.get('manual_case_studies', 0)
+        auto_studies = self.counts.get('auto_case_studies', 0)
+        total_studies = self.counts.get('case_studies', 0)
 
         print("\n" + "=" * 70)
         print("📊 MERGE SUMMARY")
@@ -280,18 +819,37 @@ class KnowledgeBaseMerger:
         print(f"   • Manual: {manual_studies} case studies")
         print(f"   • Auto: {auto_studies} case studies")
         print(f"   • Merged: {total_studies} total case studies")
+        print(f"   • Near-duplicates folded: {self.duplicates_removed}")
+        if self.delta_stats:
+            print(f"   • Re-normalized: {self.delta_stats['normalized']} of {self.delta_stats['records']} records; "
+                  f"merged studies rebuilt / reused: {self.delta_stats['groups_folded']} / "
+                  f"{self.delta_stats['groups_reused']}")
+        statuses = [entry['status'] for entry in self.validation_report]
+        print(f"   • Records repaired / rejected by validation: "
+              f"{statuses.count('repaired')} / {statuses.count('rejected')}")
 
         print(f"\n🔧 Services:")
-        print(f"   • Total services: {len(self.merged_data.get('services', []))}")
+        print(f"   • Total services: {self.counts.get('services', 0)}")
 
         print(f"\n💻 Technologies:")
-        print(f"   • Total technologies: {len(self.merged_data.get('technologies', []))}")
+        print(f"   • Total technologies: {self.counts.get('technologies', 0)}")
 
         print(f"\n🏭 Industries:")
-        print(f"   • Total industries: {len(self.merged_data.get('industries', []))}")
+        print(f"   • Total industries: {self.counts.get('industries', 0)}")
+
+        if self.change_set:
+            print(f"\n🔁 Changes since last merge:")
+            for section, changes in self.change_set.items():
+                if has_changes(changes):
+                    print(f"   • {section}: {len(changes['added'])} added, "
+                          f"{len(changes['updated'])} updated, {len(changes['removed'])} removed")
+                else:
+                    print(f"   • {section}: no changes")
 
         print(f"\n💾 Output:")
         print(f"   • Saved to: {self.output_file}")
+        print(f"   • Change set: {self.changes_file}")
+        print(f"   • Validation report: {self.validation_file}")
 
         print("=" * 70)
 
@@ -305,12 +863,27 @@ def main():
     )
 
     try:
-        # Execute merge
-        success = merger.merge()
+        # Nothing to do if neither input changed (use --full to force a merge)
+        if '--full' not in sys.argv[1:] and merger.is_up_to_date():
+            merger.write_empty_change_set()
+            logger.info(f"✓ Inputs unchanged since last merge; {merger.output_file} is up to date")
+            return 0
+
+        # Streaming mode merges and saves in one go
+        if '--stream' in sys.argv[1:]:
+            if not merger.merge_streaming() or not merger.write_change_set() \
+                    or not merger.write_validation_report():
+                logger.error("❌ Merge failed")
+                return 1
+            merger.print_summary()
+            return 0
+
+        # Execute merge (a delta against the last one unless --full)
+        success = merger.merge(incremental='--full' not in sys.argv[1:])
 
         if success:
             # Save merged data
-            if merger.save_merged_data():
+            if merger.save_merged_data() and merger.write_change_set() and merger.write_validation_report():
                 # Print summary
                 merger.print_summary()
             else:
@@ -0,0 +1,99 @@
+"""
+Near-duplicate detection for case studies using MinHash signatures and LSH banding
+Candidate pairs come from shared LSH buckets, so dedup stays sub-quadratic as
+the corpus grows
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+import numpy as np
+
+
+# Mersenne prime 2^31 - 1: a * x stays below 2^62, so the permutations fit in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def shingle_set(text: str, size: int = 3) -> Set[int]:
+    """Word n-gram shingles of normalized text, hashed to stable 32-bit ints"""
+    tokens = _TOKEN.findall((text or '').lower())
+    if len(tokens) < size:
+        return {zlib.crc32(' '.join(tokens).encode('utf-8'))} if tokens else set()
+    return {zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+            for i in range(len(tokens) - size + 1)}
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose LSH S-curve
+    midpoint (1/b)^(1/r) is closest to the similarity threshold
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1.0 / bands) ** (1.0 / rows)
+        error = abs(midpoint - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """Vectorized MinHash over 32-bit shingle hashes"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 42):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, int(_PRIME), size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.b = rng.randint(0, int(_PRIME), size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, shingles: Set[int]) -> np.ndarray:
+        """MinHash signature (num_perm uint32 values) of a shingle set"""
+        if not shingles:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles)) % _PRIME
+        hashed = (np.outer(values, self.a) + self.b) % _PRIME
+        return hashed.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """Estimated Jaccard similarity: fraction of agreeing signature slots"""
+        return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class LSHIndex:
+    """Banded LSH index over MinHash signatures (keeps only keys and signatures)"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128):
+        self.threshold = threshold
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self.buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(self.bands)]
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        """Add a signature under a key"""
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band][band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> List[Tuple[Hashable, float]]:
+        """Indexed keys at or above the threshold, most similar first"""
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            score = MinHasher.similarity(signature, self.signatures[key])
+            if score >= self.threshold:
+                matches.append((key, score))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
@@ -0,0 +1,105 @@
+"""
+Content-addressed archive of raw scraped pages
+Stores gzip-compressed page bodies keyed by their SHA-256 hash, plus a
+URL -> hash index, so extraction can be re-run locally without re-crawling
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+class RawArchive:
+    """
+    Layout:
+        <root>/objects/<hash[:2]>/<hash>.gz   compressed page body
+        <root>/index.json                     url -> {hash, source, fetched_at, size}
+    """
+
+    def __init__(self, root: str = 'raw_archive'):
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.index_path = self.root / 'index.json'
+        self.index: Dict[str, Dict] = {}
+        self._dirty = False
+
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.gz"
+
+    def put(self, url: str, content: str, source: str) -> str:
+        """
+        Archive a page body and point the URL at it
+
+        Args:
+            url: Page URL
+            content: Raw page body (HTML)
+            source: Which scraper/tier produced it (e.g. 'website_scraper', 'playwright')
+
+        Returns:
+            SHA-256 hex digest of the body
+        """
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        # Identical bodies are stored once
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+
+        self.index[url] = {
+            "hash": digest,
+            "source": source,
+            "fetched_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "size": len(data)
+        }
+        self._dirty = True
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        """Page body for a hash, or None if the object is missing"""
+        path = self._object_path(digest)
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+
+    def hash_for(self, url: str) -> Optional[str]:
+        """Hash of the latest archived body for a URL"""
+        entry = self.index.get(url)
+        return entry['hash'] if entry else None
+
+    def get_url(self, url: str) -> Optional[str]:
+        """Latest archived body for a URL"""
+        digest = self.hash_for(url)
+        return self.get(digest) if digest else None
+
+    def iter_pages(self, source_prefix: str = '') -> Iterator[Tuple[str, str]]:
+        """Yield (url, body) for every archived URL whose source starts with the prefix"""
+        for url, entry in self.index.items():
+            if entry.get('source', '').startswith(source_prefix):
+                body = self.get(entry['hash'])
+                if body is not None:
+                    yield url, body
+
+    def save(self):
+        """Persist the URL index atomically (no-op if nothing changed)"""
+        if not self._dirty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
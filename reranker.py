@@ -0,0 +1,189 @@
+"""
+Cross-encoder reranking with a latency budget
+Retrieval fetches a wider candidate set cheaply; a small local cross-encoder
+then scores every (query, chunk) pair in one batch and only the best few go
+into the prompt. Scores are cached per query and chunk text, and scoring runs
+on a small worker pool under a latency budget counted from when scoring
+starts: if it does not finish in time the candidates keep their retrieval
+order (the late scores still fill the cache). A request that finds every
+worker busy falls back at once instead of queueing behind other requests.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+class Reranker:
+    """Batch cross-encoder scoring with a score cache and a latency budget"""
+
+    def __init__(self, scorer: Callable[[List[Tuple[str, str]]], Sequence[float]],
+                 budget_ms: float = 300.0, cache_size: int = 4096, workers: int = 2):
+        """
+        Args:
+            scorer: Scores a batch of (query, passage) pairs, e.g. CrossEncoder.predict
+            budget_ms: Time allowed for scoring (from when it starts) before falling
+                back to retrieval order; with an infinite budget requests wait for a worker
+            cache_size: (query, passage) scores kept, least recently used evicted first
+            workers: Scoring batches run at once; requests beyond that fall back
+        """
+        self.scorer = scorer
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self.cache: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rerank')
+        # Free workers; only taken without waiting, so no request queues behind another
+        self.slots = threading.BoundedSemaphore(workers)
+        self.stats = {"requests": 0, "fallbacks": 0, "busy_fallbacks": 0, "pairs_scored": 0, "cache_hits": 0}
+
+    @classmethod
+    def from_model(cls, model_name: str = RERANK_MODEL, **kwargs) -> 'Reranker':
+        """Reranker backed by a sentence-transformers CrossEncoder"""
+        from sentence_transformers import CrossEncoder
+
+        model = CrossEncoder(model_name)
+        return cls(lambda pairs: model.predict(pairs, show_progress_bar=False), **kwargs)
+
+    @staticmethod
+    def _key(query: str, doc: Document) -> int:
+        return hash((query, doc.page_content))
+
+    def _cached(self, keys: List[int]) -> Dict[int, float]:
+        with self.lock:
+            found = {}
+            for key in keys:
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                    found[key] = self.cache[key]
+            return found
+
+    def _score(self, query: str, docs: List[Document], keys: List[int],
+               started: Optional[List[float]] = None) -> Dict[int, float]:
+        """Score the pairs in one batch and cache them (frees its worker slot when done)"""
+        try:
+            if started is not None:
+                started.append(time.perf_counter())
+            scores = self.scorer([(query, doc.page_content) for doc in docs])
+        finally:
+            self.slots.release()
+        result = {key: float(score) for key, score in zip(keys, scores)}
+        with self.lock:
+            self.stats['pairs_scored'] += len(result)
+            self.cache.update(result)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return result
+
+    def rerank(self, query: str, docs: Sequence[Document], top_n: int) -> List[Document]:
+        """
+        Best top_n documents by cross-encoder score
+
+        Falls back to the given (retrieval) order if scoring the uncached pairs
+        exceeds the budget or fails.
+        """
+        docs = list(docs)
+        if len(docs) <= 1:
+            return docs[:top_n]
+
+        keys = [self._key(query, doc) for doc in docs]
+        scores = self._cached(keys)
+        missing = [(doc, key) for doc, key in zip(docs, keys) if key not in scores]
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['cache_hits'] += len(scores)
+
+        if missing:
+            unbounded = math.isinf(self.budget_ms)
+            if not self.slots.acquire(blocking=unbounded):
+                with self.lock:
+                    self.stats['fallbacks'] += 1
+                    self.stats['busy_fallbacks'] += 1
+                logger.info("⏱️  Rerank workers busy, keeping retrieval order")
+                return docs[:top_n]
+
+            with span('rerank', nested=True, candidates=len(docs), scored=len(missing)):
+                started: List[float] = []
+                submitted = time.perf_counter()
+                future = self.executor.submit(self._score, query, [doc for doc, _ in missing],
+                                              [key for _, key in missing], started)
+                try:
+                    if unbounded:
+                        scores.update(future.result())
+                    else:
+                        # A slot was free, so scoring starts at once; the budget counts from then
+                        start = started[0] if started else submitted
+                        remaining = self.budget_ms / 1000 - (time.perf_counter() - start)
+                        scores.update(future.result(timeout=max(remaining, 0.0)))
+                except FutureTimeout:
+                    with self.lock:
+                        self.stats['fallbacks'] += 1
+                    logger.info(f"⏱️  Rerank over budget ({self.budget_ms:.0f}ms), keeping retrieval order")
+                    return docs[:top_n]
+                except Exception as e:
+                    with self.lock:
+                        self.stats['fallbacks'] += 1
+                    logger.warning(f"⚠️  Rerank failed, keeping retrieval order: {str(e)}")
+                    return docs[:top_n]
+
+        # Stable sort: equal scores keep retrieval order
+        order = sorted(range(len(docs)), key=lambda position: -scores[keys[position]])
+        return [docs[position] for position in order[:top_n]]
+
+
+class RerankingRetriever(BaseRetriever):
+    """Fetches candidates from a retriever's search(query, k) and keeps the reranker's top_n"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    base_retriever: BaseRetriever
+    reranker: Reranker
+    candidates: int = 20
+    top_n: int = 3
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Document]:
+        top_n = k or self.top_n
+        candidates = self.base_retriever.search(query, max(self.candidates, top_n))
+        return self.reranker.rerank(query, candidates, top_n)
+
+    def _get_relevant_documents(self, query: str, *,
+                                run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.search(query)
+
+
+_reranker: Optional[Reranker] = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> Reranker:
+    """
+    Process-wide reranker (one model and score cache for every session),
+    configured from RERANK_MODEL, RERANK_BUDGET_MS, RERANK_CACHE_SIZE and RERANK_WORKERS on first use
+    """
+    global _reranker
+    with _reranker_lock:
+        if _reranker is None:
+            _reranker = Reranker.from_model(
+                os.getenv('RERANK_MODEL', RERANK_MODEL),
+                budget_ms=float(os.getenv('RERANK_BUDGET_MS', 300)),
+                cache_size=int(os.getenv('RERANK_CACHE_SIZE', 4096)),
+                workers=int(os.getenv('RERANK_WORKERS', 2))
+            )
+    return _reranker
@@ -0,0 +1,474 @@
+"""
+Hybrid lexical + dense retrieval
+A BM25 inverted index is built in-process from the same chunks as the FAISS
+index (read back from the store's docstore, so it follows incremental
+updates). Queries run against both, and the two rankings are merged with
+weighted reciprocal rank fusion. Exact terms such as technology names
+("Kafka", "Stripe API") are found by the lexical pass even when the
+embedding ranks them low, so the dense search can use a smaller k.
+
+Queries that name an industry or technology ("fintech payments", "Kafka")
+are pre-filtered: metadata inverted indexes give the case-study chunks
+tagged with them, and both searches are restricted to that candidate set.
+Only confident mentions count: technology names that are everyday words
+("react", "express") need their casing, and generic industry keywords
+("security") are ignored, so ordinary phrasing does not narrow the search.
+"""
+
+import heapq
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from tracing import span
+from vector_index import search_parameters
+from vocabulary import INDUSTRIES, INDUSTRY_ALIASES, INDUSTRY_KEYWORDS, TECH_ALIASES, TECH_KEYWORDS, TECHNOLOGIES
+
+logger = logging.getLogger(__name__)
+
+# Metadata indexed with every chunk, so each chunk of a case study matches its technologies
+INDEXED_METADATA = ('client_name', 'industry', 'technologies')
+
+# Terms keep internal dots and trailing +/# ("node.js", "c++", "c#")
+_TOKEN = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i in is it its
+me my of on or our that the their them they this to was we were what when
+which who will with you your
+""".split())
+
+# Technology names that are also everyday words ("react to", "express interest",
+# "swift reply"): like one- and two-letter terms, they only match with their casing
+AMBIGUOUS_TECHNOLOGIES = frozenset(term.lower() for term in (
+    'Angular', 'Babel', 'Bamboo', 'Bootstrap', 'Capacitor', 'Chai', 'Chef', 'Cucumber', 'Drone',
+    'Echo', 'Express', 'Flask', 'Flutter', 'Flux', 'Gin', 'Hibernate', 'Ionic', 'Jasmine', 'Jest',
+    'LESS', 'Mocha', 'Monolith', 'Nomad', 'Oracle', 'Pandas', 'Phoenix', 'Playwright', 'Postman',
+    'Puppet', 'Puppeteer', 'Pyramid', 'Railway', 'Rails', 'React', 'Remix', 'Render', 'REST', 'Ruby',
+    'Rust', 'Sanity', 'Selenium', 'Sentry', 'SOAP', 'Spring', 'Swagger', 'Swift', 'Tailwind',
+    'Tornado', 'Transformer', 'Vagrant', 'YOLO'
+))
+
+# Industry keywords that are everyday software terms ("REST API security",
+# "training a model", "data store"); the scraper's classifier still uses them
+GENERIC_INDUSTRY_TERMS = frozenset((
+    'architecture', 'auto', 'automation', 'building', 'content', 'course', 'dispatch', 'foundation',
+    'grid', 'infrastructure', 'learning', 'network', 'policies', 'policy', 'power', 'production',
+    'security', 'store', 'stores', 'streaming', 'style', 'training'
+))
+
+# Reciprocal rank fusion constant: larger values flatten the rank discount
+RRF_K = 60
+
+# Field-level hits fetched per requested parent when collapsing (fields per case study)
+PARENT_FANOUT = 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms without stopwords"""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def indexed_text(doc: Document) -> str:
+    """Chunk text plus the metadata fields that are searched lexically"""
+    extra = [str(doc.metadata[field]) for field in INDEXED_METADATA if doc.metadata.get(field)]
+    return '\n'.join([doc.page_content] + extra)
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of chunk terms"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)  # term -> [(doc, tf)]
+        self.lengths: List[int] = []
+        self.idf: Dict[str, float] = {}
+        self.average_length = 0.0
+
+    def build(self, documents: Iterable[Document]) -> 'BM25Index':
+        """Index documents (replacing anything indexed before)"""
+        self.documents = list(documents)
+        self.postings = defaultdict(list)
+        self.lengths = []
+        for position, doc in enumerate(self.documents):
+            terms = Counter(tokenize(indexed_text(doc)))
+            self.lengths.append(sum(terms.values()))
+            for term, count in terms.items():
+                self.postings[term].append((position, count))
+
+        total = len(self.documents)
+        self.average_length = sum(self.lengths) / total if total else 0.0
+        self.idf = {term: math.log(1 + (total - len(hits) + 0.5) / (len(hits) + 0.5))
+                    for term, hits in self.postings.items()}
+        return self
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore, **params) -> 'BM25Index':
+        """Index the chunks stored in a FAISS vector store"""
+        docstore = vectorstore.docstore
+        documents = []
+        for chunk_id in vectorstore.index_to_docstore_id.values():
+            doc = docstore.search(chunk_id)
+            if isinstance(doc, Document):
+                if doc.id is None:
+                    doc.id = chunk_id
+                documents.append(doc)
+        return cls(**params).build(documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search(self, query: str, k: int, allowed: Optional[Set[str]] = None) -> List[Tuple[Document, float]]:
+        """
+        Top k chunks by BM25 score (chunks sharing no term with the query are left out)
+
+        Args:
+            allowed: Chunk ids to restrict the search to (default all)
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for position, count in self.postings[term]:
+                if allowed is not None and self.documents[position].id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / self.average_length)
+                scores[position] += idf * count * (self.k1 + 1) / (count + norm)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.documents[position], score) for position, score in best]
+
+
+class QueryAnalyzer:
+    """
+    Detects industry and technology mentions in a query
+
+    Uses the scraper's keyword tables and aliases (vocabulary.py), plus any
+    extra technology names (e.g. those found in the indexed case studies).
+    Terms of one or two characters ("Go", "AI") and technologies that are
+    everyday words ("React", "Swift") only match with their casing; generic
+    industry keywords ("security", "training") are not matched at all.
+    """
+
+    def __init__(self, technologies: Iterable[str] = ()):
+        self.technologies: Dict[str, str] = {}  # phrase -> canonical technology
+        for tech in [t for techs in TECH_KEYWORDS.values() for t in techs] + list(technologies):
+            self.technologies.setdefault(tech, TECHNOLOGIES.canonical(tech))
+        for canonical, names in TECH_ALIASES.items():
+            for name in names:
+                self.technologies.setdefault(name, canonical)
+
+        self.industries: Dict[str, str] = {}  # phrase -> industry
+        for industry, keywords in INDUSTRY_KEYWORDS.items():
+            for keyword in [industry, *keywords]:
+                if keyword.lower() not in GENERIC_INDUSTRY_TERMS:
+                    self.industries.setdefault(keyword, industry)
+        for canonical, names in INDUSTRY_ALIASES.items():
+            for name in names:
+                self.industries.setdefault(name, canonical)
+
+        self.patterns = [(self._compile(self.industries), INDUSTRIES),
+                         (self._compile(self.technologies), TECHNOLOGIES)]
+
+    @staticmethod
+    def _compile(phrases: Dict[str, str]) -> Tuple[Optional[re.Pattern], Optional[re.Pattern], Dict[str, str]]:
+        """
+        (case-insensitive pattern, case-sensitive pattern for short and
+        ambiguous terms, lowercase phrase -> canonical)
+        """
+        def alternation(terms, flags=0):
+            if not terms:
+                return None
+            ordered = sorted(terms, key=len, reverse=True)  # Longest match first ("React Native" before "React")
+            return re.compile(r'(?<![\w.])(?:' + '|'.join(map(re.escape, ordered)) + r')(?![\w+#])', flags)
+
+        exact, folded = [], []
+        for phrase in phrases:
+            if len(phrase) <= 2:
+                exact.append(phrase)
+            elif phrase.lower() in AMBIGUOUS_TECHNOLOGIES:
+                # A lowercase spelling (e.g. from case-study metadata) would match the everyday word
+                if phrase != phrase.lower():
+                    exact.append(phrase)
+            else:
+                folded.append(phrase)
+        lookup = {phrase.lower(): phrases[phrase] for phrase in folded}
+        lookup.update({phrase: phrases[phrase] for phrase in exact})
+        return alternation(folded, re.IGNORECASE), alternation(exact), lookup
+
+    def analyze(self, query: str) -> Tuple[List[str], List[str]]:
+        """
+        Returns:
+            (industries, technologies) mentioned in the query, canonical and deduplicated
+        """
+        found = []
+        for (insensitive, sensitive, lookup), vocabulary in self.patterns:
+            terms, spans = [], []
+            for pattern, fold in ((insensitive, True), (sensitive, False)):
+                if pattern is None:
+                    continue
+                for match in pattern.finditer(query):
+                    # "React" inside an already matched "React Native" is not a second mention
+                    if any(start < match.end() and match.start() < end for start, end in spans):
+                        continue
+                    spans.append(match.span())
+                    terms.append(lookup.get(match.group().lower() if fold else match.group()))
+            found.append(vocabulary.canonicalize_all(term for term in terms if term))
+        return found[0], found[1]
+
+
+class MetadataIndex:
+    """Inverted indexes from industry and technology to FAISS positions of case-study chunks"""
+
+    def __init__(self):
+        self.industries: Dict[str, Set[int]] = defaultdict(set)    # INDUSTRIES key -> positions
+        self.technologies: Dict[str, Set[int]] = defaultdict(set)  # TECHNOLOGIES key -> positions
+        self.chunk_ids: Dict[int, str] = {}
+        self.analyzer = QueryAnalyzer()
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore) -> 'MetadataIndex':
+        """Index the case-study chunks of a FAISS vector store by their metadata"""
+        index = cls()
+        technologies = set()
+        for position, chunk_id in vectorstore.index_to_docstore_id.items():
+            index.chunk_ids[position] = chunk_id
+            doc = vectorstore.docstore.search(chunk_id)
+            if not isinstance(doc, Document) or doc.metadata.get('type') != 'case_study':
+                continue
+            industry = INDUSTRIES.key(doc.metadata.get('industry') or '')
+            if industry:
+                index.industries[industry].add(position)
+            for tech in (doc.metadata.get('technologies') or '').split(','):
+                key = TECHNOLOGIES.key(tech)
+                if key:
+                    index.technologies[key].add(position)
+                    technologies.add(tech.strip())
+        # Technologies named in the corpus are recognized even if the keyword tables lack them
+        index.analyzer = QueryAnalyzer(sorted(technologies))
+        return index
+
+    def candidates(self, query: str, min_size: int = 1) -> Optional[Set[int]]:
+        """
+        FAISS positions a query should be restricted to
+
+        Chunks matching both a mentioned industry and a mentioned technology
+        when there are at least min_size of them, else chunks matching either.
+
+        Returns:
+            Positions, or None when the query names nothing that is indexed (search everything)
+        """
+        industries, technologies = self.analyzer.analyze(query)
+        by_industry = set().union(*(self.industries.get(INDUSTRIES.key(term), set()) for term in industries))
+        by_technology = set().union(*(self.technologies.get(TECHNOLOGIES.key(term), set()) for term in technologies))
+        if by_industry and by_technology:
+            both = by_industry & by_technology
+            return both if len(both) >= min_size else by_industry | by_technology
+        return (by_industry | by_technology) or None
+
+    def chunk_id_set(self, positions: Set[int]) -> Set[str]:
+        return {self.chunk_ids[position] for position in positions if position in self.chunk_ids}
+
+
+def filtered_similarity_search(vectorstore, query: str, k: int, positions: Set[int]) -> List[Document]:
+    """
+    Dense search over a subset of a FAISS store's vectors
+
+    The index only scores the selected vectors (IDSelectorBatch), so the
+    work follows the candidate set rather than the corpus size; IVF and HNSW
+    indexes keep their nprobe/efSearch.
+    """
+    vector = np.array([vectorstore.embedding_function.embed_query(query)], dtype=np.float32)
+    if getattr(vectorstore, '_normalize_L2', False):
+        faiss.normalize_L2(vector)
+    selector = faiss.IDSelectorBatch(np.fromiter(positions, dtype=np.int64, count=len(positions)))
+    with span('vector_search', nested=True, candidates=len(positions)):
+        _, indices = vectorstore.index.search(vector, min(k, len(positions)),
+                                              params=search_parameters(vectorstore.index, selector))
+
+    docs = []
+    for position in indices[0]:
+        if position == -1:
+            continue
+        doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[int(position)])
+        if isinstance(doc, Document):
+            docs.append(doc)
+    return docs
+
+
+def chunk_key(doc: Document) -> str:
+    """Identity used to merge the same chunk across rankings"""
+    return doc.id or f"{doc.metadata.get('doc_key', '')}\n{doc.page_content}"
+
+
+def parent_key(doc: Document) -> str:
+    """Identity after collapsing: the client for case studies, else the chunk"""
+    if doc.metadata.get('type') == 'case_study':
+        return f"case_study:{doc.metadata.get('client_name', '')}"
+    return chunk_key(doc)
+
+
+def collapse_to_parents(docs: Sequence[Document], docstore, k: int) -> List[Document]:
+    """
+    Replace field-level hits with their parent case study, one per client
+
+    Args:
+        docs: Ranked chunks; those with a parent_id are case-study fields
+        docstore: Docstore holding the parents under their parent_id
+        k: Documents to return
+
+    Returns:
+        Top k documents in rank order; parents list their matched fields in
+        metadata['matched_fields']
+    """
+    results: Dict[str, Document] = {}
+    for doc in docs:
+        key = parent_key(doc)
+        field = doc.metadata.get('field')
+        if key in results:
+            matched = results[key].metadata.get('matched_fields')
+            if field and matched is not None and field not in matched:
+                matched.append(field)
+            continue
+        if len(results) == k:
+            continue  # Still collect matched fields of the parents already taken
+
+        parent_id = doc.metadata.get('parent_id')
+        parent = docstore.search(parent_id) if parent_id else None
+        if isinstance(parent, Document):
+            doc = Document(page_content=parent.page_content, id=parent_id,
+                           metadata={**parent.metadata, "matched_fields": [field] if field else []})
+        results[key] = doc
+    return list(results.values())
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Tuple[List[Document], float]], k: int,
+                           rrf_k: int = RRF_K) -> List[Document]:
+    """
+    Merge ranked lists by weighted reciprocal rank
+
+    Args:
+        rankings: (ranked documents, weight) per retriever
+        k: Documents to return
+        rrf_k: Rank discount constant (score is weight / (rrf_k + rank))
+
+    Returns:
+        Top k documents by fused score
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    documents: Dict[str, Document] = {}
+    for ranked, weight in rankings:
+        if weight <= 0:
+            continue
+        for rank, doc in enumerate(ranked, 1):
+            key = chunk_key(doc)
+            scores[key] += weight / (rrf_k + rank)
+            documents.setdefault(key, doc)
+    best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+    return [documents[key] for key, _ in best]
+
+
+class HybridRetriever(BaseRetriever):
+    """Dense FAISS search and BM25 fused with reciprocal rank fusion"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: object
+    lexical_index: BM25Index
+    k: int = 5
+    dense_k: int = 10
+    lexical_k: int = 10
+    dense_weight: float = 1.0
+    lexical_weight: float = 1.0
+    rrf_k: int = RRF_K
+    # Restricts both searches to case studies with the industries/technologies a query names
+    metadata_index: Optional[MetadataIndex] = None
+    # Collapse case-study field hits to their parent case study (fields indexing)
+    collapse_parents: bool = False
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Document]:
+        """
+        Fused top k chunks (candidate depths scale with k when it exceeds self.k)
+
+        With a metadata index, a query naming an industry or technology is
+        searched only within the matching case studies (see
+        MetadataIndex.candidates). The unfiltered search runs only for queries
+        naming nothing, or to fill the rest when the candidates give fewer
+        than k results.
+        """
+        k = k or self.k
+        depth = k * PARENT_FANOUT if self.collapse_parents else k
+        positions = self.metadata_index.candidates(query, depth) if self.metadata_index else None
+        if positions is None:
+            return self._top(self._search(query, depth), k)
+
+        logger.debug(f"Metadata filter: {len(positions)} candidate chunks for '{query[:50]}'")
+        results = self._top(self._search(query, depth, positions), k)
+        if len(results) < k:
+            seen = {parent_key(doc) for doc in results}
+            results += [doc for doc in self._top(self._search(query, depth), k)
+                        if parent_key(doc) not in seen][:k - len(results)]
+        return results
+
+    def _top(self, fused: List[Document], k: int) -> List[Document]:
+        if self.collapse_parents:
+            return collapse_to_parents(fused, self.vectorstore.docstore, k)
+        return fused[:k]
+
+    def _search(self, query: str, k: int, positions: Optional[Set[int]] = None) -> List[Document]:
+        scale = max(k / self.k, 1.0)
+        rankings = []
+        if self.dense_weight > 0:
+            dense_k = math.ceil(self.dense_k * scale)
+            if positions is None:
+                dense = self.vectorstore.similarity_search(query, k=dense_k)
+            else:
+                dense = filtered_similarity_search(self.vectorstore, query, dense_k, positions)
+            rankings.append((dense, self.dense_weight))
+        if self.lexical_weight > 0:
+            allowed = self.metadata_index.chunk_id_set(positions) if positions is not None else None
+            with span('lexical_search', nested=True):
+                lexical = self.lexical_index.search(query, math.ceil(self.lexical_k * scale), allowed)
+            rankings.append(([doc for doc, _ in lexical], self.lexical_weight))
+        return reciprocal_rank_fusion(rankings, k, self.rrf_k)
+
+    def _get_relevant_documents(self, query: str, *,
+                                run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.search(query)
+
+
+class PrecomputedRetriever(BaseRetriever):
+    """
+    Serves stored results for known queries (filled at warmup, e.g. for the
+    suggested questions) and passes every other query to the base retriever
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    base_retriever: BaseRetriever
+    results: Dict[str, List[Document]] = {}
+
+    def precompute(self, queries: Sequence[str]):
+        for query in queries:
+            self.results[query] = self.base_retriever.search(query)
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Document]:
+        if k is None and query in self.results:
+            return list(self.results[query])
+        return self.base_retriever.search(query, k)
+
+    def _get_relevant_documents(self, query: str, *,
+                                run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.search(query)
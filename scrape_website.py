@@ -18,6 +18,9 @@ from urllib.robotparser import RobotFileParser
 from collections import deque
 from typing import List, Dict, Set, Tuple
 
+from raw_archive import RawArchive
+from vocabulary import INDUSTRIES, INDUSTRY_KEYWORDS, SERVICES, TECH_KEYWORDS, TECHNOLOGIES, VocabularySet
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,291 +33,9 @@ logger = logging.getLogger(__name__)
 class AdvancedShuruTechScraper:
     """Advanced scraper with intelligent extraction capabilities"""
 
-    # Comprehensive technology keywords for detection
-    # Organized by category for better maintainability
-    TECH_KEYWORDS = {
-        'frontend': [
-            # Core frameworks
-            'React', 'React.js', 'Angular', 'Vue', 'Vue.js', 'Svelte', 'Ember.js',
-            # Meta frameworks
-            'Next.js', 'Nuxt.js', 'Gatsby', 'Remix',
-            # Languages
-            'JavaScript', 'TypeScript', 'HTML5', 'CSS3', 'SASS', 'SCSS', 'LESS',
-            # UI Libraries & Tools
-            'Tailwind', 'TailwindCSS', 'Bootstrap', 'Material-UI', 'Ant Design',
-            'Chakra UI', 'Shadcn', 'Redux', 'MobX', 'Zustand', 'Webpack', 'Vite', 'Babel'
-        ],
-        'backend': [
-            # Node.js ecosystem
-            'Node.js', 'Express', 'Express.js', 'Nest.js', 'Fastify', 'Koa',
-            # Python
-            'Python', 'Django', 'Flask', 'FastAPI', 'Pyramid', 'Tornado',
-            # Java
-            'Java', 'Spring', 'Spring Boot', 'Spring Cloud', 'Hibernate', 'Quarkus',
-            # Ruby
-            'Ruby', 'Rails', 'Ruby on Rails', 'Sinatra',
-            # Go
-            'Go', 'Golang', 'Gin', 'Echo',
-            # PHP
-            'PHP', 'Laravel', 'Symfony', 'CodeIgniter', 'Yii',
-            # .NET
-            '.NET', 'ASP.NET', 'C#', '.NET Core',
-            # Other
-            'Rust', 'Elixir', 'Phoenix', 'Scala', 'Play Framework'
-        ],
-        'mobile': [
-            # Cross-platform
-            'React Native', 'Flutter', 'Ionic', 'Cordova', 'Xamarin', 'Capacitor',
-            # iOS
-            'iOS', 'Swift', 'SwiftUI', 'Objective-C', 'Xcode',
-            # Android
-            'Android', 'Kotlin', 'Java Android', 'Jetpack Compose', 'Android Studio'
-        ],
-        'database': [
-            # SQL Databases
-            'PostgreSQL', 'MySQL', 'MariaDB', 'SQL Server', 'Oracle', 'SQLite',
-            # NoSQL Databases
-            'MongoDB', 'Cassandra', 'CouchDB', 'Neo4j', 'ArangoDB',
-            # In-Memory & Cache
-            'Redis', 'Memcached', 'Hazelcast',
-            # Search & Analytics
-            'Elasticsearch', 'Solr', 'Algolia',
-            # Cloud Databases
-            'DynamoDB', 'Firebase', 'Firestore', 'Supabase', 'PlanetScale',
-            # General
-            'SQL', 'NoSQL'
-        ],
-        'cloud': [
-            # Major Cloud Providers
-            'AWS', 'Amazon Web Services', 'Azure', 'Microsoft Azure',
-            'Google Cloud', 'GCP', 'Google Cloud Platform',
-            # Cloud Services
-            'AWS Lambda', 'AWS EC2', 'AWS S3', 'AWS RDS',
-            'Azure Functions', 'Azure DevOps',
-            'Google Cloud Functions', 'Google App Engine',
-            # Platform as a Service
-            'Heroku', 'DigitalOcean', 'Vercel', 'Netlify', 'Render',
-            'Railway', 'Fly.io', 'CloudFlare', 'Cloudflare Workers'
-        ],
-        'devops': [
-            # Containers
-            'Docker', 'Podman', 'containerd',
-            # Orchestration
-            'Kubernetes', 'K8s', 'Docker Swarm', 'Nomad', 'OpenShift',
-            # CI/CD Tools
-            'Jenkins', 'GitLab CI', 'GitLab CI/CD', 'GitHub Actions',
-            'CircleCI', 'Travis CI', 'Azure Pipelines', 'Bamboo',
-            'TeamCity', 'ArgoCD', 'Flux',
-            # Infrastructure as Code
-            'Terraform', 'Ansible', 'Puppet', 'Chef', 'CloudFormation',
-            'Pulumi', 'Vagrant',
-            # Monitoring & Logging
-            'Prometheus', 'Grafana', 'ELK Stack', 'Datadog', 'New Relic',
-            'Splunk', 'Sentry'
-        ],
-        'cicd': [
-            # CI/CD Concepts & Tools
-            'CI/CD', 'Continuous Integration', 'Continuous Deployment',
-            'Continuous Delivery', 'Jenkins', 'GitHub Actions', 'GitLab CI',
-            'CircleCI', 'Travis CI', 'Bamboo', 'TeamCity', 'Azure DevOps',
-            'Bitbucket Pipelines', 'Drone', 'Spinnaker'
-        ],
-        'ai_ml': [
-            # Machine Learning
-            'Machine Learning', 'ML', 'AI', 'Artificial Intelligence',
-            'Deep Learning', 'Neural Network', 'Neural Networks',
-            # Frameworks
-            'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'XGBoost',
-            'LightGBM', 'Caffe', 'MXNet', 'ONNX',
-            # NLP
-            'NLP', 'Natural Language Processing', 'BERT', 'GPT', 'Transformer',
-            'spaCy', 'NLTK', 'Hugging Face',
-            # Computer Vision
-            'Computer Vision', 'OpenCV', 'YOLO', 'CNN',
-            # Other
-            'Jupyter', 'Pandas', 'NumPy', 'SciPy'
-        ],
-        'architecture': [
-            # API Architectures
-            'REST', 'REST API', 'RESTful', 'GraphQL', 'gRPC', 'SOAP',
-            # Architectural Patterns
-            'Microservices', 'Monolith', 'Serverless', 'Event-Driven',
-            'Service-Oriented Architecture', 'SOA',
-            # Communication
-            'WebSocket', 'Server-Sent Events', 'SSE', 'Message Queue',
-            'Apache Kafka', 'RabbitMQ', 'ActiveMQ', 'MQTT', 'ZeroMQ',
-            # Design Patterns
-            'Event Sourcing', 'CQRS', 'Saga Pattern', 'API Gateway'
-        ],
-        'testing': [
-            # Testing Frameworks
-            'Jest', 'Mocha', 'Chai', 'Jasmine', 'Pytest', 'JUnit', 'TestNG',
-            'RSpec', 'Cucumber', 'Selenium', 'Cypress', 'Playwright',
-            'Puppeteer', 'Testing Library', 'Vitest'
-        ],
-        'other': [
-            # Version Control
-            'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN',
-            # Blockchain
-            'Blockchain', 'Ethereum', 'Solidity', 'Web3',
-            # CMS
-            'WordPress', 'Drupal', 'Contentful', 'Strapi', 'Sanity',
-            # Real-time
-            'Socket.io', 'WebRTC',
-            # API Tools
-            'Postman', 'Swagger', 'OpenAPI'
-        ]
-    }
-
-    # Comprehensive industry keywords for classification
-    # Each industry mapped to relevant keywords for robust detection
-    INDUSTRY_KEYWORDS = {
-        'E-commerce': [
-            'ecommerce', 'e-commerce', 'online store', 'online shop', 'retail', 'shopping',
-            'cart', 'checkout', 'marketplace', 'b2c', 'online retail', 'webshop',
-            'product catalog', 'storefront', 'shopify', 'woocommerce', 'magento'
-        ],
-        'FinTech': [
-            'fintech', 'finance', 'financial', 'banking', 'payment', 'payments',
-            'financial services', 'cryptocurrency', 'crypto', 'blockchain finance',
-            'wealth management', 'trading', 'stock', 'investment', 'lending',
-            'digital wallet', 'mobile banking', 'neobank', 'payment gateway',
-            'remittance', 'forex', 'peer-to-peer lending', 'robo-advisor'
-        ],
-        'Healthcare': [
-            'healthcare', 'health', 'medical', 'hospital', 'patient', 'clinic',
-            'telemedicine', 'healthtech', 'pharmaceutical', 'clinical', 'doctor',
-            'nurse', 'diagnosis', 'treatment', 'therapy', 'medicine', 'pharmacy',
-            'electronic health record', 'ehr', 'emr', 'telehealth', 'wellness',
-            'mental health', 'healthcare provider', 'medical device'
-        ],
-        'SaaS': [
-            'saas', 'software as a service', 'cloud software', 'subscription',
-            'b2b software', 'enterprise software', 'cloud-based', 'subscription model',
-            'software platform', 'api service', 'hosted solution', 'paas',
-            'platform as a service', 'multi-tenant'
-        ],
-        'AgriTech': [
-            'agritech', 'agriculture', 'farming', 'agri', 'crop', 'crops',
-            'agricultural', 'farm', 'precision agriculture', 'agtech',
-            'livestock', 'harvest', 'irrigation', 'soil', 'farmer',
-            'agricultural technology', 'farm management', 'vertical farming'
-        ],
-        'Logistics': [
-            'logistics', 'supply chain', 'shipping', 'delivery', 'warehouse',
-            'transportation', 'freight', 'fleet', 'distribution', 'courier',
-            'last mile', 'fulfillment', 'logistics management', 'cargo',
-            'dispatch', 'route optimization', 'inventory management',
-            'supply chain management', 'third-party logistics', '3pl'
-        ],
-        'Real Estate': [
-            'real estate', 'property', 'housing', 'proptech', 'realty',
-            'real estate tech', 'rental', 'lease', 'landlord', 'tenant',
-            'commercial property', 'residential property', 'real estate management',
-            'property management', 'real estate platform', 'home buying', 'home selling'
-        ],
-        'Media & Entertainment': [
-            'media', 'streaming', 'content', 'video', 'entertainment',
-            'music', 'gaming', 'games', 'movie', 'film', 'television', 'tv',
-            'broadcast', 'publishing', 'digital media', 'content creation',
-            'video streaming', 'music streaming', 'ott', 'over-the-top',
-            'social media', 'influencer', 'creator economy'
-        ],
-        'Insurance': [
-            'insurance', 'insurtech', 'claims', 'policy', 'policies',
-            'underwriting', 'insurer', 'insurance company', 'life insurance',
-            'health insurance', 'auto insurance', 'property insurance',
-            'insurance platform', 'insurance technology', 'reinsurance',
-            'actuarial', 'risk assessment'
-        ],
-        'Retail': [
-            'retail', 'store', 'stores', 'merchandise', 'pos', 'point of sale',
-            'brick and mortar', 'retail chain', 'department store', 'boutique',
-            'retail technology', 'retail management', 'retail analytics',
-            'omnichannel', 'in-store', 'retail operations'
-        ],
-        'Education': [
-            'education', 'edtech', 'learning', 'school', 'university', 'college',
-            'e-learning', 'lms', 'learning management system', 'training',
-            'online learning', 'online education', 'student', 'teacher',
-            'educational technology', 'course', 'classroom', 'curriculum',
-            'tutoring', 'mooc', 'educational platform'
-        ],
-        'Travel & Hospitality': [
-            'travel', 'hospitality', 'hotel', 'tourism', 'booking', 'reservation',
-            'restaurant', 'accommodation', 'vacation', 'trip', 'flight',
-            'airline', 'travel booking', 'travel agency', 'hotel booking',
-            'food service', 'hospitality industry', 'guest', 'lodging'
-        ],
-        'Manufacturing': [
-            'manufacturing', 'industry 4.0', 'production', 'factory', 'factories',
-            'supply chain', 'assembly', 'industrial', 'plant', 'manufacturing process',
-            'quality control', 'automation', 'production line', 'manufacturer',
-            'industrial automation', 'smart manufacturing'
-        ],
-        'Energy': [
-            'energy', 'renewable', 'renewable energy', 'solar', 'wind', 'utilities',
-            'power', 'electricity', 'oil', 'gas', 'petroleum', 'energy sector',
-            'clean energy', 'green energy', 'energy management', 'power generation',
-            'energy efficiency', 'grid', 'utility company'
-        ],
-        'Automotive': [
-            'automotive', 'automobile', 'car', 'vehicle', 'auto', 'mobility',
-            'electric vehicle', 'ev', 'autonomous vehicle', 'self-driving',
-            'automotive industry', 'car manufacturer', 'ride-sharing',
-            'car rental', 'automotive technology'
-        ],
-        'Telecommunications': [
-            'telecommunications', 'telecom', 'telco', '5g', '4g', 'network',
-            'mobile network', 'internet service provider', 'isp', 'connectivity',
-            'broadband', 'fiber optic', 'wireless', 'cellular'
-        ],
-        'Food & Beverage': [
-            'food', 'beverage', 'restaurant', 'food delivery', 'food service',
-            'catering', 'dining', 'food tech', 'foodtech', 'meal',
-            'food industry', 'culinary', 'recipe', 'cooking', 'food ordering'
-        ],
-        'Gaming': [
-            'gaming', 'game', 'games', 'video game', 'esports', 'e-sports',
-            'game development', 'game studio', 'mobile gaming', 'pc gaming',
-            'console gaming', 'game publisher', 'indie game', 'multiplayer'
-        ],
-        'Fashion & Apparel': [
-            'fashion', 'apparel', 'clothing', 'garment', 'textile', 'fashion tech',
-            'fashion industry', 'fashion retail', 'fashion ecommerce', 'style',
-            'wardrobe', 'fashion platform', 'online fashion'
-        ],
-        'Construction': [
-            'construction', 'building', 'infrastructure', 'contractor', 'architecture',
-            'construction industry', 'construction management', 'construction technology',
-            'construction project', 'civil engineering', 'building materials'
-        ],
-        'Legal Tech': [
-            'legal tech', 'legaltech', 'legal', 'law', 'lawyer', 'attorney',
-            'legal services', 'legal technology', 'legal platform', 'litigation',
-            'compliance', 'contract management', 'legal software'
-        ],
-        'HR Tech': [
-            'hr tech', 'hrtech', 'human resources', 'hr', 'recruitment', 'hiring',
-            'talent', 'talent management', 'employee', 'workforce', 'payroll',
-            'hr management', 'hr platform', 'applicant tracking', 'onboarding'
-        ],
-        'Cybersecurity': [
-            'cybersecurity', 'cyber security', 'security', 'infosec', 'information security',
-            'data security', 'network security', 'threat detection', 'firewall',
-            'encryption', 'security platform', 'vulnerability', 'penetration testing'
-        ],
-        'Government': [
-            'government', 'public sector', 'civic tech', 'govtech', 'municipal',
-            'federal', 'state government', 'public administration', 'civic',
-            'government services', 'e-government'
-        ],
-        'Non-profit': [
-            'non-profit', 'nonprofit', 'ngo', 'charity', 'charitable', 'foundation',
-            'social impact', 'social good', 'philanthropic', 'humanitarian',
-            'non-governmental organization'
-        ]
-    }
+    # Keyword vocabularies live in vocabulary.py (shared with the merger)
+    TECH_KEYWORDS = TECH_KEYWORDS
+    INDUSTRY_KEYWORDS = INDUSTRY_KEYWORDS
 
     # NLP patterns for case study extraction
     PROBLEM_PATTERNS = [
@@ -341,17 +62,23 @@ class AdvancedShuruTechScraper:
                          'service', 'solution', 'story', 'testimonial', 'insights', 
                          'blog', 'case-study']
 
-    # Priority seed URLs to scrape first
-    PRIORITY_SEED_URLS = [
-        'https://www.shurutech.com/work',
-        'https://www.shurutech.com/insights',
-        'https://www.shurutech.com/insights?category=Case+Study'
+    # Priority seed paths to scrape first (resolved against base_url)
+    PRIORITY_SEED_PATHS = [
+        '/work',
+        '/insights',
+        '/insights?category=Case+Study'
     ]
 
-    def __init__(self, base_url='https://www.shurutech.com/', max_pages=30, max_depth=3):
+    def __init__(self, base_url='https://www.shurutech.com/', max_pages=30, max_depth=3,
+                 archive_dir='raw_archive', request_delay=1.0):
         self.base_url = base_url
         self.max_pages = max_pages
         self.max_depth = max_depth
+        # Politeness delay between requests (seconds); 0 for local fixture runs
+        self.request_delay = request_delay
+        self.priority_seed_urls = [urljoin(base_url, path) for path in self.PRIORITY_SEED_PATHS]
+        # Raw HTML of every fetched page, so extraction can be re-run offline
+        self.archive = RawArchive(archive_dir) if archive_dir else None
         self.visited_urls = set()
         self.url_queue = deque([(base_url, 0)])  # (url, depth)
 
@@ -361,12 +88,16 @@ class AdvancedShuruTechScraper:
             "technologies": [],
             "industries": []
         }
+        # Hash-set indexes over the lists above (canonical spellings, O(1) dedup)
+        self.tech_index = VocabularySet(TECHNOLOGIES, self.knowledge_base["technologies"])
+        self.industry_index = VocabularySet(INDUSTRIES, self.knowledge_base["industries"])
+        self.service_keys = set()
 
         self.robot_parser = RobotFileParser()
         self.case_study_id_counter = 1
 
         # Prepend priority seed URLs to queue (they'll be scraped first)
-        for priority_url in reversed(self.PRIORITY_SEED_URLS):
+        for priority_url in reversed(self.priority_seed_urls):
             self.url_queue.appendleft((priority_url, 0))
         
         logger.info("=" * 70)
@@ -374,8 +105,8 @@ class AdvancedShuruTechScraper:
         logger.info(f"Base URL: {base_url}")
         logger.info(f"Max Pages: {max_pages}")
         logger.info(f"Max Depth: {max_depth}")
-        logger.info(f"Priority Seed URLs: {len(self.PRIORITY_SEED_URLS)}")
-        for url in self.PRIORITY_SEED_URLS:
+        logger.info(f"Priority Seed URLs: {len(self.priority_seed_urls)}")
+        for url in self.priority_seed_urls:
             logger.info(f"  - {url}")
         logger.info("=" * 70)
 
@@ -454,7 +185,7 @@ class AdvancedShuruTechScraper:
         return results
 
     def detect_technologies(self, text: str) -> List[str]:
-        """Detect technologies mentioned in text"""
+        """Detect technologies mentioned in text (canonical spellings, so React.js -> React)"""
         detected = set()
         text_lower = text.lower()
 
@@ -463,7 +194,7 @@ class AdvancedShuruTechScraper:
                 # Use word boundaries for more accurate matching
                 pattern = r'\b' + re.escape(tech.lower()) + r'\b'
                 if re.search(pattern, text_lower):
-                    detected.add(tech)
+                    detected.add(TECHNOLOGIES.canonical(tech))
 
         return sorted(list(detected))
 
@@ -830,78 +561,100 @@ class AdvancedShuruTechScraper:
                 logger.warning(f"⚠️  Skipping {url}: No content returned")
                 return
 
-            # Parse with BeautifulSoup
-            try:
-                soup = BeautifulSoup(html_content, 'html.parser')
-            except Exception as e:
-                logger.error(f"❌ Failed to parse HTML for {url}: {str(e)}")
+            if self.archive:
+                self.archive.put(url, html_content, source='website_scraper')
+
+            soup = self.process_html(url, html_content)
+            if soup is None:
                 return
 
-            # Count text blocks
-            all_blocks = soup.find_all(['article', 'section', 'div'], class_=True)
-            logger.info(f"   Found {len(all_blocks)} text blocks")
+            # Find and queue internal links (if not at max depth)
+            if depth < self.max_depth and len(self.visited_urls) < self.max_pages:
+                try:
+                    self.discover_links(soup, url, depth)
+                except Exception as e:
+                    logger.error(f"❌ Error discovering links from {url}: {str(e)}")
 
-            # Extract all data types with error handling
-            case_studies = []
-            services = []
+        except Exception as e:
+            logger.error(f"❌ Unexpected error scraping {url}: {type(e).__name__} - {str(e)}")
 
-            try:
-                case_studies = self.extract_case_studies_advanced(soup, url)
-            except Exception as e:
-                logger.error(f"❌ Error extracting case studies from {url}: {str(e)}")
+        finally:
+            # Be respectful - delay between requests
+            if self.request_delay:
+                time.sleep(self.request_delay)
 
-            try:
-                services = self.extract_services_from_page(soup, url)
-            except Exception as e:
-                logger.error(f"❌ Error extracting services from {url}: {str(e)}")
+    def process_html(self, url: str, html_content: str):
+        """
+        Extract case studies, services, technologies and industries from a
+        page's HTML and add them to the knowledge base
 
-            # Log extracted case studies with titles
-            for cs in case_studies:
-                logger.info(f"   ✓ Extracted case study: {cs.get('client_name', 'Unknown')}")
+        Used for live pages and for offline re-extraction from the archive.
 
-            # Log extracted services count
-            if services:
-                logger.info(f"   ✓ Extracted {len(services)} services")
+        Returns:
+            Parsed BeautifulSoup document, or None if the HTML could not be parsed
+        """
+        # Parse with BeautifulSoup
+        try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+        except Exception as e:
+            logger.error(f"❌ Failed to parse HTML for {url}: {str(e)}")
+            return None
 
-            # Get page text for technology and industry detection
-            try:
-                page_text = soup.get_text(separator=' ', strip=True)
-                technologies = self.detect_technologies(page_text)
-                industries = self.detect_industries(page_text)
-            except Exception as e:
-                logger.error(f"❌ Error detecting technologies/industries from {url}: {str(e)}")
-                technologies = []
-                industries = []
+        # Count text blocks
+        all_blocks = soup.find_all(['article', 'section', 'div'], class_=True)
+        logger.info(f"   Found {len(all_blocks)} text blocks")
 
-            # Add to knowledge base
-            self.knowledge_base["case_studies"].extend(case_studies)
-            self.knowledge_base["services"].extend(services)
+        # Extract all data types with error handling
+        case_studies = []
+        services = []
 
-            # Add unique technologies and industries
-            for tech in technologies:
-                if tech not in self.knowledge_base["technologies"]:
-                    self.knowledge_base["technologies"].append(tech)
+        try:
+            case_studies = self.extract_case_studies_advanced(soup, url)
+        except Exception as e:
+            logger.error(f"❌ Error extracting case studies from {url}: {str(e)}")
 
-            for industry in industries:
-                if industry not in self.knowledge_base["industries"]:
-                    self.knowledge_base["industries"].append(industry)
+        try:
+            services = self.extract_services_from_page(soup, url)
+        except Exception as e:
+            logger.error(f"❌ Error extracting services from {url}: {str(e)}")
 
-            logger.info(f"   📊 Page summary: {len(case_studies)} case studies, {len(services)} services, "
-                       f"{len(technologies)} technologies, {len(industries)} industries")
+        # Log extracted case studies with titles
+        for cs in case_studies:
+            logger.info(f"   ✓ Extracted case study: {cs.get('client_name', 'Unknown')}")
 
-            # Find and queue internal links (if not at max depth)
-            if depth < self.max_depth and len(self.visited_urls) < self.max_pages:
-                try:
-                    self.discover_links(soup, url, depth)
-                except Exception as e:
-                    logger.error(f"❌ Error discovering links from {url}: {str(e)}")
+        # Log extracted services count
+        if services:
+            logger.info(f"   ✓ Extracted {len(services)} services")
 
+        # Get page text for technology and industry detection
+        try:
+            page_text = soup.get_text(separator=' ', strip=True)
+            technologies = self.detect_technologies(page_text)
+            industries = self.detect_industries(page_text)
         except Exception as e:
-            logger.error(f"❌ Unexpected error scraping {url}: {type(e).__name__} - {str(e)}")
+            logger.error(f"❌ Error detecting technologies/industries from {url}: {str(e)}")
+            technologies = []
+            industries = []
 
-        finally:
-            # Be respectful - delay between requests
-            time.sleep(1)
+        # Add to knowledge base
+        self.knowledge_base["case_studies"].extend(case_studies)
+        for service in services:
+            key = SERVICES.key(service.get('name', ''))
+            if key and key not in self.service_keys:
+                self.service_keys.add(key)
+                self.knowledge_base["services"].append(service)
+
+        # Add unique technologies and industries
+        for tech in technologies:
+            self.tech_index.add(tech)
+
+        for industry in industries:
+            self.industry_index.add(industry)
+
+        logger.info(f"   📊 Page summary: {len(case_studies)} case studies, {len(services)} services, "
+                   f"{len(technologies)} technologies, {len(industries)} industries")
+
+        return soup
 
     def is_valid_url(self, url: str) -> bool:
         """Validate URL before adding to queue"""
@@ -1000,6 +753,9 @@ class AdvancedShuruTechScraper:
         formatted_case_studies = self.format_case_studies()
         self.knowledge_base['case_studies'] = formatted_case_studies
 
+        if self.archive:
+            self.archive.save()
+
         # Print summary
         logger.info("\n" + "=" * 70)
         logger.info("✅ Scraping complete!")
@@ -1013,10 +769,36 @@ class AdvancedShuruTechScraper:
 
         return self.knowledge_base
 
+    def reextract_from_archive(self):
+        """Rebuild the knowledge base from archived HTML without touching the network"""
+        logger.info("\n" + "=" * 70)
+        logger.info("♻️  Re-extracting from raw archive (offline)")
+        logger.info("=" * 70)
+
+        if not self.archive or not self.archive.index:
+            logger.error("❌ Raw archive is empty - run a normal scrape first")
+            return self.knowledge_base
+
+        start = time.time()
+        pages = 0
+        for url, html_content in self.archive.iter_pages(source_prefix='website_scraper'):
+            logger.info(f"📄 Re-extracting: {url}")
+            self.visited_urls.add(url)
+            self.process_html(url, html_content)
+            pages += 1
+
+        self.knowledge_base['case_studies'] = self.format_case_studies()
+        logger.info(f"✅ Re-extracted {pages} archived pages in {time.time() - start:.2f}s")
+        return self.knowledge_base
+
     def save_to_json(self, filename='knowledge_base_auto.json'):
         """Save scraped data to JSON file"""
         logger.info(f"Saving data to {filename}...")
 
+        # Persist the raw archive index too, so partial runs stay re-extractable
+        if self.archive:
+            self.archive.save()
+
         try:
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(self.knowledge_base, f, indent=2, ensure_ascii=False)
@@ -1027,14 +809,22 @@ class AdvancedShuruTechScraper:
 
 def main():
     """Main execution function"""
+    import sys
+
     scraper = AdvancedShuruTechScraper(
         base_url='https://www.shurutech.com/',
         max_pages=30,
         max_depth=3
     )
 
+    # "reextract" rebuilds the output from raw_archive/ instead of crawling
+    reextract = len(sys.argv) > 1 and sys.argv[1] == 'reextract'
+
     try:
-        knowledge_base = scraper.scrape()
+        if reextract:
+            knowledge_base = scraper.reextract_from_archive()
+        else:
+            knowledge_base = scraper.scrape()
 
         output_file = 'knowledge_base_auto.json'
         scraper.save_to_json(output_file)
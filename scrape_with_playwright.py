@@ -4,15 +4,27 @@ Handles case studies from Shuru Tech insights pages
 """
 
 import asyncio
+import gzip
 import json
+import os
 import re
 import time
-from typing import List, Dict, Optional
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
+import requests
 from playwright.async_api import async_playwright, Page, Browser
 from bs4 import BeautifulSoup
 
+from case_study_extraction import SectionSegmenter
+from case_study_store import CaseStudyStore, content_hash
+from raw_archive import RawArchive
+from vocabulary import TECHNOLOGIES
+
 
 class PlaywrightScraper:
     """Async scraper using Playwright for JavaScript-rendered content"""
@@ -26,25 +38,358 @@ class PlaywrightScraper:
         'TensorFlow', 'PyTorch', 'Machine Learning', 'AI', 'Microservices', 'Serverless'
     ]
     
-    def __init__(self, headless: bool = True, timeout: int = 60000):
+    # Content-length heuristics shared by the static and rendered tiers
+    MIN_ARTICLE_CHARS = 500   # Below this, keep looking for a better container
+    MIN_CONTENT_CHARS = 200   # Below this, fall back to the meta description
+    
+    # Selectors tried after <article> and <main>
+    CONTENT_SELECTORS = ['.post-content', '.article-content', '.content', '.entry-content']
+    
+    # JSON-LD types that carry a full article body
+    ARTICLE_LD_TYPES = {'Article', 'BlogPosting', 'NewsArticle', 'TechArticle', 'Report'}
+    
+    # Keys in embedded JSON payloads (e.g. __NEXT_DATA__) that may hold the article
+    PAYLOAD_BODY_KEYS = {'articleBody', 'body', 'content', 'html', 'richText', 'text'}
+    PAYLOAD_TITLE_KEYS = {'headline', 'title'}
+    
+    USER_AGENT = 'Mozilla/5.0 (compatible; ShuruTechBot/2.0; +http://www.shurutech.com)'
+    
+    # Sitemap / feed discovery
+    SITE_ROOT = 'https://www.shurutech.com'
+    SITEMAP_PATHS = ['/sitemap.xml']
+    FEED_PATHS = ['/rss.xml', '/feed.xml', '/insights/rss.xml', '/atom.xml']
+    DISCOVERY_STATE_FILE = 'discovery_state.json'
+    
+    # Seconds between page fetches, and how long rendered pages get to run their JS
+    REQUEST_DELAY = 2.0
+    RENDER_WAIT_MS = 5000
+    DISCOVERY_WAIT_MS = 8000
+    
+    def __init__(self, headless: bool = True, timeout: int = 60000, static_first: bool = True,
+                 store_path: Optional[str] = 'case_study_store.json',
+                 archive_dir: Optional[str] = 'raw_archive',
+                 site_root: Optional[str] = None,
+                 request_delay: Optional[float] = None,
+                 render_wait_ms: Optional[int] = None):
         """
         Initialize scraper
         
         Args:
             headless: Run browser in headless mode
             timeout: Page load timeout in milliseconds
+            static_first: Try a plain HTTP fetch before rendering with Playwright
+            store_path: Per-URL store for stable IDs and incremental runs (None disables it)
+            archive_dir: Raw HTML archive shared with scrape_website.py (None disables it)
+            site_root: Site to discover from (default SITE_ROOT; e.g. a local fixture site)
+            request_delay: Seconds between page fetches (default REQUEST_DELAY)
+            render_wait_ms: JS settle time for rendered pages (default RENDER_WAIT_MS;
+                            discovery pages get DISCOVERY_WAIT_MS unless this is set)
         """
         self.headless = headless
         self.timeout = timeout
+        self.static_first = static_first
         self.case_study_counter = 11  # Start from 11 (after existing manual entries)
+        self.store = CaseStudyStore(store_path, first_id=self.case_study_counter) if store_path else None
+        self.segmenter = SectionSegmenter()
+        self.archive = RawArchive(archive_dir) if archive_dir else None
+        self.tier_counts = {}  # fetch tier -> pages served
+        self._playwright = None
+        self._browser = None
+        self.discovered_lastmod = {}  # url -> lastmod from the last sitemap/feed discovery
+        self.sitemap_members = {}  # child sitemap -> case study URLs listed under it
+        self.selected_urls = set()  # URLs the last discovery returned for scraping
+        self.site_root = (site_root or self.SITE_ROOT).rstrip('/')
+        self.request_delay = self.REQUEST_DELAY if request_delay is None else request_delay
+        self.render_wait_ms = self.RENDER_WAIT_MS if render_wait_ms is None else render_wait_ms
+        self.discovery_wait_ms = self.DISCOVERY_WAIT_MS if render_wait_ms is None else render_wait_ms
+    
+    async def _get_browser(self) -> Browser:
+        """Launch Chromium on first use so static-only runs never start a browser"""
+        if self._browser is None:
+            print(f"\nLaunching Chromium browser (headless={self.headless})...")
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        return self._browser
+    
+    async def _close_browser(self):
+        """Close the lazily launched browser, if any"""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+    
+    def _record_tier(self, case_study: Dict, tier: str):
+        """Tag a case study with the fetch tier that served it"""
+        case_study.setdefault('metadata', {})['fetch_tier'] = tier
+        self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+    
+    def _lastmod_for(self, url: str) -> Optional[str]:
+        """lastmod of a URL from the last sitemap/feed discovery, as an ISO string"""
+        lastmod = self.discovered_lastmod.get(url)
+        return lastmod.isoformat() if lastmod else None
+    
+    def _next_id(self, url: str) -> int:
+        """Stable ID from the store, or a running counter when the store is disabled"""
+        if self.store:
+            return self.store.id_for(url)
+        case_study_id = self.case_study_counter
+        self.case_study_counter += 1
+        return case_study_id
+    
+    def build_case_study(self, title: str, content: str, url: str,
+                         description: Optional[str], tier: str) -> Dict:
+        """
+        Turn extracted article text into a case study, reusing the stored
+        extraction when the content hash has not changed since the last run
+        
+        Args:
+            title: Article title
+            content: Article content text
+            url: Page URL
+            description: Meta description
+            tier: Fetch tier that produced the content
+            
+        Returns:
+            Case study dict
+        """
+        digest = content_hash(content)
+        
+        if self.store:
+            cached = self.store.cached(url, digest)
+            if cached:
+                print("✓ Content unchanged since last run, reusing stored extraction")
+                self.store.touch(url, self._lastmod_for(url))
+                self._record_tier(cached, tier)
+                return cached
+        
+        case_study = self.parse_case_study_content(
+            title=title,
+            content=content,
+            url=url,
+            description=description
+        )
+        self._record_tier(case_study, tier)
+        
+        if self.store:
+            # Keep the raw article text so extraction can be re-run offline
+            article = {"title": title, "description": description, "content": content}
+            self.store.put(url, digest, case_study, self._lastmod_for(url), article=article)
+        
+        return case_study
+    
+    def fetch_static(self, url: str) -> Optional[str]:
+        """
+        Fetch server-rendered HTML with a plain HTTP request
+        
+        Args:
+            url: Page URL
+            
+        Returns:
+            HTML string or None if the request failed
+        """
+        try:
+            response = requests.get(
+                url,
+                headers={'User-Agent': self.USER_AGENT},
+                timeout=self.timeout / 1000
+            )
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  Static fetch failed: {str(e)}")
+            return None
+    
+    async def scrape_static(self, url: str) -> Optional[Dict]:
+        """
+        Static tier: plain HTTP fetch plus embedded-data / HTML extraction
+        
+        Args:
+            url: Case study URL
+            
+        Returns:
+            Case study dict, or None if the page needs a browser render
+        """
+        print("Trying static fetch...")
+        html_content = await asyncio.to_thread(self.fetch_static, url)
+        if not html_content:
+            return None
+        
+        if self.archive:
+            self.archive.put(url, html_content, source='playwright:static')
+        
+        return self.extract_static_content(html_content, url)
+    
+    def extract_static_content(self, html_content: str, url: str) -> Optional[Dict]:
+        """
+        Extract case study content from server-rendered HTML without a browser
+        
+        Applies the same length heuristics as extract_article_content and
+        returns None when they are not met, so the caller can escalate to
+        Playwright.
+        
+        Args:
+            html_content: Raw HTML
+            url: Page URL
+            
+        Returns:
+            Case study dict (with metadata.fetch_tier set) or None
+        """
+        article = self.article_from_html(html_content)
+        
+        if len(article['content']) < self.MIN_ARTICLE_CHARS:
+            print(f"⚠️  Static HTML too thin ({len(article['content'])} chars)")
+            return None
+        
+        print(f"✓ Extracted from {article['source']}: {len(article['content'])} chars")
+        return self.build_case_study(article['title'], article['content'], url,
+                                     article['description'], article['source'])
+    
+    def article_from_html(self, html_content: str) -> Dict:
+        """
+        Locate the article in an HTML document
+        
+        Tries embedded structured data first (JSON-LD, __NEXT_DATA__), then the
+        <article>/<main>/content containers in the same order as the rendered
+        path. Works on both server-rendered and archived rendered HTML.
+        
+        Args:
+            html_content: Raw HTML
+            
+        Returns:
+            Dict with title, description, content (may be short) and source
+        """
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        title = None
+        h1 = soup.find('h1')
+        if h1:
+            title = h1.get_text(strip=True)
+        if not title:
+            title_tag = soup.find('title')
+            if title_tag:
+                title = title_tag.get_text(strip=True)
+        if not title:
+            title_meta = soup.find('meta', {'property': 'og:title'})
+            if title_meta:
+                title = title_meta.get('content')
+        
+        description = None
+        desc_meta = soup.find('meta', {'name': 'description'})
+        if desc_meta:
+            description = desc_meta.get('content')
+        
+        # Structured data embedded in the page
+        for source, extractor in (('static:json-ld', self.extract_json_ld),
+                                  ('static:next-data', self.extract_next_data)):
+            payload_title, payload_text = extractor(soup)
+            if payload_text and len(payload_text) >= self.MIN_ARTICLE_CHARS:
+                return {"title": title or payload_title, "description": description,
+                        "content": payload_text, "source": source}
+        
+        # HTML containers, same order as the rendered path
+        article_text = ""
+        article = soup.find('article')
+        if article:
+            article_text = article.get_text(separator='\n', strip=True)
+        
+        if len(article_text) < self.MIN_ARTICLE_CHARS:
+            main = soup.find('main')
+            if main:
+                main_text = main.get_text(separator='\n', strip=True)
+                if len(main_text) > len(article_text):
+                    article_text = main_text
+        
+        if len(article_text) < self.MIN_ARTICLE_CHARS:
+            for selector in self.CONTENT_SELECTORS:
+                elem = soup.select_one(selector)
+                if elem:
+                    text = elem.get_text(separator='\n', strip=True)
+                    if len(text) > len(article_text):
+                        article_text = text
+                        break
+        
+        return {"title": title, "description": description,
+                "content": article_text, "source": 'static:html'}
+    
+    def extract_json_ld(self, soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
+        """Return (headline, articleBody) from JSON-LD Article blocks, if present"""
+        for script in soup.find_all('script', {'type': 'application/ld+json'}):
+            try:
+                data = json.loads(script.string or '')
+            except (json.JSONDecodeError, TypeError):
+                continue
+            
+            # JSON-LD may be a single node, a list, or an @graph container
+            if isinstance(data, dict):
+                nodes = data.get('@graph', [data])
+            elif isinstance(data, list):
+                nodes = data
+            else:
+                continue
+            for node in nodes:
+                if not isinstance(node, dict):
+                    continue
+                node_type = node.get('@type')
+                types = node_type if isinstance(node_type, list) else [node_type]
+                if self.ARTICLE_LD_TYPES.intersection(t for t in types if isinstance(t, str)):
+                    body = node.get('articleBody')
+                    if body:
+                        return node.get('headline'), self._html_to_text(body)
+        
+        return None, None
+    
+    def extract_next_data(self, soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
+        """Return (title, body) from a Next.js __NEXT_DATA__ payload, if present"""
+        script = soup.find('script', {'id': '__NEXT_DATA__'})
+        if not script or not script.string:
+            return None, None
+        
+        try:
+            data = json.loads(script.string)
+        except json.JSONDecodeError:
+            return None, None
+        
+        page_props = data.get('props', {}).get('pageProps', data)
+        titles = []
+        bodies = []
+        self._collect_payload_strings(page_props, titles, bodies)
+        
+        if not bodies:
+            return None, None
+        
+        # The article body is the longest body-like string in the payload
+        body = max(bodies, key=len)
+        return (titles[0] if titles else None), self._html_to_text(body)
     
-    async def scrape_case_study_url(self, url: str, browser: Browser) -> Optional[Dict]:
+    def _collect_payload_strings(self, node, titles: List[str], bodies: List[str]):
+        """Walk a JSON payload collecting title-like and body-like string fields"""
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, str):
+                    if key in self.PAYLOAD_BODY_KEYS:
+                        bodies.append(value)
+                    elif key in self.PAYLOAD_TITLE_KEYS:
+                        titles.append(value)
+                else:
+                    self._collect_payload_strings(value, titles, bodies)
+        elif isinstance(node, list):
+            for item in node:
+                self._collect_payload_strings(item, titles, bodies)
+    
+    def _html_to_text(self, value: str) -> str:
+        """Convert an HTML fragment (or plain text) to newline-separated text"""
+        if '<' not in value:
+            return value.strip()
+        return BeautifulSoup(value, 'html.parser').get_text(separator='\n', strip=True)
+    
+    async def scrape_case_study_url(self, url: str, browser: Optional[Browser] = None) -> Optional[Dict]:
         """
         Scrape a single case study URL
         
+        Tries the static tier first (when enabled) and only renders the page
+        with Playwright if static extraction does not meet the content heuristics.
+        
         Args:
             url: Case study URL
-            browser: Playwright browser instance
+            browser: Playwright browser instance (launched lazily if omitted)
             
         Returns:
             Case study dict or None if failed
@@ -53,7 +398,25 @@ class PlaywrightScraper:
         print(f"Scraping: {url}")
         print('='*70)
         
+        # Skip the fetch entirely when the sitemap says the page has not changed
+        lastmod = self._lastmod_for(url)
+        if self.store and self.store.is_fresh(url, lastmod):
+            print("✓ lastmod unchanged since last run, skipping fetch")
+            self.store.stats["skipped"] += 1
+            return self.store.get(url)
+        
+        if self.static_first:
+            case_study = await self.scrape_static(url)
+            if case_study:
+                print(f"✓ Successfully extracted ({case_study['metadata']['fetch_tier']}): "
+                      f"{case_study.get('client_name', 'Unknown')}")
+                return case_study
+            print("↪ Escalating to Playwright rendering...")
+        
         try:
+            if browser is None:
+                browser = await self._get_browser()
+            
             # Create new page
             page = await browser.new_page()
             
@@ -66,7 +429,7 @@ class PlaywrightScraper:
             
             # Wait for article content to load
             print("Waiting for content to render...")
-            await page.wait_for_timeout(5000)  # Wait 5 seconds for JS to render
+            await page.wait_for_timeout(self.render_wait_ms)  # Give JS time to render
             
             # Try to wait for article tag
             try:
@@ -76,6 +439,8 @@ class PlaywrightScraper:
             
             # Get page content
             content = await page.content()
+            if self.archive:
+                self.archive.put(url, content, source='playwright:rendered')
             
             # Extract data
             case_study = await self.extract_article_content(page, content, url)
@@ -83,7 +448,7 @@ class PlaywrightScraper:
             await page.close()
             
             if case_study:
-                print(f"✓ Successfully extracted: {case_study.get('client_name', 'Unknown')}")
+                print(f"✓ Successfully extracted (playwright): {case_study.get('client_name', 'Unknown')}")
                 return case_study
             else:
                 print("❌ Failed to extract case study data")
@@ -141,7 +506,7 @@ class PlaywrightScraper:
             print(f"✓ Extracted from <article>: {len(article_text)} chars")
         
         # Method 2: Try main tag
-        if not article_text or len(article_text) < 500:
+        if not article_text or len(article_text) < self.MIN_ARTICLE_CHARS:
             main = await page.query_selector('main')
             if main:
                 main_text = await main.inner_text()
@@ -150,9 +515,8 @@ class PlaywrightScraper:
                     print(f"✓ Extracted from <main>: {len(article_text)} chars")
         
         # Method 3: Try common content selectors
-        if not article_text or len(article_text) < 500:
-            selectors = ['.post-content', '.article-content', '.content', '.entry-content']
-            for selector in selectors:
+        if not article_text or len(article_text) < self.MIN_ARTICLE_CHARS:
+            for selector in self.CONTENT_SELECTORS:
                 elem = await page.query_selector(selector)
                 if elem:
                     text = await elem.inner_text()
@@ -162,7 +526,7 @@ class PlaywrightScraper:
                         break
         
         # Fall back to description if no article text
-        if not article_text or len(article_text) < 200:
+        if not article_text or len(article_text) < self.MIN_CONTENT_CHARS:
             if description:
                 article_text = description
                 print(f"⚠️  Using description as fallback: {len(article_text)} chars")
@@ -172,14 +536,7 @@ class PlaywrightScraper:
             return None
         
         # Parse content to extract structured data
-        case_study_data = self.parse_case_study_content(
-            title=title,
-            content=article_text,
-            url=url,
-            description=description
-        )
-        
-        return case_study_data
+        return self.build_case_study(title, article_text, url, description, 'playwright')
     
     def parse_case_study_content(self, title: str, content: str, url: str, description: str = None) -> Dict:
         """
@@ -203,35 +560,15 @@ class PlaywrightScraper:
         # Detect technologies
         technologies = self.detect_technologies(content)
         
-        # Extract problem/challenge
-        problem = self.extract_section(content, [
-            'challenge', 'problem', 'issue', 'pain point', 'struggle', 
-            'difficulty', 'before', 'situation'
-        ])
-        
-        # Extract solution
-        solution = self.extract_section(content, [
-            'solution', 'approach', 'implemented', 'built', 'developed',
-            'created', 'how we', 'what we did'
-        ])
-        
-        # Extract results
-        results = self.extract_section(content, [
-            'result', 'outcome', 'impact', 'achievement', 'success',
-            'improvement', 'growth', 'increase', 'reduction'
-        ])
-        
-        # Extract metrics if available
-        metrics = self.extract_metrics(content)
-        if metrics:
-            if results and 'Not specified' not in results:
-                results = f"{results} {metrics}"
-            else:
-                results = metrics
+        # Extract problem/solution/results (metrics folded in) from one tagged pass
+        sections = self.segmenter.extract(content)
+        problem = sections['problem']
+        solution = sections['solution']
+        results = sections['results']
         
         # Create case study object
         case_study = {
-            "id": self.case_study_counter,
+            "id": self._next_id(url),
             "client_name": client_name,
             "industry": industry,
             "problem": problem if problem else (description or "Not specified"),
@@ -247,7 +584,6 @@ class PlaywrightScraper:
             }
         }
         
-        self.case_study_counter += 1
         return case_study
     
     def extract_client_name(self, title: str, url: str) -> str:
@@ -338,14 +674,14 @@ class PlaywrightScraper:
         return "Technology"
     
     def detect_technologies(self, content: str) -> List[str]:
-        """Detect technologies mentioned in content"""
+        """Detect technologies mentioned in content (canonical spellings from vocabulary.py)"""
         detected = set()
         content_lower = content.lower()
         
         for tech in self.TECH_KEYWORDS:
             pattern = r'\b' + re.escape(tech.lower()) + r'\b'
             if re.search(pattern, content_lower):
-                detected.add(tech)
+                detected.add(TECHNOLOGIES.canonical(tech))
         
         return sorted(list(detected))
     
@@ -360,53 +696,12 @@ class PlaywrightScraper:
         Returns:
             Extracted section or None
         """
-        content_lower = content.lower()
-        lines = content.split('\n')
-        
-        # Find lines containing keywords
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in keywords):
-                # Extract next few lines (paragraph)
-                start = i
-                end = min(i + 10, len(lines))
-                section_lines = []
-                
-                for j in range(start, end):
-                    text = lines[j].strip()
-                    if text and len(text) > 20:
-                        section_lines.append(text)
-                    if len(' '.join(section_lines)) > 300:
-                        break
-                
-                if section_lines:
-                    section = ' '.join(section_lines)
-                    # Clean up
-                    section = re.sub(r'\s+', ' ', section)
-                    return section[:500]  # Limit length
-        
-        return None
+        segmenter = SectionSegmenter({'custom': keywords})
+        return segmenter.section(segmenter.tag(content), 'custom')
     
     def extract_metrics(self, content: str) -> Optional[str]:
         """Extract numerical metrics from content"""
-        metrics = []
-        
-        # Look for percentages
-        percent_matches = re.findall(r'\d+%\s+(?:increase|improvement|growth|reduction|decrease)', content, re.IGNORECASE)
-        metrics.extend(percent_matches[:3])
-        
-        # Look for X times/x growth
-        times_matches = re.findall(r'\d+x\s+(?:growth|increase|faster)', content, re.IGNORECASE)
-        metrics.extend(times_matches[:2])
-        
-        # Look for revenue/cost figures
-        money_matches = re.findall(r'[\$€£]\d+(?:K|M|B)?', content)
-        metrics.extend(money_matches[:2])
-        
-        if metrics:
-            return ', '.join(metrics)
-        
-        return None
+        return self.segmenter.metrics(self.segmenter.tag(content))
     
     async def discover_case_study_urls(self, browser: Browser) -> List[str]:
         """
@@ -419,9 +714,9 @@ class PlaywrightScraper:
             List of discovered case study URLs
         """
         discovery_urls = [
-            "https://www.shurutech.com/work",
-            "https://www.shurutech.com/insights",
-            "https://www.shurutech.com/insights?category=Case+Study"
+            f"{self.site_root}/work",
+            f"{self.site_root}/insights",
+            f"{self.site_root}/insights?category=Case+Study"
         ]
         
         discovered_urls = set()
@@ -437,7 +732,7 @@ class PlaywrightScraper:
                 
                 # Wait longer for dynamic content to load
                 print("Waiting for content to render...")
-                await page.wait_for_timeout(8000)  # 8 seconds for portfolio to load
+                await page.wait_for_timeout(self.discovery_wait_ms)  # Portfolio loads slowly
                 
                 # Try multiple selectors for case study links
                 selectors = [
@@ -455,7 +750,7 @@ class PlaywrightScraper:
                         if href and '/case-study/' in href:
                             # Make absolute URL
                             if href.startswith('/'):
-                                href = f"https://www.shurutech.com{href}"
+                                href = f"{self.site_root}{href}"
                             discovered_urls.add(href)
                 
                 # Also check for all links that might contain case study references
@@ -464,7 +759,7 @@ class PlaywrightScraper:
                     href = await link.get_attribute('href')
                     if href and 'case-study' in href.lower():
                         if href.startswith('/'):
-                            href = f"https://www.shurutech.com{href}"
+                            href = f"{self.site_root}{href}"
                         discovered_urls.add(href)
                 
                 await page.close()
@@ -474,10 +769,7 @@ class PlaywrightScraper:
                 print(f"❌ Error discovering from {url}: {e}")
         
         # Filter out any non-case-study URLs
-        case_study_urls = [
-            url for url in discovered_urls 
-            if '/insights/case-study/' in url or '/work/case-study/' in url
-        ]
+        case_study_urls = [url for url in discovered_urls if self.is_case_study_url(url)]
         
         print(f"\n{'='*70}")
         print(f"✅ Discovery complete! Found {len(case_study_urls)} case study URLs")
@@ -491,6 +783,221 @@ class PlaywrightScraper:
         
         return case_study_urls
     
+    def is_case_study_url(self, url: str) -> bool:
+        """Check whether a URL points at a case study detail page"""
+        return '/insights/case-study/' in url or '/work/case-study/' in url
+    
+    def _fetch_xml(self, url: str) -> Optional[ET.Element]:
+        """Fetch and parse an XML document (sitemap or feed); gzip is handled transparently"""
+        try:
+            response = requests.get(url, headers={'User-Agent': self.USER_AGENT}, timeout=15)
+            if response.status_code != 200:
+                return None
+            body = response.content
+            if body[:2] == b'\x1f\x8b':
+                body = gzip.decompress(body)
+            return ET.fromstring(body)
+        except (requests.exceptions.RequestException, ET.ParseError, OSError):
+            return None
+    
+    @staticmethod
+    def _local_name(tag: str) -> str:
+        """Strip the XML namespace from a tag name"""
+        return tag.rsplit('}', 1)[-1]
+    
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse W3C/ISO-8601 (sitemaps, Atom) or RFC-822 (RSS) dates into aware UTC datetimes"""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+    
+    def _child_text(self, element: ET.Element, name: str) -> Optional[str]:
+        """Text of the first direct child with the given local name"""
+        for child in element:
+            if self._local_name(child.tag) == name:
+                return (child.text or '').strip() or None
+        return None
+    
+    def _read_sitemap(self, url: str, entries: Dict[str, Optional[datetime]],
+                      previous: Dict[str, str], seen: set, parents: Tuple[str, ...] = ()):
+        """
+        Collect <loc>/<lastmod> pairs from a sitemap, following sitemap indexes
+        
+        Case study URLs are also recorded under every child sitemap they were
+        found through (parents), see sitemap_members.
+        """
+        if url in seen:
+            return
+        seen.add(url)
+        
+        root = self._fetch_xml(url)
+        if root is None:
+            return
+        
+        kind = self._local_name(root.tag)
+        for node in root:
+            loc = self._child_text(node, 'loc')
+            if not loc:
+                continue
+            lastmod = self._parse_timestamp(self._child_text(node, 'lastmod'))
+            
+            if kind == 'sitemapindex':
+                # Child sitemaps whose lastmod has not moved cannot contain changes
+                previous_lastmod = self._parse_timestamp(previous.get(loc))
+                if lastmod and previous_lastmod and lastmod <= previous_lastmod:
+                    entries[loc] = lastmod
+                    continue
+                entries[loc] = lastmod
+                self.sitemap_members.setdefault(loc, set())
+                self._read_sitemap(loc, entries, previous, seen, parents + (loc,))
+            elif self.is_case_study_url(loc):
+                entries[loc] = lastmod
+                for parent in parents:
+                    self.sitemap_members[parent].add(loc)
+    
+    def _read_feed(self, url: str, entries: Dict[str, Optional[datetime]]):
+        """Collect case-study links and dates from an RSS or Atom feed"""
+        root = self._fetch_xml(url)
+        if root is None:
+            return
+        
+        for node in root.iter():
+            name = self._local_name(node.tag)
+            if name == 'item':  # RSS 2.0
+                link = self._child_text(node, 'link')
+                stamp = self._child_text(node, 'pubDate') or self._child_text(node, 'date')
+            elif name == 'entry':  # Atom
+                link = None
+                for child in node:
+                    if self._local_name(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                        link = child.get('href')
+                        break
+                stamp = self._child_text(node, 'updated') or self._child_text(node, 'published')
+            else:
+                continue
+            
+            if not link:
+                continue
+            if link.startswith('/'):
+                link = f"{self.site_root}{link}"
+            if self.is_case_study_url(link):
+                lastmod = self._parse_timestamp(stamp)
+                current = entries.get(link)
+                if link not in entries or (lastmod and (not current or lastmod > current)):
+                    entries[link] = lastmod
+    
+    def _robots_sitemaps(self) -> List[str]:
+        """Sitemap URLs advertised in robots.txt"""
+        try:
+            response = requests.get(f"{self.site_root}/robots.txt",
+                                    headers={'User-Agent': self.USER_AGENT}, timeout=15)
+            if response.status_code != 200:
+                return []
+        except requests.exceptions.RequestException:
+            return []
+        
+        return [line.split(':', 1)[1].strip() for line in response.text.splitlines()
+                if line.lower().startswith('sitemap:')]
+    
+    def load_discovery_state(self) -> Dict:
+        """Load lastmod values recorded by the previous discovery run"""
+        path = Path(self.DISCOVERY_STATE_FILE)
+        if not path.exists():
+            return {"last_run": None, "lastmod": {}}
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️  Ignoring unreadable discovery state ({e})")
+            return {"last_run": None, "lastmod": {}}
+    
+    def save_discovery_state(self, completed_urls: List[str]):
+        """
+        Persist lastmod values so the next run only picks up changes
+        
+        Only URLs that were actually processed are committed, so a failed
+        scrape is retried on the next run. A child sitemap's lastmod is held
+        back while any URL under it failed, so the next run reads it again.
+        """
+        state = self.load_discovery_state()
+        completed = set(completed_urls)
+        failed = self.selected_urls - completed
+        for url, lastmod in self.discovered_lastmod.items():
+            if self.is_case_study_url(url):
+                commit = url in completed
+            else:
+                commit = not (self.sitemap_members.get(url, set()) & failed)
+            if commit:
+                state["lastmod"][url] = lastmod.isoformat() if lastmod else None
+        state["last_run"] = datetime.now(timezone.utc).isoformat()
+        
+        with open(self.DISCOVERY_STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+    
+    def discover_from_sitemaps(self, changed_only: bool = True) -> List[str]:
+        """
+        Discover case study URLs from sitemap.xml (incl. indexes) and RSS/Atom feeds
+        
+        Args:
+            changed_only: Return only URLs that are new or whose lastmod moved
+                          since the previous run (see DISCOVERY_STATE_FILE)
+            
+        Returns:
+            List of case study URLs to scrape
+        """
+        start = time.perf_counter()
+        previous = self.load_discovery_state().get("lastmod", {})
+        entries: Dict[str, Optional[datetime]] = {}
+        self.sitemap_members = {}
+        
+        sitemap_urls = [f"{self.site_root}{path}" for path in self.SITEMAP_PATHS]
+        sitemap_urls.extend(u for u in self._robots_sitemaps() if u not in sitemap_urls)
+        
+        # Unchanged child sitemaps are only skipped when looking for changes
+        index_state = previous if changed_only else {}
+        seen = set()
+        for sitemap_url in sitemap_urls:
+            self._read_sitemap(sitemap_url, entries, index_state, seen)
+        for feed_path in self.FEED_PATHS:
+            self._read_feed(f"{self.site_root}{feed_path}", entries)
+        
+        self.discovered_lastmod = entries
+        case_study_urls = sorted(url for url in entries if self.is_case_study_url(url))
+        
+        if changed_only:
+            changed = []
+            for url in case_study_urls:
+                lastmod = entries[url]
+                if url not in previous:
+                    changed.append(url)  # New page
+                elif lastmod is None:
+                    changed.append(url)  # No lastmod to compare - let the scraper decide
+                else:
+                    previous_lastmod = self._parse_timestamp(previous[url])
+                    if previous_lastmod is None or lastmod > previous_lastmod:
+                        changed.append(url)
+            selected = changed
+        else:
+            selected = case_study_urls
+        self.selected_urls = set(selected)
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"✓ Sitemap/feed discovery: {len(case_study_urls)} case studies, "
+              f"{len(selected)} to scrape ({elapsed_ms:.0f} ms)")
+        return selected
+    
     async def scrape_multiple_case_studies(self, urls: List[str]) -> List[Dict]:
         """
         Scrape multiple case study URLs
@@ -504,24 +1011,29 @@ class PlaywrightScraper:
         case_studies = []
         
         async with async_playwright() as p:
-            print(f"\nLaunching Chromium browser (headless={self.headless})...")
-            browser = await p.chromium.launch(headless=self.headless)
+            self._playwright = p
             
             for url in urls:
-                case_study = await self.scrape_case_study_url(url, browser)
+                case_study = await self.scrape_case_study_url(url)
                 if case_study:
                     case_studies.append(case_study)
                 
                 # Brief pause between requests
-                await asyncio.sleep(2)
+                await asyncio.sleep(self.request_delay)
             
-            await browser.close()
+            await self._close_browser()
             print(f"\n{'='*70}")
             print(f"Scraping complete! Extracted {len(case_studies)} case studies")
+            self.print_tier_summary()
             print('='*70)
         
         return case_studies
     
+    def print_tier_summary(self):
+        """Print how many pages each fetch tier served"""
+        for tier, count in sorted(self.tier_counts.items()):
+            print(f"  {tier}: {count} pages")
+    
     async def auto_discover_and_scrape(self) -> List[Dict]:
         """
         Automatically discover and scrape all case studies
@@ -532,15 +1044,15 @@ class PlaywrightScraper:
         case_studies = []
         
         async with async_playwright() as p:
-            print(f"\nLaunching Chromium browser (headless={self.headless})...")
-            browser = await p.chromium.launch(headless=self.headless)
+            self._playwright = p
+            browser = await self._get_browser()
             
             # Phase 1: Discover URLs
             discovered_urls = await self.discover_case_study_urls(browser)
             
             if not discovered_urls:
                 print("⚠️  No case study URLs discovered. Check if pages loaded correctly.")
-                await browser.close()
+                await self._close_browser()
                 return []
             
             # Phase 2: Scrape each URL
@@ -555,16 +1067,67 @@ class PlaywrightScraper:
                     case_studies.append(case_study)
                 
                 # Be respectful - wait between requests
-                await asyncio.sleep(2)
+                await asyncio.sleep(self.request_delay)
             
-            await browser.close()
+            await self._close_browser()
             
             print(f"\n{'='*70}")
             print(f"✅ Auto-scraping complete! Extracted {len(case_studies)}/{len(discovered_urls)} case studies")
+            self.print_tier_summary()
             print('='*70)
         
         return case_studies
     
+    def reextract_store(self, workers: Optional[int] = None, chunk_size: int = 25) -> int:
+        """
+        Re-run extraction over every stored page without touching the network
+        
+        Pages with archived HTML go through the full HTML -> article -> fields
+        pipeline; older entries without an archive object fall back to the
+        article text kept in the store. Pages are split into chunks and
+        processed across a process pool. IDs, URLs and fetch tiers are
+        preserved; the store is saved afterwards.
+        
+        Args:
+            workers: Worker processes (defaults to the CPU count)
+            chunk_size: Articles per task
+            
+        Returns:
+            Number of case studies re-extracted
+        """
+        if not self.store:
+            print("❌ Re-extraction needs the case study store")
+            return 0
+        
+        archive_root = str(self.archive.root) if self.archive else None
+        items = []
+        for url, entry in self.store.pages.items():
+            digest = self.archive.hash_for(url) if self.archive else None
+            if digest or entry.get('article'):
+                items.append((url, entry['id'], entry.get('article'), archive_root, digest))
+        if not items:
+            print("⚠️  No archived pages or stored article text to re-extract")
+            return 0
+        
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        workers = workers or os.cpu_count() or 1
+        print(f"Re-extracting {len(items)} articles in {len(chunks)} chunks across {workers} workers...")
+        
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_reextract_chunk, chunks):
+                for url, case_study in results:
+                    previous = self.store.pages[url]['case_study'] or {}
+                    tier = previous.get('metadata', {}).get('fetch_tier')
+                    if tier:
+                        case_study['metadata']['fetch_tier'] = tier
+                    self.store.pages[url]['case_study'] = case_study
+        
+        elapsed = time.perf_counter() - start
+        self.store.save()
+        print(f"✓ Re-extracted {len(items)} case studies in {elapsed:.2f}s")
+        return len(items)
+    
     def load_urls_from_file(self, filepath: str) -> List[str]:
         """Load URLs from text file (one per line, # for comments)"""
         urls = []
@@ -584,23 +1147,72 @@ class PlaywrightScraper:
         return urls
     
     def save_case_studies(self, case_studies: List[Dict], output_file: str = 'case_studies_scraped.json'):
-        """Save case studies to JSON file"""
+        """
+        Save case studies to JSON file
+        
+        With the store enabled the store is persisted first and the output
+        contains every known case study (not only this run's), ordered by ID.
+        """
         output_path = Path(output_file)
         
+        if self.archive:
+            self.archive.save()
+        
+        if self.store:
+            self.store.save()
+            stats = self.store.stats
+            print(f"\n✓ Store updated: {stats['new']} new, {stats['changed']} changed, "
+                  f"{stats['unchanged']} unchanged, {stats['skipped']} skipped (lastmod)")
+            case_studies = self.store.case_studies()
+        
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(case_studies, f, indent=2, ensure_ascii=False)
         
         print(f"\n✓ Saved {len(case_studies)} case studies to {output_file}")
 
 
+def _reextract_chunk(items: List[Tuple]) -> List[Tuple[str, Dict]]:
+    """Process-pool worker: re-extract a chunk of (url, id, article, archive_root, hash) tuples"""
+    scraper = PlaywrightScraper(store_path=None, archive_dir=None)
+    archives = {}
+    results = []
+    for url, case_study_id, article, archive_root, digest in items:
+        html_content = None
+        if digest:
+            if archive_root not in archives:
+                archives[archive_root] = RawArchive(archive_root)
+            html_content = archives[archive_root].get(digest)
+        
+        if html_content:
+            article = scraper.article_from_html(html_content)
+            if len(article['content']) < scraper.MIN_CONTENT_CHARS and article['description']:
+                article['content'] = article['description']
+        elif not article:
+            continue
+        
+        case_study = scraper.parse_case_study_content(
+            title=article.get('title'),
+            content=article.get('content', ''),
+            url=url,
+            description=article.get('description')
+        )
+        case_study['id'] = case_study_id
+        results.append((url, case_study))
+    return results
+
+
 async def main():
     """Main execution function"""
     import sys
     
-    scraper = PlaywrightScraper(headless=True, timeout=60000)
-    
     # Check command line arguments
-    mode = sys.argv[1] if len(sys.argv) > 1 else "auto"
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    mode = args[0] if args else "auto"
+    
+    # --render-only skips the static tier and renders every page in Chromium
+    scraper = PlaywrightScraper(headless=True, timeout=60000,
+                                static_first='--render-only' not in flags)
     
     if mode == "auto":
         # Auto-discover and scrape all case studies
@@ -608,6 +1220,26 @@ async def main():
         print("="*70)
         case_studies = await scraper.auto_discover_and_scrape()
     
+    elif mode == "reextract":
+        # Re-run extraction over stored article text, no network access
+        print("♻️  RE-EXTRACT MODE: Re-running extraction over case_study_store.json...")
+        print("="*70)
+        if scraper.reextract_store():
+            scraper.save_case_studies([], 'case_studies_scraped.json')
+        return
+    
+    elif mode == "sitemap":
+        # Discover from sitemap.xml and feeds, scrape only what changed
+        print("🗺️  SITEMAP MODE: Reading sitemap.xml and feeds...")
+        print("="*70)
+        urls = scraper.discover_from_sitemaps(changed_only='--all' not in flags)
+        if not urls:
+            print("✓ No new or changed case studies since the last run")
+            scraper.save_discovery_state([])
+            return
+        case_studies = await scraper.scrape_multiple_case_studies(urls)
+        scraper.save_discovery_state([cs['url'] for cs in case_studies])
+    
     elif mode == "manual":
         # Use manual URL list from file
         print("📝 MANUAL MODE: Using case_study_urls.txt...")
@@ -620,9 +1252,12 @@ async def main():
     
     else:
         print(f"❌ Unknown mode: {mode}")
-        print("Usage: python scrape_with_playwright.py [auto|manual]")
-        print("  auto   - Auto-discover all case studies (default)")
-        print("  manual - Use case_study_urls.txt")
+        print("Usage: python scrape_with_playwright.py [auto|sitemap|manual|reextract] [--render-only] [--all]")
+        print("  auto    - Auto-discover all case studies (default)")
+        print("  sitemap - Discover from sitemap.xml/feeds, scrape only changed pages (--all for every page)")
+        print("  manual  - Use case_study_urls.txt")
+        print("  reextract - Re-run extraction over raw_archive/ and stored text (offline, all cores)")
+        print("  --render-only - Skip the static HTTP tier and always render with Playwright")
         return
     
     # Save to file
@@ -642,6 +1277,7 @@ async def main():
             print(f"Solution: {cs['solution'][:100]}...")
             print(f"Results: {cs['results'][:100]}...")
             print(f"URL: {cs['url']}")
+            print(f"Fetch tier: {cs['metadata'].get('fetch_tier', 'unknown')}")
     else:
         print("\n❌ No case studies were successfully scraped")
 
@@ -0,0 +1,253 @@
+"""
+Headless HTTP API for the RAG bot
+A small ASGI service over one shared ShuruTechRAGBot (chain, vector store and
+models loaded once per process), for the website widget and internal tools:
+
+    GET  /health     readiness and index size
+    POST /retrieve   {"query", "k"?} -> ranked case study chunks, no LLM call
+    POST /chat       {"message", "session_id"?, "stream"?} -> answer and sources;
+                     with "stream": true, Server-Sent Events: "token" events
+                     while Claude writes, then one "done" event with the answer
+
+Conversations are kept apart by session_id: a chat request without one
+starts a new conversation, and the id to continue it with is returned in the
+response (and the "done" event). Concurrent query embeddings are
+micro-batched into single model calls (EMBED_BATCH_WINDOW_MS, EMBED_BATCH_SIZE).
+
+Usage:
+    python server.py --port 8000
+    curl -N localhost:8000/chat -d '{"message": "Fraud detection for a bank?", "stream": true}'
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.documents import Document
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from embedding_batcher import BATCH_WINDOW_MS, MAX_BATCH_SIZE, EmbeddingBatcher
+from embedding_cache import query_cache
+from tracing import COMBINE_CHAIN
+
+logger = logging.getLogger(__name__)
+
+# Metadata returned with each source (the rest is internal bookkeeping)
+SOURCE_FIELDS = ('type', 'source', 'client_name', 'industry', 'technologies', 'matched_fields')
+MAX_RETRIEVE_K = 20
+
+
+class AnswerStreamHandler(BaseCallbackHandler):
+    """
+    Forwards the answer model's tokens to an asyncio queue (the question
+    condensing call is skipped) and adds up the token usage of the turn
+    """
+
+    run_inline = True
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, tokens: asyncio.Queue):
+        self.loop = loop
+        self.tokens = tokens
+        self.parents: Dict = {}  # run_id -> (name, parent run_id)
+        self.usage = {"input_tokens": 0, "output_tokens": 0}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        name = kwargs.get('name') or (serialized or {}).get('name') or ((serialized or {}).get('id') or [''])[-1]
+        self.parents[run_id] = (name, parent_run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self.parents[run_id] = ('llm', parent_run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self.parents[run_id] = ('llm', parent_run_id)
+
+    def _answer_call(self, run_id) -> bool:
+        # Answer model -> LLMChain -> StuffDocumentsChain
+        _, chain = self.parents.get(run_id, (None, None))
+        _, combine = self.parents.get(chain, (None, None))
+        return self.parents.get(combine, (None,))[0] == COMBINE_CHAIN
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if token and self._answer_call(run_id):
+            # Callbacks may run on the retrieval worker thread as well as the loop
+            self.loop.call_soon_threadsafe(self.tokens.put_nowait, token)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or {}
+                for key in self.usage:
+                    self.usage[key] += usage.get(key, 0)
+
+
+def source_payload(doc: Document) -> Dict:
+    return {
+        "content": doc.page_content,
+        **{field: doc.metadata[field] for field in SOURCE_FIELDS if field in doc.metadata}
+    }
+
+
+def sse_event(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def create_bot():
+    """The app's bot with query embeddings micro-batched across concurrent requests"""
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    from app import EMBEDDING_MODEL, ShuruTechRAGBot
+
+    embeddings = EmbeddingBatcher(
+        HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL),
+        window_ms=float(os.getenv('EMBED_BATCH_WINDOW_MS', BATCH_WINDOW_MS)),
+        max_batch_size=int(os.getenv('EMBED_BATCH_SIZE', MAX_BATCH_SIZE))
+    )
+    return ShuruTechRAGBot(embeddings=embeddings)
+
+
+async def read_json(request: Request) -> Optional[Dict]:
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return body if isinstance(body, dict) else None
+
+
+def create_app(bot=None) -> Starlette:
+    """
+    ASGI app over one shared bot
+
+    Args:
+        bot: Prebuilt bot (default create_bot()); its chain is built at startup
+    """
+    state = {"bot": bot, "ready": False, "error": None, "started_at": time.time()}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if state['bot'] is None:
+            state['bot'] = await asyncio.to_thread(create_bot)
+        chain = await asyncio.to_thread(state['bot'].ensure_chain)
+        state['ready'] = chain is not None
+        state['error'] = None if chain is not None else state['bot'].last_error or "chain initialization failed"
+        if state['ready'] and os.getenv('WARMUP', 'true').lower() == 'true':
+            await asyncio.to_thread(state['bot'].warmup)
+        logger.info("✓ API ready" if state['ready'] else f"❌ API not ready: {state['error']}")
+        yield
+
+    def unavailable() -> Optional[JSONResponse]:
+        if not state['ready']:
+            return JSONResponse({"error": "not ready", "detail": state['error']}, status_code=503)
+        return None
+
+    async def health(request: Request) -> JSONResponse:
+        bot = state['bot']
+        body = {"status": "ok" if state['ready'] else "unavailable",
+                "uptime_s": round(time.time() - state['started_at'], 1)}
+        if state['ready']:
+            body.update({"vectors": bot.vectorstore.index.ntotal, "sessions": len(bot.session_memories)})
+            cache = query_cache(bot.vectorstore)
+            if cache is not None:
+                body['query_embedding_cache'] = cache.info()
+            if bot.warmup_stats:
+                body['warmup'] = bot.warmup_stats
+            if isinstance(bot.embeddings, EmbeddingBatcher):
+                body['embedding_batches'] = {**bot.embeddings.stats, "mean_size": bot.embeddings.mean_batch_size()}
+        return JSONResponse(body, status_code=200 if state['ready'] else 503)
+
+    async def retrieve(request: Request) -> JSONResponse:
+        if (error := unavailable()) is not None:
+            return error
+        body = await read_json(request)
+        query = (body or {}).get('query')
+        if not isinstance(query, str) or not query.strip():
+            return JSONResponse({"error": "'query' must be a non-empty string"}, status_code=400)
+        k = body.get('k')
+        if k is not None and (not isinstance(k, int) or not 1 <= k <= MAX_RETRIEVE_K):
+            return JSONResponse({"error": f"'k' must be an integer from 1 to {MAX_RETRIEVE_K}"}, status_code=400)
+
+        start = time.perf_counter()
+        docs = await asyncio.to_thread(state['bot'].retriever.search, query, k)
+        return JSONResponse({"documents": [source_payload(doc) for doc in docs],
+                             "latency_ms": round((time.perf_counter() - start) * 1000, 1)})
+
+    async def chat(request: Request):
+        if (error := unavailable()) is not None:
+            return error
+        body = await read_json(request)
+        message = (body or {}).get('message')
+        if not isinstance(message, str) or not message.strip():
+            return JSONResponse({"error": "'message' must be a non-empty string"}, status_code=400)
+        session_id = body.get('session_id')
+        if session_id is not None and not isinstance(session_id, str):
+            return JSONResponse({"error": "'session_id' must be a string"}, status_code=400)
+        # A new conversation gets its own id (returned to the client); the bot's own memory is never used here
+        session_id = session_id or uuid.uuid4().hex
+
+        bot = state['bot']
+        tokens: asyncio.Queue = asyncio.Queue()
+        handler = AnswerStreamHandler(asyncio.get_running_loop(), tokens)
+        # Runs to completion (and saves the turn) even if a streaming client disconnects
+        turn = asyncio.create_task(bot.aget_response(message, session_id=session_id, callbacks=[handler]))
+
+        def result(answer: str, sources: List[Document]) -> Dict:
+            return {"answer": answer, "sources": [source_payload(doc) for doc in sources],
+                    "session_id": session_id, "usage": handler.usage}
+
+        if not body.get('stream'):
+            return JSONResponse(result(*await turn))
+
+        async def events():
+            # End of turn is queued after any tokens still pending on the loop
+            turn.add_done_callback(lambda _: tokens.put_nowait(None))
+            while (token := await tokens.get()) is not None:
+                yield sse_event('token', {"text": token})
+            yield sse_event('done', result(*turn.result()))
+
+        return StreamingResponse(events(), media_type='text/event-stream',
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    middleware = []
+    origins = [origin.strip() for origin in os.getenv('CORS_ORIGINS', '').split(',') if origin.strip()]
+    if origins:
+        middleware.append(Middleware(CORSMiddleware, allow_origins=origins, allow_methods=['GET', 'POST'],
+                                     allow_headers=['Content-Type']))
+
+    return Starlette(
+        routes=[
+            Route('/health', health, methods=['GET']),
+            Route('/retrieve', retrieve, methods=['POST']),
+            Route('/chat', chat, methods=['POST']),
+        ],
+        middleware=middleware,
+        lifespan=lifespan
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the RAG bot over HTTP (chat, retrieve, health)")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on")
+    args = parser.parse_args(argv)
+
+    # One process, one event loop: concurrency comes from async I/O, not workers
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
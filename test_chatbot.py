@@ -13,6 +13,11 @@ from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain.schema import Document
 
+from benchmark_retrieval import (CHUNK_FANOUT, QUERIES_FILE, latency_summary, load_queries,
+                                 rank_documents, recall_at_k, reciprocal_rank)
+from kb_format import load_kb, resolve_kb_path
+from kb_schema import format_case_study
+
 # Suppress tokenizer warnings
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
@@ -24,7 +29,7 @@ class ChatbotTester:
     """Comprehensive testing for the RAG chatbot"""
 
     def __init__(self):
-        self.knowledge_base_path = 'knowledge_base.json'
+        self.knowledge_base_path = resolve_kb_path('knowledge_base.json')
         self.documents = []
         self.vectorstore = None
         self.test_results = []
@@ -56,9 +61,8 @@ class ChatbotTester:
                 self.print_test("1", False, "knowledge_base.json not found")
                 return False
 
-            # Load JSON
-            with open(self.knowledge_base_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Load case studies (JSON or columnar)
+            data = load_kb(self.knowledge_base_path, sections=['case_studies'])
 
             # Validate structure
             if 'case_studies' not in data:
@@ -72,21 +76,7 @@ class ChatbotTester:
 
             # Process documents
             for case_study in case_studies:
-                page_content = f"""Case Study: {case_study.get('client_name', 'Unknown Client')}
-Industry: {case_study.get('industry', 'N/A')}
-
-Problem:
-{case_study.get('problem', 'N/A')}
-
-Solution:
-{case_study.get('solution', 'N/A')}
-
-Technologies Used: {', '.join(case_study.get('technologies', []))}
-
-Results:
-{case_study.get('results', 'N/A')}
-
-Duration: {case_study.get('duration', 'N/A')}"""
+                page_content = format_case_study(case_study)
 
                 doc = Document(
                     page_content=page_content,
@@ -203,102 +193,68 @@ Duration: {case_study.get('duration', 'N/A')}"""
             return False
 
     def test_4_similarity_search(self):
-        """Test 4: Similarity search with sample queries"""
+        """Test 4: Similarity search against the labeled query set"""
         self.print_header("TEST 4: Similarity Search")
 
         if not self.vectorstore:
             self.print_test("4", False, "Vector store not initialized")
             return False
 
-        # Sample test queries
-        test_queries = [
-            {
-                "query": "cart abandonment e-commerce",
-                "expected_industries": ["E-commerce", "Retail", "Online Shopping"],
-                "keywords": ["cart", "shopping", "conversion", "checkout"]
-            },
-            {
-                "query": "slow payment processing fintech",
-                "expected_industries": ["FinTech", "Finance", "Banking", "Payment"],
-                "keywords": ["payment", "transaction", "processing", "speed"]
-            },
-            {
-                "query": "patient data healthcare consolidation",
-                "expected_industries": ["Healthcare", "Medical", "Hospital"],
-                "keywords": ["patient", "medical", "data", "health", "consolidat"]
-            },
-            {
-                "query": "iot agriculture monitoring",
-                "expected_industries": ["Agriculture", "Farming", "AgriTech"],
-                "keywords": ["iot", "sensor", "monitor", "farm", "crop"]
-            },
-            {
-                "query": "real-time analytics dashboard",
-                "expected_industries": ["Analytics", "Data", "Business Intelligence"],
-                "keywords": ["analytics", "dashboard", "real-time", "data", "visual"]
-            }
-        ]
+        try:
+            test_queries = load_queries(QUERIES_FILE)
+        except (OSError, ValueError) as e:
+            self.print_test("4", False, f"Cannot load {QUERIES_FILE}: {str(e)}")
+            return False
 
         query_times = []
+        recalls = []
+        reciprocal_ranks = []
         passed_tests = 0
 
         for idx, test_case in enumerate(test_queries, 1):
             query = test_case["query"]
             print(f"\n   Query {idx}: \"{query}\"")
 
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             try:
-                # Perform similarity search
-                results = self.vectorstore.similarity_search(query, k=3)
-                query_time = time.time() - start_time
+                # Perform similarity search (extra chunks, collapsed to the top 3 documents)
+                results = self.vectorstore.similarity_search(query, k=3 * CHUNK_FANOUT)
+                query_time = time.perf_counter() - start_time
                 query_times.append(query_time)
 
                 if not results:
                     print(f"      [X] No results returned")
                     continue
 
-                # Check first result
-                top_result = results[0]
-                metadata = top_result.metadata
-                content = top_result.page_content.lower()
-
-                client_name = metadata.get('client_name', 'Unknown')
-                industry = metadata.get('industry', 'N/A')
-
-                # Validate relevance
-                is_relevant = False
-
-                # Check industry match
-                for expected_industry in test_case["expected_industries"]:
-                    if expected_industry.lower() in industry.lower():
-                        is_relevant = True
-                        break
-
-                # Check keyword match in content
-                if not is_relevant:
-                    keyword_matches = sum(1 for kw in test_case["keywords"] if kw.lower() in content)
-                    if keyword_matches >= 2:
-                        is_relevant = True
+                ranked = rank_documents(results)[:3]
+                recalls.append(recall_at_k(ranked, test_case["relevant"], 3))
+                reciprocal_ranks.append(reciprocal_rank(ranked, test_case["relevant"]))
 
-                if is_relevant:
-                    print(f"      [OK] {client_name} ({industry}) - {query_time:.3f}s")
+                # Relevant if any labeled case study made the top 3
+                if reciprocal_ranks[-1] > 0:
+                    print(f"      [OK] {ranked[0]} - rank {round(1 / reciprocal_ranks[-1])} - {query_time:.3f}s")
                     passed_tests += 1
                 else:
-                    print(f"      [?] {client_name} ({industry}) - relevance unclear")
+                    print(f"      [?] {ranked[0]} - no labeled case study in top 3")
 
             except Exception as e:
                 print(f"      [X] Error: {str(e)}")
 
-        # Calculate average query time
-        avg_query_time = sum(query_times) / len(query_times) if query_times else 0
-        self.performance_metrics['avg_query_time'] = avg_query_time
+        # Latency percentiles and mean quality over the query set
+        latency = latency_summary(query_times)
+        self.performance_metrics['avg_query_time'] = latency['mean'] / 1000
+        self.performance_metrics['p50_query_time'] = latency['p50'] / 1000
+        self.performance_metrics['p95_query_time'] = latency['p95'] / 1000
+        self.performance_metrics['recall_at_3'] = sum(recalls) / len(test_queries)
+        self.performance_metrics['mrr'] = sum(reciprocal_ranks) / len(test_queries)
 
-        success_rate = (passed_tests / len(test_queries)) * 100
         self.print_test(
             "4",
             passed_tests >= len(test_queries) * 0.6,  # At least 60% should pass
-            f"Similarity search ({passed_tests}/{len(test_queries)} relevant, avg {avg_query_time:.3f}s/query)"
+            f"Similarity search ({passed_tests}/{len(test_queries)} relevant, "
+            f"recall@3 {self.performance_metrics['recall_at_3']:.2f}, "
+            f"p95 {latency['p95'] / 1000:.3f}s/query)"
         )
 
         return passed_tests >= len(test_queries) * 0.6
@@ -326,6 +282,11 @@ Duration: {case_study.get('duration', 'N/A')}"""
         print(f"   >> Embeddings creation time: {self.performance_metrics.get('embed_time', 0):.2f}s")
         print(f"   >> Vector store build time: {self.performance_metrics.get('vector_time', 0):.2f}s")
         print(f"   >> Average query time: {self.performance_metrics.get('avg_query_time', 0):.3f}s")
+        print(f"   >> Query time p50 / p95: {self.performance_metrics.get('p50_query_time', 0):.3f}s / "
+              f"{self.performance_metrics.get('p95_query_time', 0):.3f}s")
+        print(f"   >> Recall@3 / MRR: {self.performance_metrics.get('recall_at_3', 0):.2f} / "
+              f"{self.performance_metrics.get('mrr', 0):.2f}")
+        print(f"   >> Full benchmark: python benchmark_retrieval.py")
 
         total_time = sum([
             self.performance_metrics.get('load_time', 0),
@@ -0,0 +1,435 @@
+"""
+Per-stage latency tracing for the RAG request path
+Each chat turn becomes a trace of timed spans (question condensing, query
+embedding, vector search, retrieval, prompt assembly, LLM time-to-first-token
+and generation). Spans come from LangChain callbacks plus wrappers around the
+vector store. Finished traces are:
+- Logged as one JSON line each (logger "rag.trace"; TRACE_LOG_FILE also writes them to a JSONL file)
+- Aggregated into rolling per-stage windows (TRACE_WINDOW requests) for p50/p95
+- Exported in Prometheus text format to METRICS_FILE and/or http://<host>:METRICS_PORT/metrics
+"""
+
+import contextvars
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+trace_logger = logging.getLogger('rag.trace')
+
+# Trace of the request being handled in this thread / task
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('current_trace', default=None)
+
+# Chain names as reported by LangChain callbacks
+QUESTION_CHAIN = 'ConversationalRetrievalChain'
+COMBINE_CHAIN = 'StuffDocumentsChain'
+LLM_CHAIN = 'LLMChain'
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentile with linear interpolation between closest ranks"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class Trace:
+    """Timed spans of one request; times are perf_counter seconds"""
+
+    def __init__(self, name: str, **attrs):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.spans: List[Dict] = []
+        self.lock = threading.Lock()
+
+    def add_span(self, name: str, start: float, end: float, nested: bool = False, **attrs):
+        """
+        Record a span
+
+        Args:
+            nested: Span lies inside another recorded span (e.g. query embedding
+                    inside retrieval), so it is left out of the "other" remainder
+        """
+        with self.lock:
+            self.spans.append({"name": name, "start": start, "end": end, "nested": nested, **attrs})
+
+    @contextmanager
+    def span(self, name: str, nested: bool = False, **attrs) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter(), nested=nested, **attrs)
+
+    def durations(self) -> Dict[str, float]:
+        """Milliseconds per stage (repeated stages are summed), plus total and other"""
+        stages = defaultdict(float)
+        accounted = 0.0
+        for span in self.spans:
+            duration = (span['end'] - span['start']) * 1000
+            stages[span['name']] += duration
+            if not span['nested']:
+                accounted += duration
+        if self.end is not None:
+            stages['total'] = (self.end - self.start) * 1000
+            stages['other'] = max(stages['total'] - accounted, 0.0)
+        return dict(stages)
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "timestamp": self.started_at,
+            "duration_ms": round((self.end - self.start) * 1000, 3) if self.end is not None else None,
+            "attrs": self.attrs,
+            "spans": [
+                {"name": span['name'],
+                 "offset_ms": round((span['start'] - self.start) * 1000, 3),
+                 "duration_ms": round((span['end'] - span['start']) * 1000, 3),
+                 **{key: value for key, value in span.items() if key not in ('name', 'start', 'end', 'nested')}}
+                for span in sorted(self.spans, key=lambda span: span['start'])
+            ]
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """Trace of the request being handled, if any"""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, nested: bool = False, **attrs) -> Iterator[None]:
+    """Time a block into the current trace (no-op outside a trace)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name, nested=nested, **attrs):
+        yield
+
+
+class Tracer:
+    """Collects finished traces into rolling per-stage windows and exports them"""
+
+    def __init__(self, window: int = 200, log_file: Optional[str] = None,
+                 metrics_file: Optional[str] = None, metrics_interval: float = 1.0):
+        """
+        Args:
+            window: Requests kept per stage for the rolling percentiles
+            log_file: JSONL file that receives every trace (in addition to the log)
+            metrics_file: Prometheus text file rewritten as traces finish
+            metrics_interval: Minimum seconds between metrics file rewrites
+        """
+        self.window = window
+        self.windows: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self.totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])  # stage -> [count, sum ms]
+        self.lock = threading.Lock()
+        self.metrics_file = metrics_file
+        self.metrics_interval = metrics_interval
+        self.last_metrics_write = 0.0
+        self.metrics_server: Optional[ThreadingHTTPServer] = None
+
+        if log_file and not any(getattr(handler, 'trace_file', None) == log_file
+                                for handler in trace_logger.handlers):
+            handler = logging.FileHandler(log_file, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            handler.trace_file = log_file
+            trace_logger.addHandler(handler)
+
+    @classmethod
+    def from_env(cls) -> 'Tracer':
+        tracer = cls(
+            window=int(os.getenv('TRACE_WINDOW', 200)),
+            log_file=os.getenv('TRACE_LOG_FILE') or None,
+            metrics_file=os.getenv('METRICS_FILE') or None
+        )
+        if os.getenv('METRICS_PORT'):
+            tracer.start_metrics_server(int(os.getenv('METRICS_PORT')))
+        return tracer
+
+    @contextmanager
+    def trace(self, name: str, **attrs) -> Iterator[Trace]:
+        """Trace one request; spans recorded inside the block attach to it"""
+        trace = Trace(name, **attrs)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        except Exception as e:
+            trace.attrs['error'] = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            _current_trace.reset(token)
+            trace.end = time.perf_counter()
+            self.finish(trace)
+
+    def finish(self, trace: Trace):
+        """Aggregate a finished trace, log it and refresh the metrics file"""
+        with self.lock:
+            for stage, duration in trace.durations().items():
+                self.windows[stage].append(duration)
+                self.totals[stage][0] += 1
+                self.totals[stage][1] += duration
+
+        trace_logger.info(json.dumps(trace.to_dict(), ensure_ascii=False, default=str))
+
+        if self.metrics_file and time.monotonic() - self.last_metrics_write >= self.metrics_interval:
+            self.write_metrics_file()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Rolling p50/p95/mean (ms) and sample count per stage"""
+        with self.lock:
+            windows = {stage: list(values) for stage, values in self.windows.items()}
+        return {
+            stage: {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "mean": sum(values) / len(values),
+                "count": len(values)
+            }
+            for stage, values in windows.items() if values
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition: a summary per stage (rolling quantiles, cumulative sum/count)"""
+        summary = self.summary()
+        with self.lock:
+            totals = {stage: tuple(values) for stage, values in self.totals.items()}
+
+        lines = [
+            f"# HELP rag_stage_latency_ms RAG request stage latency (quantiles over the last {self.window} requests)",
+            "# TYPE rag_stage_latency_ms summary",
+        ]
+        for stage in sorted(summary):
+            for key, quantile in (('p50', '0.5'), ('p95', '0.95')):
+                lines.append(f'rag_stage_latency_ms{{stage="{stage}",quantile="{quantile}"}} '
+                             f'{summary[stage][key]:.3f}')
+            count, total = totals.get(stage, (0, 0.0))
+            lines.append(f'rag_stage_latency_ms_sum{{stage="{stage}"}} {total:.3f}')
+            lines.append(f'rag_stage_latency_ms_count{{stage="{stage}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_metrics_file(self):
+        """Atomically rewrite the Prometheus metrics file"""
+        self.last_metrics_write = time.monotonic()
+        tmp_path = f"{self.metrics_file}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus())
+            os.replace(tmp_path, self.metrics_file)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write metrics file {self.metrics_file}: {str(e)}")
+
+    def start_metrics_server(self, port: int, host: str = '0.0.0.0'):
+        """Serve GET /metrics from a daemon thread (once per process)"""
+        if self.metrics_server is not None:
+            return
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                payload = tracer.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.metrics_server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            logger.warning(f"⚠️  Metrics endpoint not started on port {port}: {str(e)}")
+            return
+        threading.Thread(target=self.metrics_server.serve_forever, daemon=True).start()
+        logger.info(f"📈 Metrics at http://{host}:{port}/metrics")
+
+
+class TracedEmbeddings(Embeddings):
+    """Embeddings wrapper that records query embedding as a span"""
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with span('embed_query', nested=True):
+            return self.embeddings.embed_query(text)
+
+
+def trace_vectorstore(vectorstore):
+    """
+    Record query embedding and the index search of a FAISS store as spans
+
+    Safe to call repeatedly on a shared store; it is only wrapped once.
+    """
+    if getattr(vectorstore, '_traced', False):
+        return vectorstore
+
+    if isinstance(vectorstore.embedding_function, Embeddings):
+        vectorstore.embedding_function = TracedEmbeddings(vectorstore.embedding_function)
+
+    for name in ('similarity_search_with_score_by_vector',
+                 'max_marginal_relevance_search_with_score_by_vector'):
+        search = getattr(vectorstore, name, None)
+        if search is None:
+            continue
+
+        def traced(*args, _search=search, **kwargs):
+            with span('vector_search', nested=True):
+                return _search(*args, **kwargs)
+
+        setattr(vectorstore, name, traced)
+
+    vectorstore._traced = True
+    return vectorstore
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Turns LangChain callbacks of a ConversationalRetrievalChain run into spans
+
+    Stages: condense_question (question generator chain, follow-ups only),
+    retrieval, prompt_assembly (combine chain start to answer LLM start),
+    llm_ttft and llm_generation (time after the first token; the whole call
+    when the model does not stream).
+    """
+
+    # Timestamps are taken in the callback, so async runs must not defer it to an executor
+    run_inline = True
+
+    def __init__(self, trace: Trace):
+        self.trace = trace
+        self.runs: Dict[Any, Dict] = {}  # run_id -> {"name", "parent", "start", "first_token"}
+
+    def _start(self, run_id, parent_run_id, name: str):
+        self.runs[run_id] = {"name": name, "parent": parent_run_id, "start": time.perf_counter(),
+                             "first_token": None}
+
+    def _name(self, run_id) -> Optional[str]:
+        run = self.runs.get(run_id)
+        return run['name'] if run else None
+
+    def _parent_name(self, run_id) -> Optional[str]:
+        run = self.runs.get(run_id)
+        return self._name(run['parent']) if run else None
+
+    @staticmethod
+    def _run_name(serialized: Optional[Dict], kwargs: Dict) -> str:
+        if kwargs.get('name'):
+            return kwargs['name']
+        serialized = serialized or {}
+        return serialized.get('name') or (serialized.get('id') or [''])[-1]
+
+    # Chains -------------------------------------------------------------
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, self._run_name(serialized, kwargs))
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end_chain(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end_chain(run_id, error=type(error).__name__)
+
+    def _end_chain(self, run_id, **attrs):
+        run = self.runs.pop(run_id, None)
+        if run and run['name'] == LLM_CHAIN and self._name(run['parent']) == QUESTION_CHAIN:
+            self.trace.add_span('condense_question', run['start'], time.perf_counter(), **attrs)
+
+    # Retrieval ----------------------------------------------------------
+
+    def on_retriever_start(self, serialized, query, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, 'retriever')
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        run = self.runs.pop(run_id, None)
+        if run:
+            self.trace.add_span('retrieval', run['start'], time.perf_counter(), documents=len(documents))
+
+    def on_retriever_error(self, error, *, run_id, **kwargs):
+        run = self.runs.pop(run_id, None)
+        if run:
+            self.trace.add_span('retrieval', run['start'], time.perf_counter(), error=type(error).__name__)
+
+    # LLM ----------------------------------------------------------------
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._on_model_start(run_id, parent_run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._on_model_start(run_id, parent_run_id)
+
+    def _on_model_start(self, run_id, parent_run_id):
+        self._start(run_id, parent_run_id, 'llm')
+        # Prompt assembly: from the combine chain starting to the answer model being called
+        parent = self.runs.get(parent_run_id)
+        combine = self.runs.get(parent['parent']) if parent else None
+        if combine and combine['name'] == COMBINE_CHAIN:
+            self.trace.add_span('prompt_assembly', combine['start'], self.runs[run_id]['start'])
+
+    def _answer_call(self, run_id) -> bool:
+        """True for the answer model call (inside the combine-documents chain)"""
+        run = self.runs.get(run_id)
+        return bool(run) and self._parent_name(run['parent']) == COMBINE_CHAIN
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self.runs.get(run_id)
+        if run and run['first_token'] is None:
+            run['first_token'] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end_llm(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end_llm(run_id, error=type(error).__name__)
+
+    def _end_llm(self, run_id, **attrs):
+        answer = self._answer_call(run_id)
+        run = self.runs.pop(run_id, None)
+        if not run or not answer:
+            return  # The condense call is covered by its chain span
+        end = time.perf_counter()
+        if run['first_token'] is not None:
+            self.trace.add_span('llm_ttft', run['start'], run['first_token'])
+            self.trace.add_span('llm_generation', run['first_token'], end, **attrs)
+        else:
+            self.trace.add_span('llm_generation', run['start'], end, **attrs)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer, configured from the environment on first use (after .env is loaded)"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer.from_env()
+    return _tracer
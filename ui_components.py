@@ -4,10 +4,11 @@ Modern, responsive components matching the Figma design
 """
 
 import streamlit as st
-import json
 import os
 from collections import Counter
 
+from kb_format import iter_section, resolve_kb_path
+
 
 def inject_new_styles():
     """Inject new light theme styles matching Figma design"""
@@ -502,7 +503,7 @@ def generate_top_questions():
     """Generate top 3 questions based on knowledge base analysis"""
     try:
         # Load knowledge base
-        kb_path = 'knowledge_base.json'
+        kb_path = resolve_kb_path('knowledge_base.json')
         if not os.path.exists(kb_path):
             return [
                 "What services does Shuru Tech offer?",
@@ -510,10 +511,8 @@ def generate_top_questions():
                 "Tell me about your RAG chatbot capabilities"
             ]
         
-        with open(kb_path, 'r') as f:
-            data = json.load(f)
-        
-        case_studies = data.get('case_studies', [])
+        # Only the fields analysed below are read (a single column for columnar KBs)
+        case_studies = list(iter_section(kb_path, 'case_studies', fields=['industry']))
         if not case_studies:
             return [
                 "What services does Shuru Tech offer?",
@@ -526,9 +525,6 @@ def generate_top_questions():
         industry_counts = Counter(industries)
         top_industry = industry_counts.most_common(1)[0][0] if industry_counts else "technology"
         
-        # Analyze common problems
-        problems = [cs.get('problem', '') for cs in case_studies if cs.get('problem')]
-        
         # Generate questions based on analysis
         questions = [
             f"Tell me about your {top_industry} solutions",
@@ -591,6 +587,34 @@ def display_chat_message(role, content):
         """, unsafe_allow_html=True)
 
 
+def display_latency_panel(summary, last_trace=None):
+    """Sidebar debug panel: rolling p50/p95 per RAG stage and the last turn's spans"""
+    with st.sidebar.expander("⏱️ Latency (rolling)", expanded=True):
+        if not summary:
+            st.caption("No traced requests yet")
+            return
+
+        # Request path order first, anything else after
+        order = ['condense_question', 'embed_query', 'vector_search', 'lexical_search', 'rerank', 'context_packing', 'retrieval', 'prompt_assembly',
+                 'llm_ttft', 'llm_generation', 'other', 'total']
+        stages = [stage for stage in order if stage in summary]
+        stages += sorted(stage for stage in summary if stage not in order)
+        st.table([
+            {"stage": stage, "p50 ms": round(summary[stage]['p50'], 1),
+             "p95 ms": round(summary[stage]['p95'], 1), "n": summary[stage]['count']}
+            for stage in stages
+        ])
+
+        if last_trace:
+            attrs = last_trace.get('attrs', {})
+            tokens = "".join(f" · {label} {attrs[key]} tokens" for key, label in
+                             (('context_tokens', 'context'), ('input_tokens', 'input'), ('output_tokens', 'output'))
+                             if key in attrs)
+            st.caption(f"Last turn: {last_trace['duration_ms']:.0f} ms{tokens}")
+            st.table([{"span": span['name'], "start ms": round(span['offset_ms']),
+                       "ms": round(span['duration_ms'], 1)} for span in last_trace['spans']])
+
+
 # Legacy function names for backward compatibility
 def inject_dashboard_styles():
     """Legacy function - redirects to new styles"""
@@ -0,0 +1,242 @@
+"""
+Configurable FAISS index types for the vector store
+The default is the exact flat float32 index LangChain builds. For larger
+corpora the index can instead be approximate (IVF, HNSW) and/or quantized
+(PQ, int8/float16 scalar quantization):
+
+    flat       exact, float32                     4 * dim bytes/vector
+    sq8        exact scan, int8 codes             1 * dim bytes/vector
+    sq-fp16    exact scan, float16 codes          2 * dim bytes/vector
+    ivf-flat   inverted lists, float32            searches nprobe of nlist clusters
+    ivf-sq8    inverted lists, int8 codes
+    ivf-pq     inverted lists, product quantized  pq_m bytes/vector at 8 bits
+    hnsw       graph, float32                     ef_search trades recall for latency
+
+Indexes that need training are trained on a random sample of the vectors.
+Build-time parameters are part of the index config (changing them rebuilds
+the persisted index); search-time ones (nprobe, ef_search) are applied on
+load. Configure with FAISS_INDEX and the FAISS_* variables below.
+"""
+
+import logging
+import math
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ('flat', 'sq8', 'sq-fp16', 'ivf-flat', 'ivf-sq8', 'ivf-pq', 'hnsw')
+
+# Build-time parameters (0 for nlist means sqrt-based automatic sizing)
+BUILD_DEFAULTS = {
+    "type": 'flat',
+    "nlist": 0,
+    "pq_m": 48,            # PQ sub-quantizers (lowered to a divisor of the dimension)
+    "pq_nbits": 8,
+    "hnsw_m": 32,
+    "ef_construction": 80,
+    "train_sample": 50000,
+}
+# Search-time parameters
+SEARCH_DEFAULTS = {
+    "nprobe": 8,
+    "ef_search": 64,
+}
+
+# FAISS rejects training with fewer points than centroids; it recommends 39 per centroid
+MIN_POINTS_PER_CENTROID = 39
+# Rebuild (and retrain) once a trained index has grown this much past its training set
+RETRAIN_GROWTH = 2.0
+TRAIN_SEED = 0
+
+ENV_VARS = {
+    "type": 'FAISS_INDEX',
+    "nlist": 'FAISS_NLIST',
+    "pq_m": 'FAISS_PQ_M',
+    "pq_nbits": 'FAISS_PQ_NBITS',
+    "hnsw_m": 'FAISS_HNSW_M',
+    "ef_construction": 'FAISS_EF_CONSTRUCTION',
+    "train_sample": 'FAISS_TRAIN_SAMPLE',
+    "nprobe": 'FAISS_NPROBE',
+    "ef_search": 'FAISS_EF_SEARCH',
+}
+
+
+def index_params_from_env() -> Dict:
+    """Build and search parameters from FAISS_* environment variables"""
+    params = {**BUILD_DEFAULTS, **SEARCH_DEFAULTS}
+    for name, var in ENV_VARS.items():
+        value = os.getenv(var)
+        if value:
+            params[name] = value.lower() if name == 'type' else int(value)
+    if params['type'] not in INDEX_TYPES:
+        raise ValueError(f"Unknown FAISS_INDEX '{params['type']}' (known: {', '.join(INDEX_TYPES)})")
+    return params
+
+
+def build_config(params: Dict) -> Dict:
+    """The build-time parameters that matter for the chosen index type"""
+    index_type = params['type']
+    names = {
+        'ivf-flat': ['nlist', 'train_sample'],
+        'ivf-sq8': ['nlist', 'train_sample'],
+        'ivf-pq': ['nlist', 'pq_m', 'pq_nbits', 'train_sample'],
+        'hnsw': ['hnsw_m', 'ef_construction'],
+    }.get(index_type, [])
+    return {"type": index_type, **{name: params[name] for name in names}}
+
+
+def needs_training(index_type: str) -> bool:
+    return index_type in ('sq8', 'sq-fp16', 'ivf-flat', 'ivf-sq8', 'ivf-pq')
+
+
+def supports_removal(index_type: str) -> bool:
+    """
+    Whether documents can be deleted in place
+
+    LangChain's FAISS.delete renumbers the remaining vectors, which only
+    matches what flat-code indexes do; IVF indexes keep their ids and HNSW
+    cannot remove at all, so those are rebuilt instead.
+    """
+    return index_type in ('flat', 'sq8', 'sq-fp16')
+
+
+def resolve_build(params: Dict, num_vectors: int, dim: int) -> Dict:
+    """
+    Build parameters adjusted to the corpus size and embedding dimension
+
+    nlist defaults to about 4 * sqrt(n) and, like the PQ codebook size, is
+    capped so every centroid gets enough training points; pq_m is lowered to
+    a divisor of the dimension.
+    """
+    resolved = build_config(params)
+    sample = min(num_vectors, params['train_sample']) if needs_training(params['type']) else 0
+    if 'nlist' in resolved:
+        nlist = params['nlist'] or round(4 * math.sqrt(max(num_vectors, 1)))
+        resolved['nlist'] = max(1, min(nlist, sample // MIN_POINTS_PER_CENTROID))
+    if 'pq_m' in resolved:
+        resolved['pq_m'] = next(m for m in range(min(params['pq_m'], dim), 0, -1) if dim % m == 0)
+    if 'pq_nbits' in resolved:
+        points_per_code = max(sample // MIN_POINTS_PER_CENTROID, 2)
+        resolved['pq_nbits'] = max(1, min(params['pq_nbits'], int(math.log2(points_per_code))))
+    resolved['trained_on'] = sample
+    return resolved
+
+
+def factory_string(build: Dict) -> str:
+    """faiss.index_factory description for resolved build parameters"""
+    index_type = build['type']
+    if index_type == 'flat':
+        return 'Flat'
+    if index_type == 'sq8':
+        return 'SQ8'
+    if index_type == 'sq-fp16':
+        return 'SQfp16'
+    if index_type == 'ivf-flat':
+        return f"IVF{build['nlist']},Flat"
+    if index_type == 'ivf-sq8':
+        return f"IVF{build['nlist']},SQ8"
+    if index_type == 'ivf-pq':
+        return f"IVF{build['nlist']},PQ{build['pq_m']}x{build['pq_nbits']}"
+    return f"HNSW{build['hnsw_m']}"
+
+
+def build_index(vectors: np.ndarray, params: Dict) -> Tuple[faiss.Index, Dict]:
+    """
+    Create, train and fill an index
+
+    Args:
+        vectors: float32 array (n, dim)
+        params: From index_params_from_env()
+
+    Returns:
+        (index, build info for the manifest: resolved parameters, factory, timings)
+    """
+    build = resolve_build(params, len(vectors), vectors.shape[1])
+    build['factory'] = factory_string(build)
+    index = faiss.index_factory(vectors.shape[1], build['factory'], faiss.METRIC_L2)
+    if params['type'] == 'hnsw':
+        index.hnsw.efConstruction = params['ef_construction']
+
+    start = time.perf_counter()
+    if not index.is_trained:
+        rng = np.random.default_rng(TRAIN_SEED)
+        sample = vectors[rng.choice(len(vectors), build['trained_on'], replace=False)]
+        index.train(sample)
+    build['train_seconds'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    index.add(vectors)
+    build['add_seconds'] = round(time.perf_counter() - start, 3)
+
+    configure_search(index, params)
+    return index, build
+
+
+def configure_search(index: faiss.Index, params: Dict):
+    """Apply search-time parameters (nprobe for IVF, efSearch for HNSW)"""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(params['nprobe'], ivf.nlist)
+    if hasattr(index, 'hnsw'):
+        index.hnsw.efSearch = params['ef_search']
+
+
+def search_parameters(index: faiss.Index, selector=None) -> faiss.SearchParameters:
+    """Search parameters of the right type for the index, carrying its nprobe/efSearch"""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    if hasattr(index, 'hnsw'):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def index_memory_bytes(index: faiss.Index) -> int:
+    """Serialized size of the index (vectors/codes plus structure)"""
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def build_vectorstore(documents: Sequence[Document], embeddings, ids: List[str],
+                      params: Dict) -> Tuple[FAISS, Dict]:
+    """
+    FAISS vector store over documents with the configured index type
+
+    Returns:
+        (vector store, build info from build_index)
+    """
+    vectors = np.asarray(embeddings.embed_documents([doc.page_content for doc in documents]), dtype=np.float32)
+    index, build = build_index(vectors, params)
+    docstore = InMemoryDocstore({
+        chunk_id: Document(id=chunk_id, page_content=doc.page_content, metadata=doc.metadata)
+        for chunk_id, doc in zip(ids, documents)
+    })
+    vectorstore = FAISS(embeddings, index, docstore, dict(enumerate(ids)))
+    logger.info(f"✓ {build['factory']} index over {index.ntotal} vectors "
+                f"({index_memory_bytes(index) / 1024:.0f} KB)")
+    return vectorstore, build
+
+
+def needs_rebuild(build: Optional[Dict], index_type: str, removing: bool, total: int) -> Optional[str]:
+    """
+    Why an incrementally updated index should be rebuilt instead (None if it need not)
+
+    Args:
+        build: Build info recorded in the manifest
+        index_type: Configured index type
+        removing: Whether the update deletes vectors
+        total: Vector count after the update
+    """
+    if removing and not supports_removal(index_type):
+        return f"{index_type} index cannot delete vectors in place"
+    trained_on = (build or {}).get('trained_on') or 0
+    if needs_training(index_type) and trained_on and total > trained_on * RETRAIN_GROWTH:
+        return f"index grew to {total} vectors from a {trained_on}-vector training sample"
+    return None
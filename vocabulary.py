@@ -0,0 +1,443 @@
+"""
+Shared term vocabularies for technologies, industries and services
+Holds the keyword lists used for detection, an alias table, a normalization
+function and hash-set indexes, so the scraper and the merger canonicalize
+"React.js"/"React" or "NodeJS"/"Node.js" the same way and dedup in O(1)
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Comprehensive technology keywords for detection
+# Organized by category for better maintainability
+TECH_KEYWORDS = {
+    'frontend': [
+        # Core frameworks
+        'React', 'React.js', 'Angular', 'Vue', 'Vue.js', 'Svelte', 'Ember.js',
+        # Meta frameworks
+        'Next.js', 'Nuxt.js', 'Gatsby', 'Remix',
+        # Languages
+        'JavaScript', 'TypeScript', 'HTML5', 'CSS3', 'SASS', 'SCSS', 'LESS',
+        # UI Libraries & Tools
+        'Tailwind', 'TailwindCSS', 'Bootstrap', 'Material-UI', 'Ant Design',
+        'Chakra UI', 'Shadcn', 'Redux', 'MobX', 'Zustand', 'Webpack', 'Vite', 'Babel'
+    ],
+    'backend': [
+        # Node.js ecosystem
+        'Node.js', 'Express', 'Express.js', 'Nest.js', 'Fastify', 'Koa',
+        # Python
+        'Python', 'Django', 'Flask', 'FastAPI', 'Pyramid', 'Tornado',
+        # Java
+        'Java', 'Spring', 'Spring Boot', 'Spring Cloud', 'Hibernate', 'Quarkus',
+        # Ruby
+        'Ruby', 'Rails', 'Ruby on Rails', 'Sinatra',
+        # Go
+        'Go', 'Golang', 'Gin', 'Echo',
+        # PHP
+        'PHP', 'Laravel', 'Symfony', 'CodeIgniter', 'Yii',
+        # .NET
+        '.NET', 'ASP.NET', 'C#', '.NET Core',
+        # Other
+        'Rust', 'Elixir', 'Phoenix', 'Scala', 'Play Framework'
+    ],
+    'mobile': [
+        # Cross-platform
+        'React Native', 'Flutter', 'Ionic', 'Cordova', 'Xamarin', 'Capacitor',
+        # iOS
+        'iOS', 'Swift', 'SwiftUI', 'Objective-C', 'Xcode',
+        # Android
+        'Android', 'Kotlin', 'Java Android', 'Jetpack Compose', 'Android Studio'
+    ],
+    'database': [
+        # SQL Databases
+        'PostgreSQL', 'MySQL', 'MariaDB', 'SQL Server', 'Oracle', 'SQLite',
+        # NoSQL Databases
+        'MongoDB', 'Cassandra', 'CouchDB', 'Neo4j', 'ArangoDB',
+        # In-Memory & Cache
+        'Redis', 'Memcached', 'Hazelcast',
+        # Search & Analytics
+        'Elasticsearch', 'Solr', 'Algolia',
+        # Cloud Databases
+        'DynamoDB', 'Firebase', 'Firestore', 'Supabase', 'PlanetScale',
+        # General
+        'SQL', 'NoSQL'
+    ],
+    'cloud': [
+        # Major Cloud Providers
+        'AWS', 'Amazon Web Services', 'Azure', 'Microsoft Azure',
+        'Google Cloud', 'GCP', 'Google Cloud Platform',
+        # Cloud Services
+        'AWS Lambda', 'AWS EC2', 'AWS S3', 'AWS RDS',
+        'Azure Functions', 'Azure DevOps',
+        'Google Cloud Functions', 'Google App Engine',
+        # Platform as a Service
+        'Heroku', 'DigitalOcean', 'Vercel', 'Netlify', 'Render',
+        'Railway', 'Fly.io', 'CloudFlare', 'Cloudflare Workers'
+    ],
+    'devops': [
+        # Containers
+        'Docker', 'Podman', 'containerd',
+        # Orchestration
+        'Kubernetes', 'K8s', 'Docker Swarm', 'Nomad', 'OpenShift',
+        # CI/CD Tools
+        'Jenkins', 'GitLab CI', 'GitLab CI/CD', 'GitHub Actions',
+        'CircleCI', 'Travis CI', 'Azure Pipelines', 'Bamboo',
+        'TeamCity', 'ArgoCD', 'Flux',
+        # Infrastructure as Code
+        'Terraform', 'Ansible', 'Puppet', 'Chef', 'CloudFormation',
+        'Pulumi', 'Vagrant',
+        # Monitoring & Logging
+        'Prometheus', 'Grafana', 'ELK Stack', 'Datadog', 'New Relic',
+        'Splunk', 'Sentry'
+    ],
+    'cicd': [
+        # CI/CD Concepts & Tools
+        'CI/CD', 'Continuous Integration', 'Continuous Deployment',
+        'Continuous Delivery', 'Jenkins', 'GitHub Actions', 'GitLab CI',
+        'CircleCI', 'Travis CI', 'Bamboo', 'TeamCity', 'Azure DevOps',
+        'Bitbucket Pipelines', 'Drone', 'Spinnaker'
+    ],
+    'ai_ml': [
+        # Machine Learning
+        'Machine Learning', 'ML', 'AI', 'Artificial Intelligence',
+        'Deep Learning', 'Neural Network', 'Neural Networks',
+        # Frameworks
+        'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'XGBoost',
+        'LightGBM', 'Caffe', 'MXNet', 'ONNX',
+        # NLP
+        'NLP', 'Natural Language Processing', 'BERT', 'GPT', 'Transformer',
+        'spaCy', 'NLTK', 'Hugging Face',
+        # Computer Vision
+        'Computer Vision', 'OpenCV', 'YOLO', 'CNN',
+        # Other
+        'Jupyter', 'Pandas', 'NumPy', 'SciPy'
+    ],
+    'architecture': [
+        # API Architectures
+        'REST', 'REST API', 'RESTful', 'GraphQL', 'gRPC', 'SOAP',
+        # Architectural Patterns
+        'Microservices', 'Monolith', 'Serverless', 'Event-Driven',
+        'Service-Oriented Architecture', 'SOA',
+        # Communication
+        'WebSocket', 'Server-Sent Events', 'SSE', 'Message Queue',
+        'Apache Kafka', 'RabbitMQ', 'ActiveMQ', 'MQTT', 'ZeroMQ',
+        # Design Patterns
+        'Event Sourcing', 'CQRS', 'Saga Pattern', 'API Gateway'
+    ],
+    'testing': [
+        # Testing Frameworks
+        'Jest', 'Mocha', 'Chai', 'Jasmine', 'Pytest', 'JUnit', 'TestNG',
+        'RSpec', 'Cucumber', 'Selenium', 'Cypress', 'Playwright',
+        'Puppeteer', 'Testing Library', 'Vitest'
+    ],
+    'other': [
+        # Version Control
+        'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN',
+        # Blockchain
+        'Blockchain', 'Ethereum', 'Solidity', 'Web3',
+        # CMS
+        'WordPress', 'Drupal', 'Contentful', 'Strapi', 'Sanity',
+        # Real-time
+        'Socket.io', 'WebRTC',
+        # API Tools
+        'Postman', 'Swagger', 'OpenAPI'
+    ]
+}
+
+# Comprehensive industry keywords for classification
+# Each industry mapped to relevant keywords for robust detection
+INDUSTRY_KEYWORDS = {
+    'E-commerce': [
+        'ecommerce', 'e-commerce', 'online store', 'online shop', 'retail', 'shopping',
+        'cart', 'checkout', 'marketplace', 'b2c', 'online retail', 'webshop',
+        'product catalog', 'storefront', 'shopify', 'woocommerce', 'magento'
+    ],
+    'FinTech': [
+        'fintech', 'finance', 'financial', 'banking', 'payment', 'payments',
+        'financial services', 'cryptocurrency', 'crypto', 'blockchain finance',
+        'wealth management', 'trading', 'stock', 'investment', 'lending',
+        'digital wallet', 'mobile banking', 'neobank', 'payment gateway',
+        'remittance', 'forex', 'peer-to-peer lending', 'robo-advisor'
+    ],
+    'Healthcare': [
+        'healthcare', 'health', 'medical', 'hospital', 'patient', 'clinic',
+        'telemedicine', 'healthtech', 'pharmaceutical', 'clinical', 'doctor',
+        'nurse', 'diagnosis', 'treatment', 'therapy', 'medicine', 'pharmacy',
+        'electronic health record', 'ehr', 'emr', 'telehealth', 'wellness',
+        'mental health', 'healthcare provider', 'medical device'
+    ],
+    'SaaS': [
+        'saas', 'software as a service', 'cloud software', 'subscription',
+        'b2b software', 'enterprise software', 'cloud-based', 'subscription model',
+        'software platform', 'api service', 'hosted solution', 'paas',
+        'platform as a service', 'multi-tenant'
+    ],
+    'AgriTech': [
+        'agritech', 'agriculture', 'farming', 'agri', 'crop', 'crops',
+        'agricultural', 'farm', 'precision agriculture', 'agtech',
+        'livestock', 'harvest', 'irrigation', 'soil', 'farmer',
+        'agricultural technology', 'farm management', 'vertical farming'
+    ],
+    'Logistics': [
+        'logistics', 'supply chain', 'shipping', 'delivery', 'warehouse',
+        'transportation', 'freight', 'fleet', 'distribution', 'courier',
+        'last mile', 'fulfillment', 'logistics management', 'cargo',
+        'dispatch', 'route optimization', 'inventory management',
+        'supply chain management', 'third-party logistics', '3pl'
+    ],
+    'Real Estate': [
+        'real estate', 'property', 'housing', 'proptech', 'realty',
+        'real estate tech', 'rental', 'lease', 'landlord', 'tenant',
+        'commercial property', 'residential property', 'real estate management',
+        'property management', 'real estate platform', 'home buying', 'home selling'
+    ],
+    'Media & Entertainment': [
+        'media', 'streaming', 'content', 'video', 'entertainment',
+        'music', 'gaming', 'games', 'movie', 'film', 'television', 'tv',
+        'broadcast', 'publishing', 'digital media', 'content creation',
+        'video streaming', 'music streaming', 'ott', 'over-the-top',
+        'social media', 'influencer', 'creator economy'
+    ],
+    'Insurance': [
+        'insurance', 'insurtech', 'claims', 'policy', 'policies',
+        'underwriting', 'insurer', 'insurance company', 'life insurance',
+        'health insurance', 'auto insurance', 'property insurance',
+        'insurance platform', 'insurance technology', 'reinsurance',
+        'actuarial', 'risk assessment'
+    ],
+    'Retail': [
+        'retail', 'store', 'stores', 'merchandise', 'pos', 'point of sale',
+        'brick and mortar', 'retail chain', 'department store', 'boutique',
+        'retail technology', 'retail management', 'retail analytics',
+        'omnichannel', 'in-store', 'retail operations'
+    ],
+    'Education': [
+        'education', 'edtech', 'learning', 'school', 'university', 'college',
+        'e-learning', 'lms', 'learning management system', 'training',
+        'online learning', 'online education', 'student', 'teacher',
+        'educational technology', 'course', 'classroom', 'curriculum',
+        'tutoring', 'mooc', 'educational platform'
+    ],
+    'Travel & Hospitality': [
+        'travel', 'hospitality', 'hotel', 'tourism', 'booking', 'reservation',
+        'restaurant', 'accommodation', 'vacation', 'trip', 'flight',
+        'airline', 'travel booking', 'travel agency', 'hotel booking',
+        'food service', 'hospitality industry', 'guest', 'lodging'
+    ],
+    'Manufacturing': [
+        'manufacturing', 'industry 4.0', 'production', 'factory', 'factories',
+        'supply chain', 'assembly', 'industrial', 'plant', 'manufacturing process',
+        'quality control', 'automation', 'production line', 'manufacturer',
+        'industrial automation', 'smart manufacturing'
+    ],
+    'Energy': [
+        'energy', 'renewable', 'renewable energy', 'solar', 'wind', 'utilities',
+        'power', 'electricity', 'oil', 'gas', 'petroleum', 'energy sector',
+        'clean energy', 'green energy', 'energy management', 'power generation',
+        'energy efficiency', 'grid', 'utility company'
+    ],
+    'Automotive': [
+        'automotive', 'automobile', 'car', 'vehicle', 'auto', 'mobility',
+        'electric vehicle', 'ev', 'autonomous vehicle', 'self-driving',
+        'automotive industry', 'car manufacturer', 'ride-sharing',
+        'car rental', 'automotive technology'
+    ],
+    'Telecommunications': [
+        'telecommunications', 'telecom', 'telco', '5g', '4g', 'network',
+        'mobile network', 'internet service provider', 'isp', 'connectivity',
+        'broadband', 'fiber optic', 'wireless', 'cellular'
+    ],
+    'Food & Beverage': [
+        'food', 'beverage', 'restaurant', 'food delivery', 'food service',
+        'catering', 'dining', 'food tech', 'foodtech', 'meal',
+        'food industry', 'culinary', 'recipe', 'cooking', 'food ordering'
+    ],
+    'Gaming': [
+        'gaming', 'game', 'games', 'video game', 'esports', 'e-sports',
+        'game development', 'game studio', 'mobile gaming', 'pc gaming',
+        'console gaming', 'game publisher', 'indie game', 'multiplayer'
+    ],
+    'Fashion & Apparel': [
+        'fashion', 'apparel', 'clothing', 'garment', 'textile', 'fashion tech',
+        'fashion industry', 'fashion retail', 'fashion ecommerce', 'style',
+        'wardrobe', 'fashion platform', 'online fashion'
+    ],
+    'Construction': [
+        'construction', 'building', 'infrastructure', 'contractor', 'architecture',
+        'construction industry', 'construction management', 'construction technology',
+        'construction project', 'civil engineering', 'building materials'
+    ],
+    'Legal Tech': [
+        'legal tech', 'legaltech', 'legal', 'law', 'lawyer', 'attorney',
+        'legal services', 'legal technology', 'legal platform', 'litigation',
+        'compliance', 'contract management', 'legal software'
+    ],
+    'HR Tech': [
+        'hr tech', 'hrtech', 'human resources', 'hr', 'recruitment', 'hiring',
+        'talent', 'talent management', 'employee', 'workforce', 'payroll',
+        'hr management', 'hr platform', 'applicant tracking', 'onboarding'
+    ],
+    'Cybersecurity': [
+        'cybersecurity', 'cyber security', 'security', 'infosec', 'information security',
+        'data security', 'network security', 'threat detection', 'firewall',
+        'encryption', 'security platform', 'vulnerability', 'penetration testing'
+    ],
+    'Government': [
+        'government', 'public sector', 'civic tech', 'govtech', 'municipal',
+        'federal', 'state government', 'public administration', 'civic',
+        'government services', 'e-government'
+    ],
+    'Non-profit': [
+        'non-profit', 'nonprofit', 'ngo', 'charity', 'charitable', 'foundation',
+        'social impact', 'social good', 'philanthropic', 'humanitarian',
+        'non-governmental organization'
+    ]
+}
+
+# Spellings that normalization alone does not merge: canonical -> aliases.
+# Case, punctuation, "&"/"and" and a ".js"/"JS" suffix are already handled by
+# normalize_term ("React.js", "ReactJS" and "react" all resolve to "React").
+TECH_ALIASES = {
+    'Tailwind': ['TailwindCSS', 'Tailwind CSS'],
+    'Material-UI': ['MUI'],
+    'Go': ['Golang'],
+    'Ruby on Rails': ['Rails', 'RoR'],
+    'AWS': ['Amazon Web Services'],
+    'Azure': ['Microsoft Azure'],
+    'Google Cloud': ['GCP', 'Google Cloud Platform'],
+    'Kubernetes': ['K8s'],
+    'GitLab CI': ['GitLab CI/CD'],
+    'PostgreSQL': ['Postgres'],
+    'MongoDB': ['Mongo'],
+    'AI': ['Artificial Intelligence'],
+    'Machine Learning': ['ML'],
+    'Neural Networks': ['Neural Network'],
+    'NLP': ['Natural Language Processing'],
+    'REST': ['REST API', 'RESTful'],
+    'Apache Kafka': ['Kafka'],
+    'Server-Sent Events': ['SSE'],
+    'SOA': ['Service-Oriented Architecture'],
+    'ELK Stack': ['ELK'],
+}
+
+INDUSTRY_ALIASES = {
+    'E-commerce': ['Online Retail'],
+    'FinTech': ['Financial Technology', 'Financial Services'],
+    'Healthcare': ['HealthTech', 'Health Tech'],
+    'AgriTech': ['AgTech', 'Agriculture'],
+    'Real Estate': ['PropTech'],
+    'Media & Entertainment': ['Media', 'Entertainment'],
+    'Insurance': ['InsurTech'],
+    'Education': ['EdTech'],
+    'Travel & Hospitality': ['Travel', 'Hospitality'],
+    'Food & Beverage': ['F&B', 'FoodTech'],
+    'Fashion & Apparel': ['Fashion'],
+    'Telecommunications': ['Telecom'],
+    'Government': ['GovTech'],
+}
+
+_JS_SUFFIX = re.compile(r'(?<=[a-z0-9])\.?js$')
+_NON_KEY = re.compile(r'[^a-z0-9+#]')
+
+
+def normalize_term(term: str) -> str:
+    """
+    Lookup key for a term: lowercase, "&" as "and", ".js"/"js" suffix and
+    punctuation/whitespace removed ("+" and "#" kept for C++/C#)
+    """
+    text = (term or '').strip().lower().replace('&', 'and')
+    text = _JS_SUFFIX.sub('', text)
+    return _NON_KEY.sub('', text)
+
+
+class Vocabulary:
+    """Canonical spellings for a set of terms, with alias resolution"""
+
+    def __init__(self, terms: Iterable[str] = (), aliases: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            terms: Known terms; the first spelling of each normalized key is canonical
+            aliases: canonical -> alternative names (override the defaults above)
+        """
+        self.index: Dict[str, str] = {}
+        for term in terms:
+            self.index.setdefault(normalize_term(term), term)
+        for canonical, names in (aliases or {}).items():
+            for name in [canonical, *names]:
+                self.index[normalize_term(name)] = canonical
+
+    def canonical(self, term: str) -> Optional[str]:
+        """
+        Canonical spelling of a term
+
+        Unknown terms keep their own spelling (with whitespace tidied);
+        empty or non-string values give None.
+        """
+        if not isinstance(term, str):
+            return None
+        cleaned = ' '.join(term.split())
+        normalized = normalize_term(cleaned)
+        if not normalized:
+            return None
+        return self.index.get(normalized, cleaned)
+
+    def key(self, term: str) -> str:
+        """Dedup key: equal for all spellings and aliases of a term"""
+        canonical = self.canonical(term)
+        return normalize_term(canonical) if canonical else ''
+
+    def __contains__(self, term: str) -> bool:
+        return isinstance(term, str) and normalize_term(term) in self.index
+
+    def canonicalize_all(self, terms: Iterable[str]) -> List[str]:
+        """Canonical spellings of the terms, deduplicated, in first-seen order"""
+        return list(VocabularySet(self, None, terms))
+
+
+class VocabularySet:
+    """
+    Ordered, deduplicated list of canonical terms with O(1) membership
+
+    Wraps (and appends to) a plain list, so e.g. knowledge_base["technologies"]
+    stays JSON-serializable while lookups go through a hash set of keys.
+    """
+
+    def __init__(self, vocabulary: Vocabulary, items: Optional[List[str]] = None,
+                 initial: Iterable[str] = ()):
+        self.vocabulary = vocabulary
+        self.items = items if items is not None else []
+        self.keys = set()
+
+        existing = list(self.items) + list(initial)
+        self.items.clear()
+        for term in existing:
+            self.add(term)
+
+    def add(self, term: str) -> bool:
+        """Add the canonical form of a term; False if it was already present (or empty)"""
+        canonical = self.vocabulary.canonical(term)
+        if canonical is None:
+            return False
+        key = normalize_term(canonical)
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        self.items.append(canonical)
+        return True
+
+    def __contains__(self, term: str) -> bool:
+        return self.vocabulary.key(term) in self.keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+TECHNOLOGIES = Vocabulary(
+    (tech for techs in TECH_KEYWORDS.values() for tech in techs), TECH_ALIASES
+)
+INDUSTRIES = Vocabulary(INDUSTRY_KEYWORDS.keys(), INDUSTRY_ALIASES)
+# Services have no fixed list; normalization alone merges "AI & Automation"/"ai and automation"
+SERVICES = Vocabulary()